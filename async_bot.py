@@ -0,0 +1,261 @@
+from slack_bolt import BoltResponse
+from slack_bolt.async_app import AsyncApp
+from slack_sdk.web.async_client import AsyncWebClient
+from aiohttp import web
+from dotenv import load_dotenv
+import asyncio
+import os
+import time
+
+# bot.py's sync App is only a source of shared helpers here; AsyncApp makes its own
+# auth.test on the first request, so skip the blocking one at import
+os.environ.setdefault("DEFER_SLACK_AUTH", "1")
+
+from bot import (
+    slack_request_verifier,
+    metrics_registry,
+    should_dispatch_event,
+    is_duplicate_event,
+    take_event_menu_token,
+    menu_blocks,
+    disabled_buttons_blocks,
+    record_modal_latency,
+    record_submission,
+    session_store,
+    SESSION_EXPIRED_ERROR,
+    health_form_step,
+    longevity_session,
+    longevity_answers,
+    health_form_view,
+    vital_view_form_view,
+    hypertrophy_form_view,
+    completion_form_view,
+    ldl_report,
+    health_report,
+    vital_view_report,
+    hypertrophy_report,
+    completion_report,
+    handle_link_reload,
+)
+
+# asyncio entry point: same listeners as bot.py, registered on AsyncApp and served by aiohttp.
+# The shared helpers backed by SQLite (event dedup, the longevity session, the progress
+# history the reports read) can wait on a busy timeout, so they run in asyncio.to_thread;
+# only the in-memory ones are called on the event loop.
+# Run with: gunicorn async_bot:web_app --bind 0.0.0.0:$PORT --worker-class aiohttp.GunicornWebWorker
+
+# Load environment variables
+load_dotenv()
+
+# Initialize the async Bolt App
+app = AsyncApp(
+    token=os.environ["SLACK_BOT_TOKEN"],
+    signing_secret=os.environ["SLACK_SIGNING_SECRET"],
+    # Skips Bolt's inspect.stack() lookup of a default name
+    name="async_bot.py",
+    ignoring_self_events_enabled=False,
+    request_verification_enabled=False
+)
+
+def timed_listener(listener):
+    return metrics_registry.timed_async("slack_listener_seconds", (("listener", listener),))
+
+class TimedAsyncWebClient(AsyncWebClient):
+    async def api_call(self, api_method, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await super().api_call(api_method, **kwargs)
+        finally:
+            metrics_registry.observe("slack_api_seconds", (("method", api_method),), time.perf_counter() - started)
+
+@app.middleware
+async def filter_message_events(body, context, next):
+    if not should_dispatch_event(body, context.bot_user_id):
+        return BoltResponse(status=200, body="")
+    await next()
+
+@app.middleware
+async def drop_duplicate_events(body, request, next):
+    if await asyncio.to_thread(is_duplicate_event, body, request.headers):
+        return BoltResponse(status=200, body="")
+    await next()
+
+@app.middleware
+async def rate_limit_menu_events(body, next):
+    if not take_event_menu_token(body):
+        return BoltResponse(status=200, body="")
+    await next()
+
+# Same client AsyncApp built for this request, with every Web API call timed
+@app.middleware
+async def use_timed_client(context, next):
+    client = context.client
+    context["client"] = TimedAsyncWebClient(
+        token=client.token,
+        base_url=client.base_url,
+        timeout=client.timeout,
+        ssl=client.ssl,
+        proxy=client.proxy,
+        session=client.session,
+        trust_env_in_session=client.trust_env_in_session,
+        headers=client.headers,
+        team_id=context.team_id,
+        logger=client.logger,
+        retry_handlers=client.retry_handlers
+    )
+    # Middleware argument injection already built say() on the old client; rebuild it lazily
+    context.pop("say", None)
+    await next()
+
+# Keep references to fire-and-forget tasks so they aren't garbage collected mid-flight
+background_tasks = set()
+
+async def update_message_with_disabled_buttons(client, body, selected):
+    user = body["user"]["id"]
+    channel = body["channel"]["id"]
+    ts = body["message"]["ts"]
+
+    await client.chat_update(
+        channel=channel,
+        ts=ts,
+        text=f"<@{user}> chose *{selected}*",
+        blocks=disabled_buttons_blocks(user, selected)
+    )
+
+async def open_modal(client, body, build_view, selected):
+    action = body["actions"][0]
+    await client.views_open(trigger_id=body["trigger_id"], view=build_view(body["channel"]["id"]))
+    record_modal_latency(action["action_id"], (time.time() - float(action["action_ts"])) * 1000)
+    # Disabling the menu buttons can wait; the trigger_id can't
+    task = asyncio.create_task(update_message_with_disabled_buttons(client, body, selected))
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
+async def post_report(report, body, client, view, *args):
+    channel_id, message = await asyncio.to_thread(report, body, view, *args)
+    await client.chat_postMessage(
+        channel=channel_id,
+        text=message
+    )
+
+# Respond to DMs
+@app.message("")
+@timed_listener("message")
+async def reply_to_dm(message, say):
+    user = message["user"]
+    await say(text=f"Hi <@{user}>! What would you like to do?", blocks=menu_blocks(user))
+
+@app.event("app_mention")
+@timed_listener("event:app_mention")
+async def handle_app_mention(event, say):
+    user = event["user"]
+    await say(text=f"Hi <@{user}>! What would you like to do?", blocks=menu_blocks(user))
+
+@app.action("longevity")
+@timed_listener("action:longevity")
+async def handle_option_a_click(ack, body, client):
+    await ack()
+    await open_modal(client, body, health_form_view, selected="Check Longevity")
+
+@app.action("vital_view")
+@timed_listener("action:vital_view")
+async def handle_option_b_click(ack, body, client):
+    await ack()
+    await open_modal(client, body, vital_view_form_view, selected="Check Vital View")
+
+@app.action("hypertrophy")
+@timed_listener("action:hypertrophy")
+async def handle_option_c_click(ack, body, client):
+    await ack()
+    await open_modal(client, body, hypertrophy_form_view, selected="Want to get Stronger?")
+
+@app.action("completion")
+@timed_listener("action:completion")
+async def handle_option_d_click(ack, body, client):
+    await ack()
+    await open_modal(client, body, completion_form_view, selected="Do you feel stronger?")
+
+@app.view("ldl_input")
+@timed_listener("view:ldl_input")
+async def handle_ldl_submission(ack, body, client, view):
+    session = await asyncio.to_thread(longevity_session, body, view)
+    if session is None:
+        await ack(response_action="errors", errors={"ldl_block": SESSION_EXPIRED_ERROR})
+        return
+    await ack()
+    await asyncio.to_thread(session_store.discard, body["user"]["id"], view["id"])
+    record_submission("ldl_input", body, view, longevity_answers(session))
+    await post_report(ldl_report, body, client, view, session)
+
+@app.view("health_form")
+@timed_listener("view:health_form")
+async def handle_health_submission(ack, body, client, view):
+    next_step = await asyncio.to_thread(health_form_step, body, view)
+    await ack(**(next_step or {}))
+    record_submission("health_form", body, view)
+    if next_step is None:
+        await post_report(health_report, body, client, view)
+
+@app.view("vital_view_form")
+@timed_listener("view:vital_view_form")
+async def handle_vital_view_submission(ack, body, client, view):
+    await ack()
+    record_submission("vital_view_form", body, view)
+    await post_report(vital_view_report, body, client, view)
+
+@app.view("hypertrophy_form")
+@timed_listener("view:hypertrophy_form")
+async def handle_hypertrophy_submission(ack, body, client, view):
+    await ack()
+    record_submission("hypertrophy_form", body, view)
+    await post_report(hypertrophy_report, body, client, view)
+
+@app.view("completion_form")
+@timed_listener("view:completion_form")
+async def handle_completion_submission(ack, body, client, view):
+    await ack()
+    record_submission("completion_form", body, view)
+    await post_report(completion_report, body, client, view)
+
+# aiohttp setup
+async def ping_events(request):
+    return web.Response(text="Pong")
+
+async def metrics_events(request):
+    # render() flushes and reads the shared SQLite file; keep that off the event loop
+    rendered = await asyncio.to_thread(metrics_registry.render)
+    return web.Response(body=rendered.encode(), headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"})
+
+@web.middleware
+async def verify_slack_signature(request, handler):
+    # Same pre-Bolt check as the Flask /slack/events route in bot.py; the body is only
+    # read once the header, timestamp and replay checks pass
+    if request.path == "/slack/events":
+        timestamp = request.headers.get("X-Slack-Request-Timestamp")
+        signature = request.headers.get("X-Slack-Signature")
+        rejected = slack_request_verifier.precheck(timestamp, signature)
+        if rejected is None:
+            body = await request.read()
+            # The replay claim is a write to the shared SQLite table
+            rejected = await asyncio.to_thread(slack_request_verifier.check_signature, timestamp, signature, body)
+        if rejected:
+            return web.Response(status=401, text="invalid request")
+    return await handler(request)
+
+async def reload_links(request):
+    status, payload = handle_link_reload(
+        await request.read(),
+        request.headers.get("X-Admin-Request-Timestamp"),
+        request.headers.get("X-Admin-Signature")
+    )
+    return web.json_response(payload, status=status)
+
+web_app = app.web_app(path="/slack/events")
+web_app.middlewares.append(verify_slack_signature)
+web_app.router.add_get("/ping", ping_events)
+web_app.router.add_get("/metrics", metrics_events)
+web_app.router.add_post("/admin/reload-links", reload_links)
+
+# Run the server
+if __name__ == "__main__":
+    web.run_app(web_app, port=3000)
@@ -1,27 +1,481 @@
-from slack_bolt import App
-from slack_bolt.adapter.flask import SlackRequestHandler
-from flask import Flask, request
+from slack_bolt import App, BoltResponse
+from slack_sdk import WebClient
+from slack_sdk.http_retry.builtin_handlers import ConnectionErrorRetryHandler, RateLimitErrorRetryHandler
+from slack_sdk.signature import SignatureVerifier
+from store import SubmissionStore, form_values
+from sessions import SessionStore
+from cache import TieredCache
+from idempotency import EventDeduplicator
+from metrics import MetricsRegistry
+from signing import RequestVerifier
+from occasions import OccasionCalendar, load_occasions
+from vitals import (
+    bmi_result, bmr_result, ideal_weight_result, life_expectancy_result,
+    format_bmi, format_bmr, format_ideal_weight, format_life_expectancy
+)
 from dotenv import load_dotenv
-import math
-from datetime import datetime, timedelta
-import pytz
-import json
+from datetime import date, timedelta
 import os
+import atexit
 import configparser
-
-config = configparser.ConfigParser()
+import http.client
+import io
+import math
+import sqlite3
+import ssl
+import threading
+import time
+from urllib.error import HTTPError
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+from collections import namedtuple
+from functools import lru_cache
+from types import MappingProxyType
 
 # Load environment variables
 load_dotenv()
 
+# Latency histograms and counters, summed across workers through METRICS_DB and served on /metrics
+metrics_registry = MetricsRegistry(os.environ.get("METRICS_DB", "metrics.db"))
+atexit.register(metrics_registry.flush)
+
+def timed_listener(listener):
+    return metrics_registry.timed("slack_listener_seconds", (("listener", listener),))
+
+# Keep-alive transport for the Slack Web API: one persistent HTTPS connection per
+# thread and host (with TLS session resumption) instead of a handshake per API call.
+SLACK_RETRY_BUDGET = int(os.environ.get("SLACK_RETRY_BUDGET", "30"))
+SLACK_MAX_RETRY_AFTER = int(os.environ.get("SLACK_MAX_RETRY_AFTER", "10"))
+
+slack_transport_stats = {
+    "requests": 0, "connections_opened": 0, "connections_reused": 0,
+    "tls_resumed": 0, "reconnects": 0, "retries": 0, "retries_denied": 0
+}
+slack_transport_lock = threading.Lock()
+slack_connections = threading.local()
+slack_tls_sessions = {}
+retry_budget = {"window": 0, "used": 0}
+
+@lru_cache(maxsize=None)
+def slack_ssl_context():
+    # Loading the CA bundle costs ~40ms, so it happens on the first connection, not at import
+    return ssl.create_default_context()
+
+def count_transport(key):
+    with slack_transport_lock:
+        slack_transport_stats[key] += 1
+
+def take_retry_budget():
+    # At most SLACK_RETRY_BUDGET retries per minute per worker, so a Slack outage
+    # or rate-limit storm doesn't multiply our outbound traffic
+    with slack_transport_lock:
+        window = int(time.monotonic() // 60)
+        if retry_budget["window"] != window:
+            retry_budget["window"] = window
+            retry_budget["used"] = 0
+        if retry_budget["used"] >= SLACK_RETRY_BUDGET:
+            slack_transport_stats["retries_denied"] += 1
+            return False
+        retry_budget["used"] += 1
+        slack_transport_stats["retries"] += 1
+        return True
+
+class BudgetedRateLimitRetryHandler(RateLimitErrorRetryHandler):
+    def _can_retry(self, *, state, request, response=None, error=None):
+        if not super()._can_retry(state=state, request=request, response=response, error=error):
+            return False
+        # Honour Retry-After, but fail fast instead of parking a worker thread for long waits
+        for name, values in response.headers.items():
+            if name.lower() == "retry-after" and int(values[0]) > SLACK_MAX_RETRY_AFTER:
+                return False
+        return take_retry_budget()
+
+class BudgetedConnectionErrorRetryHandler(ConnectionErrorRetryHandler):
+    def _can_retry(self, *, state, request, response=None, error=None):
+        return super()._can_retry(state=state, request=request, response=response, error=error) and take_retry_budget()
+
+def slack_retry_handlers():
+    return [BudgetedConnectionErrorRetryHandler(max_retry_count=1), BudgetedRateLimitRetryHandler(max_retry_count=2)]
+
+class ResumableHTTPSConnection(http.client.HTTPSConnection):
+    def connect(self):
+        http.client.HTTPConnection.connect(self)
+        self.sock = self._context.wrap_socket(
+            self.sock, server_hostname=self.host, session=slack_tls_sessions.get(self.host)
+        )
+        if self.sock.session_reused:
+            count_transport("tls_resumed")
+
+class PooledWebClient(WebClient):
+    def api_call(self, api_method, **kwargs):
+        # Timed here so retries and reconnects count toward the call they belong to
+        started = time.perf_counter()
+        try:
+            return super().api_call(api_method, **kwargs)
+        finally:
+            metrics_registry.observe("slack_api_seconds", (("method", api_method),), time.perf_counter() - started)
+
+    def _connection(self, scheme, netloc):
+        pool = slack_connections.__dict__.setdefault("pool", {})
+        conn = pool.get((scheme, netloc))
+        if conn is not None:
+            count_transport("connections_reused")
+            return conn, True
+        if scheme == "https":
+            conn = ResumableHTTPSConnection(netloc, timeout=self.timeout, context=self.ssl or slack_ssl_context())
+        else:
+            conn = http.client.HTTPConnection(netloc, timeout=self.timeout)
+        pool[(scheme, netloc)] = conn
+        count_transport("connections_opened")
+        return conn, False
+
+    def _drop_connection(self, scheme, netloc):
+        conn = slack_connections.__dict__.get("pool", {}).pop((scheme, netloc), None)
+        if conn is not None:
+            conn.close()
+
+    def _perform_urllib_http_request_internal(self, url, req):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or self.proxy is not None:
+            return super()._perform_urllib_http_request_internal(url, req)
+
+        count_transport("requests")
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        headers = dict(req.header_items())
+        conn, reused = self._connection(parts.scheme, parts.netloc)
+        try:
+            conn.request("POST", path, body=req.data, headers=headers)
+            resp = conn.getresponse()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            self._drop_connection(parts.scheme, parts.netloc)
+            if not reused:
+                raise
+            # The server closed an idle keep-alive connection; reconnect once
+            count_transport("reconnects")
+            conn, _ = self._connection(parts.scheme, parts.netloc)
+            conn.request("POST", path, body=req.data, headers=headers)
+            resp = conn.getresponse()
+        except Exception:
+            self._drop_connection(parts.scheme, parts.netloc)
+            raise
+
+        body = resp.read()
+        if conn.sock is not None and parts.scheme == "https":
+            slack_tls_sessions[conn.host] = conn.sock.session
+        if resp.will_close:
+            self._drop_connection(parts.scheme, parts.netloc)
+
+        if resp.status >= 400:
+            # Same shape urlopen() produces, so WebClient's retry and error handling still apply
+            raise HTTPError(url, resp.status, resp.reason, resp.headers, io.BytesIO(body))
+        if resp.headers.get_content_type() == "application/gzip":
+            return {"status": resp.status, "headers": resp.headers, "body": body}
+        charset = resp.headers.get_content_charset() or "utf-8"
+        return {"status": resp.status, "headers": resp.headers, "body": body.decode(charset)}
+
+def pooled_client_like(client, team_id=None):
+    return PooledWebClient(
+        token=client.token,
+        base_url=client.base_url,
+        timeout=client.timeout,
+        ssl=client.ssl,
+        proxy=client.proxy,
+        headers=client.headers,
+        team_id=team_id,
+        logger=client.logger,
+        retry_handlers=client.retry_handlers
+    )
+
+# DEFER_SLACK_AUTH=1 skips the auth.test round trip at import; Bolt then makes the call on
+# the first request instead (a bad token shows up there rather than at boot)
+DEFER_SLACK_AUTH = os.environ.get("DEFER_SLACK_AUTH", "") == "1"
+
 # Initialize the Bolt App
 app = App(
     token=os.environ["SLACK_BOT_TOKEN"],
-    signing_secret=os.environ["SLACK_SIGNING_SECRET"]
+    signing_secret=os.environ["SLACK_SIGNING_SECRET"],
+    # Without a name Bolt derives one from inspect.stack(), which reads the source of every
+    # frame on the import stack (~35ms at boot)
+    name="bot.py",
+    token_verification_enabled=not DEFER_SLACK_AUTH,
+    # Our own messages are dropped (and counted) by filter_message_events below
+    ignoring_self_events_enabled=False,
+    # Signatures are checked by slack_request_verifier before the request reaches Bolt
+    request_verification_enabled=False
 )
+app.client.retry_handlers = slack_retry_handlers()
+
+# Pre-dispatch filter for message and app_mention events. Edits, joins, bot posts and our
+# own messages never reach the menu listeners, and menu replies are token-bucketed per
+# user and channel: MENU_RATE_BURST at once, refilled one per MENU_RATE_SECONDS (per worker).
+MENU_RATE_SECONDS = float(os.environ.get("MENU_RATE_SECONDS", "10"))
+MENU_RATE_BURST = int(os.environ.get("MENU_RATE_BURST", "3"))
+MENU_BUCKET_LIMIT = 10000
+ALLOWED_MESSAGE_SUBTYPES = {"file_share", "thread_broadcast"}
+
+message_filter_stats = {"passed": 0, "bot": 0, "self": 0, "no_user": 0, "rate_limited": 0, "subtypes": {}}
+message_filter_lock = threading.Lock()
+menu_buckets = {}
+
+def count_message_filter(key, subtype=None):
+    with message_filter_lock:
+        if subtype is None:
+            message_filter_stats[key] += 1
+        else:
+            subtypes = message_filter_stats["subtypes"]
+            subtypes[subtype] = subtypes.get(subtype, 0) + 1
+
+def take_menu_token(user, channel):
+    now = time.monotonic()
+    key = (user, channel)
+    with message_filter_lock:
+        tokens, last = menu_buckets.get(key, (MENU_RATE_BURST, now))
+        tokens = min(MENU_RATE_BURST, tokens + (now - last) / MENU_RATE_SECONDS)
+        if key not in menu_buckets and len(menu_buckets) >= MENU_BUCKET_LIMIT:
+            # A bucket idle long enough to have refilled carries no state; forget those
+            refill_time = MENU_RATE_SECONDS * MENU_RATE_BURST
+            for idle in [k for k, (_, seen) in menu_buckets.items() if now - seen >= refill_time]:
+                del menu_buckets[idle]
+        if tokens < 1:
+            menu_buckets[key] = (tokens, now)
+            message_filter_stats["rate_limited"] += 1
+            return False
+        menu_buckets[key] = (tokens - 1, now)
+        return True
+
+def is_message_event(body):
+    event = body.get("event") or {}
+    return body.get("type") == "event_callback" and event.get("type") in ("message", "app_mention")
+
+def should_dispatch_event(body, bot_user_id):
+    # The cheap checks, run before dedup. The menu token is only taken once an event is
+    # known to be a first delivery (take_event_menu_token), so a retry never spends one.
+    if not is_message_event(body):
+        return True
+    event = body["event"]
+    subtype = event.get("subtype")
+    user = event.get("user")
+    if subtype is not None and subtype not in ALLOWED_MESSAGE_SUBTYPES:
+        count_message_filter("subtypes", subtype)
+    elif user is not None and user == bot_user_id:
+        count_message_filter("self")
+    elif event.get("bot_id"):
+        count_message_filter("bot")
+    elif user is None:
+        count_message_filter("no_user")
+    else:
+        return True
+    return False
+
+def take_event_menu_token(body):
+    if not is_message_event(body):
+        return True
+    event = body["event"]
+    if take_menu_token(event["user"], event.get("channel")):
+        count_message_filter("passed")
+        return True
+    return False
+
+# Middleware runs in registration order: filter_message_events, drop_duplicate_events,
+# then rate_limit_menu_events
+@app.middleware
+def filter_message_events(body, context, next):
+    if not should_dispatch_event(body, context.bot_user_id):
+        return BoltResponse(status=200, body="")
+    next()
+
+# Slack redelivers events it thinks we missed (X-Slack-Retry-Num). Drop anything already
+# seen by any worker before a listener runs; the table is shared through SQLite.
+EVENT_DEDUP_DB = os.environ.get("EVENT_DEDUP_DB", "events.db")
+EVENT_DEDUP_TTL = int(os.environ.get("EVENT_DEDUP_TTL", 900))
+
+event_deduplicator = EventDeduplicator(EVENT_DEDUP_DB, ttl=EVENT_DEDUP_TTL)
+
+# Verified signatures are shared through the same file, so a request replayed to another
+# worker is caught too
+slack_request_verifier = RequestVerifier(os.environ["SLACK_SIGNING_SECRET"], EVENT_DEDUP_DB)
+
+def is_duplicate_event(body, headers):
+    if body.get("type") != "event_callback":
+        return False
+    key = body.get("event_id") or body.get("event", {}).get("client_msg_id")
+    if key is None:
+        return False
+    return not event_deduplicator.first_delivery(key, retry=bool(headers.get("x-slack-retry-num")))
+
+@app.middleware
+def drop_duplicate_events(body, request, next):
+    if is_duplicate_event(body, request.headers):
+        return BoltResponse(status=200, body="")
+    next()
+
+@app.middleware
+def rate_limit_menu_events(body, next):
+    if not take_event_menu_token(body):
+        return BoltResponse(status=200, body="")
+    next()
+
+# Bolt builds a fresh WebClient for every request; swap it for one on the shared pool
+@app.middleware
+def use_pooled_client(context, next):
+    context["client"] = pooled_client_like(context.client, team_id=context.team_id)
+    # Middleware argument injection already built say() on the old client; rebuild it lazily
+    context.pop("say", None)
+    next()
+
+# Background pool for the slow half of view submissions (compute + chat_postMessage).
+# Handlers ack right away and hand the rest off here; BACKGROUND_WORKERS=0 runs inline.
+BACKGROUND_WORKERS = int(os.environ.get("BACKGROUND_WORKERS", "4"))
+BACKGROUND_QUEUE_LIMIT = int(os.environ.get("BACKGROUND_QUEUE_LIMIT", "32"))
+
+background_executor = ThreadPoolExecutor(max_workers=BACKGROUND_WORKERS, thread_name_prefix="background") if BACKGROUND_WORKERS > 0 else None
+background_slots = threading.BoundedSemaphore(max(BACKGROUND_QUEUE_LIMIT, 1))
+background_stats = {}
+background_stats_lock = threading.Lock()
+background_depth = 0
+
+def record_background_task(name, wait_ms, run_ms, inline, failed):
+    with background_stats_lock:
+        stats = background_stats.setdefault(name, {
+            "count": 0, "inline": 0, "errors": 0,
+            "wait_ms_total": 0.0, "run_ms_total": 0.0, "run_ms_max": 0.0
+        })
+        stats["count"] += 1
+        stats["inline"] += int(inline)
+        stats["errors"] += int(failed)
+        stats["wait_ms_total"] += wait_ms
+        stats["run_ms_total"] += run_ms
+        stats["run_ms_max"] = max(stats["run_ms_max"], run_ms)
+
+def run_background_task(name, func, args, queued_at, inline):
+    started = time.perf_counter()
+    failed = False
+    try:
+        func(*args)
+    except Exception:
+        failed = True
+        app.logger.exception(f"Background task {name} failed")
+    finally:
+        finished = time.perf_counter()
+        record_background_task(name, (started - queued_at) * 1000, (finished - started) * 1000, inline, failed)
+        metrics_registry.observe("background_task_seconds", (("task", name),), finished - started)
+
+def run_in_background(name, func, *args):
+    global background_depth
+    queued_at = time.perf_counter()
+    # Queue full (or pool disabled): run on the listener thread so load pushes back on Bolt
+    if background_executor is None or not background_slots.acquire(blocking=False):
+        run_background_task(name, func, args, queued_at, inline=True)
+        return
+
+    def task():
+        global background_depth
+        try:
+            run_background_task(name, func, args, queued_at, inline=False)
+        finally:
+            with background_stats_lock:
+                background_depth -= 1
+            background_slots.release()
+
+    with background_stats_lock:
+        background_depth += 1
+    background_executor.submit(task)
+
+def background_stats_snapshot():
+    with background_stats_lock:
+        return {
+            "depth": background_depth,
+            "tasks": {name: dict(stats) for name, stats in background_stats.items()}
+        }
 
-config.read(os.environ["EXERCISE_LINK_FILE"])
-exercise_links = config['Exercises']
+# Every modal submission is appended to the local store by a background writer
+submission_store = SubmissionStore(os.environ.get("SUBMISSION_DB", "submissions.db"))
+atexit.register(submission_store.flush)
+
+def record_submission(callback_id, body, view, answers=None):
+    # answers: earlier steps' values, recorded along with this view's
+    values = form_values(view)
+    if answers:
+        values = {**answers, **values}
+    submission_store.record(callback_id, body["user"]["id"], values)
+
+# Answers from earlier steps of a multi-step modal, keyed by (user, view id) and shared
+# by every worker through SESSION_DB; the next view only carries a revision
+SESSION_TTL = int(os.environ.get("SESSION_TTL", "3600"))
+SESSION_CACHE_SIZE = int(os.environ.get("SESSION_CACHE_SIZE", "1000"))
+SESSION_EXPIRED_ERROR = "This form has expired. Please start again from the menu."
+
+session_store = SessionStore(os.environ.get("SESSION_DB", "sessions.db"), ttl=SESSION_TTL, capacity=SESSION_CACHE_SIZE)
+
+# Computed results (rendered report sections, calculator outputs), one namespace each.
+# Namespaces here stay per process: every one of them recomputes in under 4us, while a
+# read from the shared CACHE_DB tier costs ~30us. shared=True is for slower results.
+result_cache = TieredCache(os.environ.get("CACHE_DB", "cache.db"))
+
+# Progress history: replies end with a sparkline of the user's recent values
+PROGRESS_WINDOW_DAYS = int(os.environ.get("PROGRESS_WINDOW_DAYS", 90))
+TREND_POINTS = 20
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+def sparkline(values):
+    low, high = min(values), max(values)
+    if high == low:
+        return SPARK_CHARS[3] * len(values)
+    scale = (len(SPARK_CHARS) - 1) / (high - low)
+    return "".join(SPARK_CHARS[round((value - low) * scale)] for value in values)
+
+def progress_trend(user, metric, value, label, unit=""):
+    # Read the history before logging today's point so the write never races the read.
+    # An unreadable store costs the reply its trend line, never the reply itself.
+    # Raises ValueError for a value that isn't a finite number; nothing is recorded then.
+    if not math.isfinite(value):
+        raise ValueError(f"{label} isn't a finite number: {value}")
+    now = time.time()
+    try:
+        points = submission_store.history(user, metric, since=now - PROGRESS_WINDOW_DAYS * 86400, limit=TREND_POINTS - 1)
+    except sqlite3.Error:
+        submission_store.count("read_errors")
+        points = None
+    submission_store.record_progress(user, metric, value, now)
+    if points is None:
+        return ""
+    # Points logged before non-finite values were rejected can't be plotted
+    values = [v for _, v in points if v is not None and math.isfinite(v)] + [value]
+    if len(values) == 1:
+        return f"📈 {label}: first entry logged, your trend starts with the next one."
+    return (
+        f"📈 {label}, last {len(values)} entries ({PROGRESS_WINDOW_DAYS} days): "
+        f"`{sparkline(values)}` {values[0]:g}{unit} → {value:g}{unit}"
+    )
+
+def post_report(report, body, client, view, *args):
+    channel_id, message = report(body, view, *args)
+    client.chat_postMessage(
+        channel=channel_id,
+        text=message
+    )
+
+DISABLED_BUTTONS_CONTEXT = {
+    "type": "context",
+    "elements": [
+        {
+            "type": "mrkdwn",
+            "text": "You already made a choice. 🎉"
+        }
+    ]
+}
+
+def disabled_buttons_blocks(user, selected):
+    return [
+        {
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": f"✅ <@{user}> chose *{selected}*"
+            }
+        },
+        DISABLED_BUTTONS_CONTEXT
+    ]
 
 def update_message_with_disabled_buttons(client, body, selected):
     user = body["user"]["id"]
@@ -32,246 +486,232 @@ def update_message_with_disabled_buttons(client, body, selected):
         channel=channel,
         ts=ts,
         text=f"<@{user}> chose *{selected}*",
-        blocks=[
-            {
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"✅ <@{user}> chose *{selected}*"
-                }
-            },
-            {
-                "type": "context",
-                "elements": [
-                    {
-                        "type": "mrkdwn",
-                        "text": "You already made a choice. 🎉"
-                    }
-                ]
-            }
-        ]
+        blocks=disabled_buttons_blocks(user, selected)
     )
+
+# Trigger-to-modal latency per action_id. Slack's trigger_id expires 3s after the click.
+TRIGGER_EXPIRY_WARN_MS = 2000
+modal_latency_stats = {}
+
+def record_modal_latency(action_id, latency_ms):
+    with background_stats_lock:
+        stats = modal_latency_stats.setdefault(action_id, {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "near_expiry": 0})
+        stats["count"] += 1
+        stats["total_ms"] += latency_ms
+        stats["max_ms"] = max(stats["max_ms"], latency_ms)
+        stats["near_expiry"] += int(latency_ms >= TRIGGER_EXPIRY_WARN_MS)
+    metrics_registry.observe("modal_open_seconds", (("action", action_id),), latency_ms / 1000)
+
+def open_modal(client, body, build_view, selected):
+    action = body["actions"][0]
+    client.views_open(trigger_id=body["trigger_id"], view=build_view(body["channel"]["id"]))
+    # action_ts is when the user clicked, so this includes Slack's delivery time too
+    record_modal_latency(action["action_id"], (time.time() - float(action["action_ts"])) * 1000)
+    # Disabling the menu buttons can wait; the trigger_id can't
+    run_in_background("disable_buttons", update_message_with_disabled_buttons, client, body, selected)
+
+# Static Block Kit payloads are built once at import and shared between requests;
+# per-request fields (user mentions, private_metadata) are layered on top without
+# copying the nested blocks. Nothing may mutate these templates.
+VIEW_REGISTRY = {}
+
+def register_view(view):
+    VIEW_REGISTRY[view["callback_id"]] = view
+    return view
+
+def modal_view(callback_id, channel_id):
+    return {**VIEW_REGISTRY[callback_id], "private_metadata": channel_id}
+
+MENU_ACTIONS = {
+    "type": "actions",
+    "elements": [
+        {
+            "type": "button",
+            "text": {"type": "plain_text", "text": "Check Longevity"},
+            "value": "longevity",
+            "action_id": "longevity"
+        },
+        {
+            "type": "button",
+            "text": {"type": "plain_text", "text": "Vital View"},
+            "value": "vital_view",
+            "action_id": "vital_view"
+        },
+        {
+            "type": "button",
+            "text": {"type": "plain_text", "text": "Want to get Stronger?"},
+            "value": "hypertrophy",
+            "action_id": "hypertrophy"
+        },
+        {
+            "type": "button",
+            "text": {"type": "plain_text", "text": "Whatsapp"},
+            "value": "completion",
+            "action_id": "completion"
+        }
+    ]
+}
+
+def menu_blocks(user):
+    return [
+        {
+            "type": "section",
+            "text": {"type": "mrkdwn", "text": f"Hi <@{user}>! What would you like to do?"}
+        },
+        MENU_ACTIONS
+    ]
+
 # Respond to DMs
 @app.message("")
+@timed_listener("message")
 def reply_to_dm(message, say):
     user = message["user"]
-    say(
-        text=f"Hi <@{user}>! What would you like to do?",
-        blocks=[
-            {
-                "type": "section",
-                "text": {"type": "mrkdwn", "text": f"Hi <@{user}>! What would you like to do?"}
-            },
-            {
-                "type": "actions",
-                "elements": [
-                    {
-                        "type": "button",
-                        "text": {"type": "plain_text", "text": "Check Longevity"},
-                        "value": "longevity",
-                        "action_id": "longevity"
-                    },
-                    {
-                        "type": "button",
-                        "text": {"type": "plain_text", "text": "Vital View"},
-                        "value": "vital_view",
-                        "action_id": "vital_view"
-                    },
-                    {
-                        "type": "button",
-                        "text": {"type": "plain_text", "text": "Want to get Stronger?"},
-                        "value": "hypertrophy",
-                        "action_id": "hypertrophy"
-                    },
-                    {
-                        "type": "button",
-                        "text": {"type": "plain_text", "text": "Whatsapp"},
-                        "value": "completion",
-                        "action_id": "completion"
-                    }
-                ]
-            }
-        ]
-    )
+    say(text=f"Hi <@{user}>! What would you like to do?", blocks=menu_blocks(user))
 
 @app.event("app_mention")
+@timed_listener("event:app_mention")
 def handle_app_mention(event, say):
     user = event["user"]
-    say(
-        text=f"Hi <@{user}>! What would you like to do?",
-        blocks=[
-            {
-                "type": "section",
-                "text": {"type": "mrkdwn", "text": f"Hi <@{user}>! What would you like to do?"}
-            },
-            {
-                "type": "actions",
-                "elements": [
+    say(text=f"Hi <@{user}>! What would you like to do?", blocks=menu_blocks(user))
+
+HEALTH_FORM_VIEW = register_view({
+    "type": "modal",
+    "callback_id": "health_form",
+    "title": {"type": "plain_text", "text": "Check Longevity"},
+    "submit": {"type": "plain_text", "text": "Next"},
+    "blocks": [
+         {
+            "type": "input",
+            "block_id": "gender_block",
+            "label": {"type": "plain_text", "text": "Your gender?"},
+            "element": {
+                "type": "static_select",
+                "action_id": "gender_select",
+                "options": [
                     {
-                        "type": "button",
-                        "text": {"type": "plain_text", "text": "Check Longevity"},
-                        "value": "longevity",
-                        "action_id": "longevity"
+                        "text": {"type": "plain_text", "text": "Male"},
+                        "value": "male"
                     },
                     {
-                        "type": "button",
-                        "text": {"type": "plain_text", "text": "Vital View"},
-                        "value": "vital_view",
-                        "action_id": "vital_view"
-                    },
+                        "text": {"type": "plain_text", "text": "Female"},
+                        "value": "female"
+                    }
+                ]
+            }
+        },
+        {
+            "type": "input",
+            "block_id": "age_block",
+            "label": {"type": "plain_text", "text": "May I ask your age ?"},
+            "element": {
+                "type": "plain_text_input",
+                "action_id": "age_input",
+                "placeholder": {"type": "plain_text", "text": "e.g. 35"}
+            }
+        },
+        {
+            "type": "input",
+            "block_id": "smoke_block",
+            "label": {"type": "plain_text", "text": "Do you currently use any form of tobacco or smoke, even occasionally?"},
+            "element": {
+                "type": "static_select",
+                "action_id": "smoke_input",
+                "options": [
                     {
-                        "type": "button",
-                        "text": {"type": "plain_text", "text": "Want to get Stronger?"},
-                        "value": "hypertrophy",
-                        "action_id": "hypertrophy"
+                        "text": {"type": "plain_text", "text": "Yes"},
+                        "value": "Yes"
                     },
                     {
-                        "type": "button",
-                        "text": {"type": "plain_text", "text": "Whatsapp"},
-                        "value": "completion",
-                        "action_id": "completion"
+                        "text": {"type": "plain_text", "text": "No"},
+                        "value": "No"
                     }
                 ]
             }
-        ]
-    )
+        }
+    ]
+})
+
+# Step 2 of Check Longevity; health_form swaps the modal to this view in place
+LDL_INPUT_VIEW = register_view({
+    "type": "modal",
+    "callback_id": "ldl_input",
+    "title": {"type": "plain_text", "text": "Check Longevity"},
+    "submit": {"type": "plain_text", "text": "Submit"},
+    "blocks": [
+        {
+            "type": "input",
+            "block_id": "ldl_block",
+            "label": {"type": "plain_text", "text": "Could you provide your most recent LDL cholesterol level?"},
+            "element": {
+                "type": "plain_text_input",
+                "action_id": "ldl_input",
+                "placeholder": {"type": "plain_text", "text": "e.g. 110"}
+            }
+        }
+    ]
+})
+
+def health_form_view(channel_id):
+    return modal_view("health_form", channel_id)
+
+def ldl_input_view(revision):
+    return modal_view("ldl_input", revision)
+
+def health_form_step(body, view):
+    # ack() arguments for a health_form submission: its answers are kept server-side and
+    # the modal moves on to the LDL question. None for a form that already has the LDL
+    # field (opened before the form was split), which is reported straight away.
+    values = form_values(view)
+    if "ldl_input" in values:
+        return None
+    revision = session_store.put(body["user"]["id"], view["id"], {
+        "channel_id": view["private_metadata"],
+        "gender": values["gender_select"],
+        "age": values["age_input"],
+        "smoke": values["smoke_input"]
+    })
+    return {"response_action": "update", "view": ldl_input_view(revision)}
+
+def longevity_session(body, view):
+    return session_store.get(body["user"]["id"], view["id"], view["private_metadata"])
+
+def longevity_answers(session):
+    # Step-1 answers under health_form's action ids, so an ldl_input submission records
+    # the same fields a single-step health_form did
+    return {"gender_select": session["gender"], "age_input": session["age"], "smoke_input": session["smoke"]}
 
 @app.action("longevity")
+@timed_listener("action:longevity")
 def handle_option_a_click(ack, body, client):
     ack()
-    update_message_with_disabled_buttons(client, body, selected="Check Longevity")
-    trigger_id = body["trigger_id"]
-    channel_id = body["channel"]["id"]
-
-    client.views_open(
-        trigger_id=trigger_id,
-        view={
-            "type": "modal",
-            "callback_id": "health_form",
-            "title": {"type": "plain_text", "text": "Check Longevity"},
-            "submit": {"type": "plain_text", "text": "Submit"},
-            "private_metadata": channel_id,
-            "blocks": [
-                 {
-                    "type": "input",
-                    "block_id": "gender_block",
-                    "label": {"type": "plain_text", "text": "Your gender?"},
-                    "element": {
-                        "type": "static_select",
-                        "action_id": "gender_select",
-                        "options": [
-                            {
-                                "text": {"type": "plain_text", "text": "Male"},
-                                "value": "male"
-                            },
-                            {
-                                "text": {"type": "plain_text", "text": "Female"},
-                                "value": "female"
-                            }
-                        ]
-                    }
-                },
-                {
-                    "type": "input",
-                    "block_id": "age_block",
-                    "label": {"type": "plain_text", "text": "May I ask your age ?"},
-                    "element": {
-                        "type": "plain_text_input",
-                        "action_id": "age_input",
-                        "placeholder": {"type": "plain_text", "text": "e.g. 35"}
-                    }
-                },
-                {
-                    "type": "input",
-                    "block_id": "smoke_block",
-                    "label": {"type": "plain_text", "text": "Do you currently use any form of tobacco or smoke, even occasionally?"},
-                    "element": {
-                        "type": "static_select",
-                        "action_id": "smoke_input",
-                        "options": [
-                            {
-                                "text": {"type": "plain_text", "text": "Yes"},
-                                "value": "Yes"
-                            },
-                            {
-                                "text": {"type": "plain_text", "text": "No"},
-                                "value": "No"
-                            }
-                        ]
-                    }
-                },
-                {
-                    "type": "input",
-                    "block_id": "ldl_block",
-                    "label": {"type": "plain_text", "text": "Could you provide your most recent LDL cholesterol level?"},
-                    "element": {
-                        "type": "plain_text_input",
-                        "action_id": "ldl_input",
-                        "placeholder": {"type": "plain_text", "text": "e.g. 110"}
-                    }
-                }
-            ]
-        }
-    )
+    open_modal(client, body, health_form_view, selected="Check Longevity")
 
 
 
 def estimate_life_expectancy(Gender, Age, TobaccoUse, LDL):
-    if any(val is None for val in [Gender, Age, TobaccoUse, LDL]):
-        return ""
-    Gender = Gender.lower()
-    TobaccoUse = TobaccoUse.lower()
-    BaseLE = 70.6 if Gender == "male" else 74.4 if Gender == "female" else 72.5
-
-    if LDL < 100:
-        LDL_Score = 0
-    elif LDL < 120:
-        LDL_Score = -1
-    elif LDL < 140:
-        LDL_Score = -2
-    elif LDL < 160:
-        LDL_Score = -3
-    elif LDL < 190:
-        LDL_Score = -4
-    else:
-        LDL_Score = -5
-
-    Tobacco_Score = -6.8 if TobaccoUse == "yes" else 0
-
-    AgeOffset = max(0, Age - 35)
-    AgePenalty = -1 * (AgeOffset ** 1.11 * 0.089)
-
-    RiskAmplifier = (
-        1 +
-        (0.14 if TobaccoUse == "yes" else 0) +
-        (0.075 if LDL >= 160 else (0.037 if LDL >= 130 else 0))
-    )
-
-    AdjustedLE = (BaseLE + LDL_Score + Tobacco_Score + AgePenalty) / RiskAmplifier
-
-    Years = int(AdjustedLE)
-    Months = round((AdjustedLE - Years) * 12)
-
-    return (
-        f"Estimated Life Expectancy: {Years} years and {Months} months — "
-        f"Every healthy choice empowers your future. "
-        f"This isn't just a number—it's a nudge to live fully, love deeply, and thrive daily. "
-        f"Shine on, because your journey matters. "
-        f"— Based on ICMR-INDIAB & WHO cardiovascular actuarial models"
-    )
+    return format_life_expectancy(life_expectancy_result(Gender, Age, TobaccoUse, LDL))
 
 
 @app.view("ldl_input")
+@timed_listener("view:ldl_input")
 def handle_ldl_submission(ack, body, client, view):
+    session = longevity_session(body, view)
+    if session is None:
+        ack(response_action="errors", errors={"ldl_block": SESSION_EXPIRED_ERROR})
+        return
     ack()
+    session_store.discard(body["user"]["id"], view["id"])
+    record_submission("ldl_input", body, view, longevity_answers(session))
+    run_in_background("ldl_input", post_report, ldl_report, body, client, view, session)
+
+def ldl_report(body, view, session):
     user = body["user"]["id"]
-    metadata = json.loads(view["private_metadata"])
-    channel_id = metadata["channel_id"]
+    channel_id = session["channel_id"]
     state_values = view["state"]["values"]
 
-    gender = metadata['gender']
-    age = metadata['age']
-    smoke = metadata['smoke']
+    gender = session['gender']
+    age = session['age']
+    smoke = session['smoke']
     ldl = state_values.get("ldl_block", {}).get("ldl_input", {}).get("value", "Not provided")
 
     message = (
@@ -283,16 +723,20 @@ def handle_ldl_submission(ack, body, client, view):
     )
 
     life_expectancy = estimate_life_expectancy(gender, int(age), smoke, float(ldl))
-    
-
-    client.chat_postMessage(
-        channel=channel_id,
-        text=life_expectancy
-    )
+    message += "\n"
+    message += life_expectancy
+    return channel_id, message
 
 @app.view("health_form")
+@timed_listener("view:health_form")
 def handle_health_submission(ack, body, client, view):
-    ack()
+    next_step = health_form_step(body, view)
+    ack(**(next_step or {}))
+    record_submission("health_form", body, view)
+    if next_step is None:
+        run_in_background("health_form", post_report, health_report, body, client, view)
+
+def health_report(body, view):
     user = body["user"]["id"]
     channel_id = view["private_metadata"]
     values = view["state"]["values"]
@@ -313,196 +757,106 @@ def handle_health_submission(ack, body, client, view):
     life_expectancy = estimate_life_expectancy(gender, int(age), smoke, float(ldl))
     message += "\n"
     message += life_expectancy
-    client.chat_postMessage(
-        channel=channel_id,
-        text=message
-    )
+    return channel_id, message
+
+
+VITAL_VIEW_FORM_VIEW = register_view({
+    "type": "modal",
+    "callback_id": "vital_view_form",
+    "title": {"type": "plain_text", "text": "Check Vital View"},
+    "submit": {"type": "plain_text", "text": "Submit"},
+    "blocks": [
+         {
+            "type": "input",
+            "block_id": "gender_block",
+            "label": {"type": "plain_text", "text": "Your gender?"},
+            "element": {
+                "type": "static_select",
+                "action_id": "gender_select",
+                "options": [
+                    {
+                        "text": {"type": "plain_text", "text": "Male"},
+                        "value": "male"
+                    },
+                    {
+                        "text": {"type": "plain_text", "text": "Female"},
+                        "value": "female"
+                    }
+                ]
+            }
+        },
+        {
+            "type": "input",
+            "block_id": "age_block",
+            "label": {"type": "plain_text", "text": "May I ask your age ?"},
+            "element": {
+                "type": "plain_text_input",
+                "action_id": "age_input",
+                "placeholder": {"type": "plain_text", "text": "e.g. 35"}
+            }
+        },
+        {
+            "type": "input",
+            "block_id": "height_block",
+            "label": {"type": "plain_text", "text": "May I ask your current height in centimeters (cm)?"},
+            "element": {
+                "type": "plain_text_input",
+                "action_id": "height_input",
+                "placeholder": {"type": "plain_text", "text": "e.g. 175"}
+            }
+        },
+        {
+            "type": "input",
+            "block_id": "weight_block",
+            "label": {"type": "plain_text", "text": "What is your current body weight in kilograms (kg)?"},
+            "element": {
+                "type": "plain_text_input",
+                "action_id": "weight_input",
+                "placeholder": {"type": "plain_text", "text": "e.g. 75"}
+            }
+        }
+    ]
+})
 
+def vital_view_form_view(channel_id):
+    return modal_view("vital_view_form", channel_id)
 
 @app.action("vital_view")
+@timed_listener("action:vital_view")
 def handle_option_b_click(ack, body, client):
     ack()
-    update_message_with_disabled_buttons(client, body, selected="Check Vital View")
-    trigger_id = body["trigger_id"]
-    channel_id = body["channel"]["id"]
-
-    client.views_open(
-        trigger_id=trigger_id,
-        view={
-            "type": "modal",
-            "callback_id": "vital_view_form",
-            "title": {"type": "plain_text", "text": "Check Vital View"},
-            "submit": {"type": "plain_text", "text": "Submit"},
-            "private_metadata": channel_id,
-            "blocks": [
-                 {
-                    "type": "input",
-                    "block_id": "gender_block",
-                    "label": {"type": "plain_text", "text": "Your gender?"},
-                    "element": {
-                        "type": "static_select",
-                        "action_id": "gender_select",
-                        "options": [
-                            {
-                                "text": {"type": "plain_text", "text": "Male"},
-                                "value": "male"
-                            },
-                            {
-                                "text": {"type": "plain_text", "text": "Female"},
-                                "value": "female"
-                            }
-                        ]
-                    }
-                },
-                {
-                    "type": "input",
-                    "block_id": "age_block",
-                    "label": {"type": "plain_text", "text": "May I ask your age ?"},
-                    "element": {
-                        "type": "plain_text_input",
-                        "action_id": "age_input",
-                        "placeholder": {"type": "plain_text", "text": "e.g. 35"}
-                    }
-                },
-                {
-                    "type": "input",
-                    "block_id": "height_block",
-                    "label": {"type": "plain_text", "text": "May I ask your current height in centimeters (cm)?"},
-                    "element": {
-                        "type": "plain_text_input",
-                        "action_id": "height_input",
-                        "placeholder": {"type": "plain_text", "text": "e.g. 175"}
-                    }
-                },
-                {
-                    "type": "input",
-                    "block_id": "weight_block",
-                    "label": {"type": "plain_text", "text": "What is your current body weight in kilograms (kg)?"},
-                    "element": {
-                        "type": "plain_text_input",
-                        "action_id": "weight_input",
-                        "placeholder": {"type": "plain_text", "text": "e.g. 75"}
-                    }
-                }
-            ]
-        }
-    )
+    open_modal(client, body, vital_view_form_view, selected="Check Vital View")
 
+# Message formatting for the vitals reports; vitals.py has the calculators and their records
 def calculate_bmi_status(height_cm, weight_kg):
-    # Check for missing or zero values
-    if not height_cm or not weight_kg:
-        return ""
-
     try:
-        # Convert height to meters and calculate BMI
-        height_m = height_cm / 100
-        bmi = round(weight_kg / (height_m ** 2), 1)
-
-        # Determine status
-        if bmi < 18.5:
-            status = "Underweight (Focus on Lean Mass Gain)"
-        elif bmi < 23:
-            status = "Optimal (Maintain & Optimize)"
-        elif bmi < 25:
-            status = "Elevated (Monitor Body Composition)"
-        elif bmi < 30:
-            status = "Overweight (Prioritize Fat Loss)"
-        else:
-            status = "Obese (Metabolic Recalibration Needed)"
-
-        return f"BMI: {bmi} - {status}"
+        return format_bmi(bmi_result(height_cm, weight_kg))
     except Exception as e:
         return f"Error: {e}"
 
 
 def ideal_body_weight_feedback(gender, height_cm, weight_kg):
-    if not gender or height_cm == 0 or weight_kg == 0:
-        return ""
-
     try:
-        gender = gender.strip().lower()
-        height_m = height_cm / 100
-
-        if gender == "male":
-            ideal_weight = round(22 * (height_m ** 2), 1)
-        elif gender == "female":
-            ideal_weight = round(21 * (height_m ** 2), 1)
-        else:
-            return "Invalid gender. Please use 'male' or 'female'."
-
-        diff = round(ideal_weight - weight_kg, 3)
-        abs_diff = abs(diff)
-        kg_part = int(abs_diff)
-        gram_part = round((abs_diff - kg_part) * 1000)
-
-        if diff > 0:
-            direction = "gain"
-        elif diff < 0:
-            direction = "lose"
-        else:
-            direction = "maintain"
-
-        # Tag based on ideal weight
-        if ideal_weight < 50:
-            tag = "Brilliantly Lean!"
-        elif ideal_weight < 70:
-            tag = "Smartly Fit!"
-        else:
-            tag = "Strong Genius!"
-
-        if direction == "maintain":
-            return f"You're exactly at your Ideal Body Weight (IBW): {ideal_weight} kg. {tag}"
-
-        # Construct message parts
-        msg = f"Ideal Body Weight (IBW): {ideal_weight}kg - {tag}. You need to {direction} "
-
-        if kg_part > 0:
-            msg += f"{kg_part}kg "
-        if gram_part > 0:
-            msg += f"{gram_part}g. "
-        if kg_part == 0 and gram_part == 0:
-            msg += "very little."
-
-        return msg.strip()
-
+        return format_ideal_weight(ideal_weight_result(gender, height_cm, weight_kg))
     except Exception as e:
         return f"Error: {e}"
 
 
 def calculate_bmr_status(gender, height_cm, age, weight_kg):
-    if not gender or height_cm == 0 or age == 0 or weight_kg == 0:
-        return ""
-
     try:
-        gender = gender.strip().lower()
-
-        if gender == "male":
-            bmr = round(10 * weight_kg + 6.25 * height_cm - 5 * age + 5)
-        elif gender == "female":
-            bmr = round(10 * weight_kg + 6.25 * height_cm - 5 * age - 161)
-        else:
-            return "Invalid gender. Please use 'male' or 'female'."
-
-        # Status and advice based on BMR
-        if bmr < 1300:
-            status = "Your BMR is a *sleeping giant* waiting to be awakened. Build that muscle!"
-            advice = "Focus on strength training and increase protein intake to kickstart your metabolism."
-        elif bmr < 1600:
-            status = "You're in the *sweet spot*. Let’s pump up your training and nutrition for *superhuman* gains!"
-            advice = "Optimize your workout routine and fuel with clean nutrition for explosive muscle gain and fat loss."
-        else:
-            status = "Boom! You've got an *unstoppable* metabolism! Use that rocket fuel for max muscle growth!"
-            advice = "Capitalize on your *supercharged* metabolism and unleash your inner beast for maximum muscle growth!"
-
-        return f"BMR: {bmr} kcal/day - Status: {status} - Advice: {advice}"
-
+        return format_bmr(bmr_result(gender, height_cm, age, weight_kg))
     except Exception as e:
         return f"Error: {e}"
 
 
 @app.view("vital_view_form")
+@timed_listener("view:vital_view_form")
 def handle_health_submission(ack, body, client, view):
     ack()
+    record_submission("vital_view_form", body, view)
+    run_in_background("vital_view_form", post_report, vital_view_report, body, client, view)
+
+def vital_view_report(body, view):
     user = body["user"]["id"]
     channel_id = view["private_metadata"]
     values = view["state"]["values"]
@@ -528,681 +882,803 @@ def handle_health_submission(ack, body, client, view):
     message += "\n"
     bmr_status = calculate_bmr_status(gender, int(height_cm), int(age) ,float(weight_kg))
     message += bmr_status
+    try:
+        trend = progress_trend(user, "weight_kg", float(weight_kg), "Weight", " kg")
+        if trend:
+            message += "\n"
+            message += trend
+    except ValueError:
+        pass
 
-    client.chat_postMessage(
-        channel=channel_id,
-        text=message
-    )
+    return channel_id, message
 
 
-def generate_status_message():
-    # Get current IST time
-    ist = pytz.timezone('Asia/Kolkata')
-    now = datetime.now(ist)
-    today = now.date()
+# Status banner. Everything but the clock changes once a day, so the day's parts are built
+# on the first call after IST midnight and each call only formats HH:MM:SS. IST has been a
+# fixed UTC+05:30 since 1945, so the clock is plain arithmetic on time.time().
+IST_OFFSET_SECONDS = 5 * 3600 + 30 * 60
 
-    # Format time
-    time_str = now.strftime("%H:%M:%S, %A, %d-%b-%Y")
+# Occasions come from OCCASION_FILE; OCCASION_LOCALE (e.g. US, IN) adds that locale's holidays
+OCCASION_FILE = os.environ.get("OCCASION_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "occasions.ini"))
+occasion_calendar = OccasionCalendar(load_occasions(OCCASION_FILE, os.environ.get("OCCASION_LOCALE")))
+BANNER_FOOTER = "\n🧬 Built for high-performance living." + "\n" + "—" * 15
 
+def banner_day_parts(today):
     # Week number (week starts on Monday)
-    week_num = now.isocalendar()[1]
+    week_num = today.isocalendar()[1]
 
     # Quarter
-    quarter = (now.month - 1) // 3 + 1
+    quarter = (today.month - 1) // 3 + 1
 
     # Day of year
-    day_of_year = (today - datetime(today.year, 1, 1).date()).days + 1
+    day_of_year = today.timetuple().tm_yday
 
     # Special occasions
-    special_occasion = ""
-    if today.strftime("%d-%b") == "01-Jan":
-        special_occasion = "Happy New Year! "
-    elif today.strftime("%d-%b") == "14-Feb":
-        special_occasion = "Spread love—Happy Valentine's Day! "
-    elif today.strftime("%d-%b") == "25-Dec":
-        special_occasion = "Merry Christmas! "
-    elif today.strftime("%m%d") == "0401":
-        special_occasion = "Keep it fun—April Fools' Day! "
-    elif today.strftime("%m%d") == "1101":
-        special_occasion = "Gratitude mode—Happy Thanksgiving! "
+    special_occasion = occasion_calendar.message_for(today)
+    if special_occasion:
+        special_occasion += " "
 
     # Extra year-end reflection
-    extra_messages = ""
-    if now.month == 12 and now.day >= 21:
-        extra_messages += "\n🔄 Year-end reflection: Audit, adjust, ascend."
-    
-    # Sunrise moment
-    if now.hour == 6 and now.minute == 0:
-        extra_messages += "\n☀️ Sunrise moment—breathe in presence."
+    year_end = ""
+    if today.month == 12 and today.day >= 21:
+        year_end = "\n🔄 Year-end reflection: Audit, adjust, ascend."
 
-    # Prime break points
-    if now.strftime("%H:%M:%S") in ["12:00:00", "18:00:00"]:
-        extra_messages += "\n⏸️ Prime break point—hydrate + reset."
-    
     # Weekend wisdom
+    weekend = ""
     if today.strftime("%a") in ["Sat", "Sun"]:
-        extra_messages += "\n✨ Weekend wisdom—balance hustle with healing."
+        weekend = "\n✨ Weekend wisdom—balance hustle with healing."
 
-    # Assemble final message
-    final_message = (
-        f"⏱️ {time_str}\n"
+    # Split around the clock and the time-of-day moments
+    head = (
+        f", {today.strftime('%A, %d-%b-%Y')}\n"
         f"📆 Week {week_num} | Q{quarter} | Day {day_of_year} of the year\n"
-        f"🎉 Today’s Occasion: {special_occasion}{extra_messages}\n"
-        +"\n🧬 Built for high-performance living."
-        + "\n" + "—" * 15 
+        f"🎉 Today’s Occasion: {special_occasion}{year_end}"
     )
+    tail = f"{weekend}\n{BANNER_FOOTER}"
+    return head, tail
 
-    return final_message
+def banner_moment(second_of_day):
+    # Sunrise moment
+    if 6 * 3600 <= second_of_day < 6 * 3600 + 60:
+        return "\n☀️ Sunrise moment—breathe in presence."
+    # Prime break points
+    if second_of_day in (12 * 3600, 18 * 3600):
+        return "\n⏸️ Prime break point—hydrate + reset."
+    return ""
 
-def get_breathing_guidance(muscle):
-    breathing_guide = {
-        "Pectoralis Major": "Inhale as you lower the weight, exhale as you lift it.",
-        "Deltoideus": "Inhale while lowering the dumbbells, exhale as you press or lift overhead.",
-        "Biceps brachii": "Inhale as you lower the weight, exhale as you curl it up.",
-        "Triceps brachii": "Inhale while lowering the weight, exhale as you extend your arms.",
-        "Latissimus dorsi": "Inhale while lowering the barbell/dumbbell, exhale as you row or pull up.",
-        "Quadriceps femoris": "Inhale as you squat down, exhale as you push up.",
-        "Hamstrings": "Inhale as you lower into the stretch, exhale as you lift to contract.",
-        "Rectus Abdominis": "Exhale as you crunch or contract your abs, inhale as you return to neutral.",
-        "Obliques": "Exhale when twisting or contracting, inhale when returning to start position.",
-        "Trapezius": "Inhale as you lower your shoulders, exhale as you shrug or lift them.",
-        "Soleus": "Inhale as you lower your heels, exhale as you lift onto your toes.",
-        "Gluteus Maximus": "Inhale during the lowering phase, exhale as you drive up or extend.",
-    }
+banner_day = None
+banner_second = None
 
-    # Return the corresponding breathing guidance, or default message if no match
-    return breathing_guide.get(muscle, "Breathing guidance not available for this muscle group.")
+def generate_status_message():
+    global banner_day, banner_second
+    ist_second = int(time.time()) + IST_OFFSET_SECONDS
+
+    # Same second as the last call: same banner
+    cached = banner_second
+    if cached is not None and cached[0] == ist_second:
+        return cached[1]
+
+    day, second_of_day = divmod(ist_second, 86400)
+    day_parts = banner_day
+    if day_parts is None or day_parts[0] != day:
+        day_parts = banner_day = (day, *banner_day_parts(date(1970, 1, 1) + timedelta(days=day)))
+
+    hours, rest = divmod(second_of_day, 3600)
+    minutes, seconds = divmod(rest, 60)
+    message = f"⏱️ {hours:02d}:{minutes:02d}:{seconds:02d}{day_parts[1]}{banner_moment(second_of_day)}{day_parts[2]}"
+    banner_second = (ist_second, message)
+    return message
+
+MUSCLE_GROUPS = (
+    "Pectoralis Major",
+    "Deltoideus",
+    "Biceps brachii",
+    "Triceps brachii",
+    "Latissimus dorsi",
+    "Trapezius",
+    "Quadriceps femoris",
+    "Hamstrings",
+    "Gluteus Maximus",
+    "Soleus",
+    "Rectus Abdominis",
+    "Obliques",
+)
 
-def get_exercise_plan(muscle_group, gender):
-    gender = gender.lower()
-    if muscle_group == "Pectoralis Major":
-        if gender == "male":
-            return """• Warm-Up: Band Pull-Aparts – Activate shoulder stabilizers  
+BREATHING_GUIDE = {
+    "Pectoralis Major": "Inhale as you lower the weight, exhale as you lift it.",
+    "Deltoideus": "Inhale while lowering the dumbbells, exhale as you press or lift overhead.",
+    "Biceps brachii": "Inhale as you lower the weight, exhale as you curl it up.",
+    "Triceps brachii": "Inhale while lowering the weight, exhale as you extend your arms.",
+    "Latissimus dorsi": "Inhale while lowering the barbell/dumbbell, exhale as you row or pull up.",
+    "Trapezius": "Inhale as you lower your shoulders, exhale as you shrug or lift them.",
+    "Quadriceps femoris": "Inhale as you squat down, exhale as you push up.",
+    "Hamstrings": "Inhale as you lower into the stretch, exhale as you lift to contract.",
+    "Gluteus Maximus": "Inhale during the lowering phase, exhale as you drive up or extend.",
+    "Soleus": "Inhale as you lower your heels, exhale as you lift onto your toes.",
+    "Rectus Abdominis": "Exhale as you crunch or contract your abs, inhale as you return to neutral.",
+    "Obliques": "Exhale when twisting or contracting, inhale when returning to start position.",
+}
+
+EXERCISE_PLANS = {
+    "Pectoralis Major": {
+        "male": """• Warm-Up: Band Pull-Aparts – Activate shoulder stabilizers  
 • Compound: Bench Press, Incline Dumbbell Press – Prioritize heavy presses  
 • Isolation: Dumbbell Press – Control the negative  
-• Unilateral: Single-Arm Dumbbell Press – Focus on balance and full ROM"""
-        else:
-            return """• Warm-Up: Band Pull-Aparts – Light activation  
+• Unilateral: Single-Arm Dumbbell Press – Focus on balance and full ROM""",
+        "female": """• Warm-Up: Band Pull-Aparts – Light activation  
 • Compound: Incline Dumbbell Press – Target upper chest  
 • Isolation: Cable Fly, Dumbbell Press – Squeeze at peak  
-• Unilateral: Single-Arm Dumbbell Press – Control and contract"""
-    
-    elif muscle_group == "Deltoideus":
-        if gender == "male":
-            return """• Warm-Up: Shoulder Taps – Mobilize and stabilize  
+• Unilateral: Single-Arm Dumbbell Press – Control and contract""",
+    },
+    "Deltoideus": {
+        "male": """• Warm-Up: Shoulder Taps – Mobilize and stabilize  
 • Compound: Overhead Press, Arnold Press – Focus on controlled drive  
 • Isolation: Lateral Raises, Rear Delt Fly – Pause at the top  
-• Unilateral: Single-Arm Arnold Press – Maintain upright posture"""
-        else:
-            return """• Warm-Up: Shoulder Taps – Light core activation  
+• Unilateral: Single-Arm Arnold Press – Maintain upright posture""",
+        "female": """• Warm-Up: Shoulder Taps – Light core activation  
 • Compound: Arnold Press – Full deltoid engagement  
 • Isolation: Front Raises, Lateral Raises – Controlled tempo  
-• Unilateral: Single-Arm Arnold Press – Drive with control"""
-    
-    elif muscle_group == "Biceps brachii":
-        if gender == "male":
-            return """• Warm-Up: Light Dumbbell Curls – Pump blood in  
+• Unilateral: Single-Arm Arnold Press – Drive with control""",
+    },
+    "Biceps brachii": {
+        "male": """• Warm-Up: Light Dumbbell Curls – Pump blood in  
 • Compound: Barbell Curl – Strict form, full ROM  
 • Isolation: Dumbbell Curl, Concentration Curl – Peak squeeze  
-• Unilateral: Hammer Curl – Emphasize brachialis"""
-        else:
-            return """• Warm-Up: Light Dumbbell Curls – Pre-activate  
+• Unilateral: Hammer Curl – Emphasize brachialis""",
+        "female": """• Warm-Up: Light Dumbbell Curls – Pre-activate  
 • Compound: Barbell Curl – Focus on elbow flexion  
 • Isolation: Preacher Curl, Dumbbell Curl – Pause at top  
-• Unilateral: Single-Arm Dumbbell Curl – Isolate with intent"""
-    
-    elif muscle_group == "Triceps brachii":
-        if gender == "male":
-            return """• Warm-Up: Tricep Dips – Warm elbow joint  
+• Unilateral: Single-Arm Dumbbell Curl – Isolate with intent""",
+    },
+    "Triceps brachii": {
+        "male": """• Warm-Up: Tricep Dips – Warm elbow joint  
 • Compound: Close-Grip Bench Press – Keep elbows tucked  
 • Isolation: Skull Crushers – Full stretch and lockout  
-• Unilateral: Single-Arm Overhead Tricep Extension – Controlled overhead stretch"""
-        else:
-            return """• Warm-Up: Tricep Dips – Elbow warm-up  
+• Unilateral: Single-Arm Overhead Tricep Extension – Controlled overhead stretch""",
+        "female": """• Warm-Up: Tricep Dips – Elbow warm-up  
 • Compound: Close-Grip Bench Press – Controlled press  
 • Isolation: Kickbacks – Squeeze and hold  
-• Unilateral: Single-Arm Overhead Tricep Extension – Elbow stable"""
-    
-    elif muscle_group == "Latissimus dorsi":
-        if gender == "male":
-            return """• Warm-Up: Band Lat Pull-Downs – Engage lats early  
+• Unilateral: Single-Arm Overhead Tricep Extension – Elbow stable""",
+    },
+    "Latissimus dorsi": {
+        "male": """• Warm-Up: Band Lat Pull-Downs – Engage lats early  
 • Compound: Pull-Ups, Barbell Row – Pull with elbows  
 • Isolation: Lat Pulldown – Full stretch and squeeze  
-• Unilateral: Single-Arm Dumbbell Row – Avoid torso rotation"""
-        else:
-            return """• Warm-Up: Band Lat Pull-Downs – Mind-muscle connection  
+• Unilateral: Single-Arm Dumbbell Row – Avoid torso rotation""",
+        "female": """• Warm-Up: Band Lat Pull-Downs – Mind-muscle connection  
 • Compound: Pull-Ups, Seated Cable Row – Elbow-driven pull  
 • Isolation: Barbell Row – Keep spine neutral  
-• Unilateral: Single-Arm Dumbbell Row – Strict back engagement"""
-    
-    elif muscle_group == "Quadriceps femoris":
-        if gender == "male":
-            return """• Warm-Up: Bodyweight Squats – Mobilize hips and knees  
+• Unilateral: Single-Arm Dumbbell Row – Strict back engagement""",
+    },
+    "Trapezius": {
+        "male": """• Warm-Up: Shoulder Rolls – Loosen up  
+• Compound: Upright Row – Elbows high  
+• Isolation: Barbell Shrugs – Hold peak contraction  
+• Unilateral: Single-Arm Face Pulls – Target upper traps""",
+        "female": """• Warm-Up: Shoulder Rolls – Mobilize  
+• Compound: Face Pulls – Scapular control  
+• Isolation: Dumbbell Shrugs – Maximize hold  
+• Unilateral: Single-Arm Face Pulls – Isolate traps""",
+    },
+    "Quadriceps femoris": {
+        "male": """• Warm-Up: Bodyweight Squats – Mobilize hips and knees  
 • Compound: Barbell Squat, Leg Press – Drive through heels  
 • Isolation: Leg Extension – Squeeze at the top  
-• Unilateral: Walking Lunges – Controlled stride"""
-        else:
-            return """• Warm-Up: Bodyweight Squats – Warm joints  
+• Unilateral: Walking Lunges – Controlled stride""",
+        "female": """• Warm-Up: Bodyweight Squats – Warm joints  
 • Compound: Bulgarian Split Squat – Stay upright  
-• Isolation: Step-Ups, Leg Extension – Lockout with intent"""
-    
-    elif muscle_group == "Hamstrings":
-        if gender == "male":
-            return """• Warm-Up: Glute Bridges – Engage posterior chain  
+• Isolation: Step-Ups, Leg Extension – Lockout with intent""",
+    },
+    "Hamstrings": {
+        "male": """• Warm-Up: Glute Bridges – Engage posterior chain  
 • Compound: Romanian Deadlift – Hinge at hips  
 • Isolation: Seated Leg Curl – Full stretch and curl  
-• Unilateral: Single-Leg Deadlift – Balance and hamstring control"""
-        else:
-            return """• Warm-Up: Glute Bridges – Posterior prep  
+• Unilateral: Single-Leg Deadlift – Balance and hamstring control""",
+        "female": """• Warm-Up: Glute Bridges – Posterior prep  
 • Compound: Romanian Deadlift – Hamstring focus  
 • Isolation: Stability Ball Leg Curl – Control the negative  
-• Unilateral: Single-Leg Deadlift – Keep spine neutral"""
-    
-    elif muscle_group == "Rectus Abdominis":
-        if gender == "male":
-            return """• Warm-Up: Plank Holds – Brace core  
+• Unilateral: Single-Leg Deadlift – Keep spine neutral""",
+    },
+    "Gluteus Maximus": {
+        "male": """• Warm-Up: Banded Glute Bridges – Fire glutes  
+• Compound: Barbell Squat, Hip Thrust – Full extension  
+• Isolation: Bulgarian Split Squat – Glute stretch  
+• Unilateral: Cable Pull-Through – Controlled hip hinge""",
+        "female": """• Warm-Up: Banded Glute Bridges – Glute activation  
+• Compound: Hip Thrust, Barbell Squat – Squeeze at top  
+• Isolation: Glute Kickbacks – Hold the peak  
+• Unilateral: Single-Leg Hip Bridge – Controlled movement""",
+    },
+    "Soleus": {
+        "male": """• Warm-Up: Jump Rope – Light calf engagement  
+• Compound: Standing Calf Raises – Peak contraction  
+• Isolation: Seated Calf Raises – Control the negative  
+• Unilateral: Single-Leg Farmer's Walk – Stability and endurance""",
+        "female": """• Warm-Up: Jump Rope – Calf activation  
+• Compound: Standing Calf Raises – Controlled tempo  
+• Isolation: Seated Calf Raises – Soleus emphasis  
+• Unilateral: Single-Leg Calf Raises – Isolate and balance""",
+    },
+    "Rectus Abdominis": {
+        "male": """• Warm-Up: Plank Holds – Brace core  
 • Compound: Hanging Leg Raises, Ab Wheel Rollouts – Full extension  
 • Isolation: Side Plank with Reach – Controlled hold  
-• Unilateral: Cable Side Crunch – Focus on contraction"""
-        else:
-            return """• Warm-Up: Plank Holds – Activate core  
+• Unilateral: Cable Side Crunch – Focus on contraction""",
+        "female": """• Warm-Up: Plank Holds – Activate core  
 • Compound: Hanging Leg Raises – Controlled raise  
 • Isolation: Ab Wheel Rollouts, Side Plank – Steady form  
-• Unilateral: Cable Side Crunch – Maintain tension"""
-    
-    elif muscle_group == "Obliques":
-        if gender == "male":
-            return """• Warm-Up: Side Plank Holds – Lateral stability  
+• Unilateral: Cable Side Crunch – Maintain tension""",
+    },
+    "Obliques": {
+        "male": """• Warm-Up: Side Plank Holds – Lateral stability  
 • Compound: Russian Twists – Controlled rotation  
 • Isolation: Side Plank with Hip Dip – Isometric focus  
-• Unilateral: Single-Arm Cable Woodchopper – Explosive yet controlled"""
-        else:
-            return """• Warm-Up: Side Plank Holds – Core activation  
+• Unilateral: Single-Arm Cable Woodchopper – Explosive yet controlled""",
+        "female": """• Warm-Up: Side Plank Holds – Core activation  
 • Compound: Russian Twists – Controlled rotation  
 • Isolation: Side Plank with Hip Dip – Tension throughout  
-• Unilateral: Single-Arm Cable Woodchopper – Twist through torso"""
-    
-    elif muscle_group == "Trapezius":
-        if gender == "male":
-            return """• Warm-Up: Shoulder Rolls – Loosen up  
-• Compound: Upright Row – Elbows high  
-• Isolation: Barbell Shrugs – Hold peak contraction  
-• Unilateral: Single-Arm Face Pulls – Target upper traps"""
-        else:
-            return """• Warm-Up: Shoulder Rolls – Mobilize  
-• Compound: Face Pulls – Scapular control  
-• Isolation: Dumbbell Shrugs – Maximize hold  
-• Unilateral: Single-Arm Face Pulls – Isolate traps"""
-    
-    elif muscle_group == "Soleus":
-        if gender == "male":
-            return """• Warm-Up: Jump Rope – Light calf engagement  
-• Compound: Standing Calf Raises – Peak contraction  
-• Isolation: Seated Calf Raises – Control the negative  
-• Unilateral: Single-Leg Farmer's Walk – Stability and endurance"""
-        else:
-            return """• Warm-Up: Jump Rope – Calf activation  
-• Compound: Standing Calf Raises – Controlled tempo  
-• Isolation: Seated Calf Raises – Soleus emphasis  
-• Unilateral: Single-Leg Calf Raises – Isolate and balance"""
-    
-    elif muscle_group == "Gluteus Maximus":
-        if gender == "male":
-            return """• Warm-Up: Banded Glute Bridges – Fire glutes  
-• Compound: Barbell Squat, Hip Thrust – Full extension  
-• Isolation: Bulgarian Split Squat – Glute stretch  
-• Unilateral: Cable Pull-Through – Controlled hip hinge"""
-        else:
-            return """• Warm-Up: Banded Glute Bridges – Glute activation  
-• Compound: Hip Thrust, Barbell Squat – Squeeze at top  
-• Isolation: Glute Kickbacks – Hold the peak  
-• Unilateral: Single-Leg Hip Bridge – Controlled movement"""
-    
-    else:
+• Unilateral: Single-Arm Cable Woodchopper – Twist through torso""",
+    },
+}
+
+EXERCISE_GUIDES = {
+    "male": {
+        "Pectoralis Major": [
+            "• Bench Press: Lower the barbell in a controlled manner and press explosively to fully engage the chest.",
+            "• Incline Dumbbell Press: Focus on activating the upper chest. Maintain control throughout the range of motion.",
+            "• Dumbbell Press: Ensure full chest engagement and avoid overextension at the top.",
+            "• Single-Arm Dumbbell Press: Emphasize unilateral movement to improve balance and strength."
+        ],
+        "Deltoideus": [
+            "• Overhead Press: Maintain strict form and avoid excessive lumbar extension.",
+            "• Arnold Press: Focus on wrist rotation and upper back engagement.",
+            "• Lateral Raises: Ensure slight elbow bend and a controlled motion during the lift.",
+            "• Rear Delt Fly: Engage the rear delts by controlling the range of motion.",
+            "• Single-Arm Arnold Press: Focus on developing bilateral symmetry and consistent pressing."
+        ],
+        "Biceps brachii": [
+            "• Barbell Curl: Avoid swinging and focus on full range of motion.",
+            "• Dumbbell Curl: Control the movement during both the concentric and eccentric phases.",
+            "• Concentration Curl: Isolate the biceps effectively by maintaining strict form.",
+            "• Hammer Curl: Engage the brachialis and brachioradialis for a fuller arm."
+        ],
+        "Triceps brachii": [
+            "• Close-Grip Bench Press: Focus on locking out with the triceps.",
+            "• Skull Crushers: Perform with controlled descent and avoid excessive elbow flaring.",
+            "• Single-Arm Overhead Tricep Extension: Maintain full range of motion and proper elbow positioning."
+        ],
+        "Latissimus dorsi": [
+            "• Pull-Ups: Ensure a full contraction at the top and slow descent.",
+            "• Barbell Row: Maintain proper torso alignment for an optimal pull.",
+            "• Lat Pulldown: Focus on scapular control and a full stretch at the bottom.",
+            "• Single-Arm Dumbbell Row: Engage the lats unilaterally to address any imbalances."
+        ],
+        "Trapezius": [
+            "• Upright Row: Focus on pulling to shoulder height for optimal trap activation.",
+            "• Barbell Shrugs: Hold at the top of the movement to maximize trap contraction.",
+            "• Single-Arm Face Pulls: Focus on upper trap engagement and scapular retraction."
+        ],
+        "Quadriceps femoris": [
+            "• Barbell Squat: Ensure depth and proper knee tracking to maximize quadriceps activation.",
+            "• Leg Press: Control the negative phase to maintain muscle tension.",
+            "• Leg Extension: Fully extend the knee without locking out to optimize activation.",
+            "• Walking Lunges: Focus on a controlled descent and active knee extension."
+        ],
+        "Hamstrings": [
+            "• Romanian Deadlift: Maintain a neutral spine and slight knee bend to emphasize hamstring stretch.",
+            "• Seated Leg Curl: Focus on slow eccentric movement for maximum hamstring activation.",
+            "• Single-Leg Deadlift: Perform with controlled motion to target hamstring stability."
+        ],
+        "Gluteus Maximus": [
+            "• Barbell Squat: Achieve optimal squat depth for maximal glute engagement.",
+            "• Hip Thrust: Focus on maintaining proper neck alignment during thrust.",
+            "• Bulgarian Split Squat: Ensure posterior chain engagement while maintaining balance.",
+            "• Cable Pull-Through: Focus on glute alignment throughout the movement."
+        ],
+        "Soleus": [
+            "• Standing Calf Raises: Focus on peak contraction and controlled motion.",
+            "• Seated Calf Raises: Engage the soleus by focusing on the controlled negative phase.",
+            "• Single-Leg Farmer's Walk: Build unilateral stability and calf strength."
+        ],
+        "Rectus Abdominis": [
+            "• Hanging Leg Raises: Focus on full engagement of the abdominal muscles.",
+            "• Ab Wheel Rollouts: Maintain a neutral spine to prevent lower back strain.",
+            "• Side Plank with Reach: Engage the obliques and improve core stability."
+        ],
+        "Obliques": [
+            "• Russian Twists: Control rotation for enhanced core strength.",
+            "• Side Plank with Hip Dip: Focus on engaging the obliques throughout the movement."
+        ],
+    },
+    "female": {
+        "Pectoralis Major": [
+            "• Incline Dumbbell Press: Focus on controlled motion and range of motion.",
+            "• Cable Fly: Maintain a slight bend in the elbows and focus on the stretch.",
+            "• Dumbbell Press: Keep the shoulder blades retracted, with a controlled eccentric phase.",
+            "• Single-Arm Dumbbell Press: Prioritize unilateral engagement and control the movement for better activation."
+        ],
+        "Deltoideus": [
+            "• Arnold Press: Slow, controlled movement with wrist rotation for shoulder development.",
+            "• Lateral Raises: Keep slight elbow bend and emphasize mid-deltoid contraction.",
+            "• Front Raises: Focus on the eccentric portion and controlled movement.",
+            "• Single-Arm Arnold Press: Perform with a focus on unilateral stability and equal range of motion."
+        ],
+        "Biceps brachii": [
+            "• Barbell Curl: Focus on controlled motion without excessive momentum.",
+            "• Preacher Curl: Eliminate shoulder involvement to fully isolate the biceps.",
+            "• Dumbbell Curl: Ensure the full range of motion and steady tempo.",
+            "• Single-Arm Dumbbell Curl: Promote balanced strength development by targeting one arm at a time."
+        ],
+        "Triceps brachii": [
+            "• Kickbacks: Focus on elbow position and tricep engagement throughout the movement.",
+            "• Close-Grip Bench Press: Ensure proper form to activate triceps effectively.",
+            "• Single-Arm Overhead Tricep Extension: Work on form and contraction for maximum isolation."
+        ],
+        "Latissimus dorsi": [
+            "• Pull-Ups: Focus on a controlled eccentric phase to fully engage the lats.",
+            "• Seated Cable Row: Target the lats while maintaining a neutral spine.",
+            "• Barbell Row: Ensure a stable back to avoid lower back strain.",
+            "• Single-Arm Dumbbell Row: Prioritize activation of the lats with controlled motion."
+        ],
+        "Trapezius": [
+            "• Dumbbell Shrugs: Maintain proper posture to isolate the traps.",
+            "• Face Pulls: Engage the upper traps and rear delts for balanced shoulder development.",
+            "• Single-Arm Cable Shrugs: Perform with strict form to focus on unilateral trap strength."
+        ],
+        "Quadriceps femoris": [
+            "• Bulgarian Split Squat: Focus on the leading leg for maximum quadriceps recruitment.",
+            "• Step-Ups: Ensure proper knee alignment and drive through the heel.",
+            "• Leg Extension: Maintain constant tension for hypertrophy."
+        ],
+        "Hamstrings": [
+            "• Romanian Deadlift: Emphasize hamstring activation and avoid rounding the back.",
+            "• Stability Ball Leg Curl: Focus on eccentric strength and control during the movement.",
+            "• Single-Leg Deadlift: Improve unilateral hamstring activation and stability."
+        ],
+        "Gluteus Maximus": [
+            "• Hip Thrusts: Focus on controlled thrusts for maximum glute activation.",
+            "• Squats: Engage glutes deeply by focusing on depth and knee positioning.",
+            "• Glute Kickbacks: Target the glutes with proper isolation and full range of motion.",
+            "• Single-Leg Hip Bridge: Enhance glute activation with an isolated movement."
+        ],
+        "Soleus": [
+            "• Standing Calf Raises: Control the movement to activate the soleus effectively.",
+            "• Seated Calf Raises: Focus on full stretch and contraction of the soleus.",
+            "• Single-Leg Calf Raises: Improve unilateral calf strength and stability."
+        ],
+        "Rectus Abdominis": [
+            "• Cable Crunches: Maintain tension during the movement for full core engagement.",
+            "• Hanging Leg Raises: Focus on a controlled movement to isolate the rectus abdominis.",
+            "• Side Plank: Enhance core strength and stability."
+        ],
+        "Obliques": [
+            "• Russian Twists: Maintain control and keep the torso stable.",
+            "• Side Plank with Hip Dip: Improve endurance and stability in the obliques."
+        ],
+    },
+}
+
+BIOMECH_GUIDES = {
+    "Pectoralis Major": {
+        "male": [
+            "• Control the descent in bench press for optimal chest stretch.",
+            "• Focus on upper chest activation in incline press.",
+            "• Lock elbows in dumbbell press for efficient power transfer.",
+            "• Maintain a neutral spine during single-arm press for stability."
+        ],
+        "female": [
+            "• Focus on controlled descent in incline press for chest stretch.",
+            "• Keep elbows slightly bent in cable fly for full pectoral engagement.",
+            "• Retract shoulder blades to enhance chest press effectiveness.",
+            "• Engage core in single-arm press for balance."
+        ],
+    },
+    "Deltoideus": {
+        "male": [
+            "• Keep elbows slightly in front during overhead press for deltoid isolation.",
+            "• Maintain shoulder rotation in Arnold press to maximize anterior deltoid activation.",
+            "• Slow down lateral raises for better deltoid control.",
+            "• Ensure rear delts are fully engaged during reverse fly."
+        ],
+        "female": [
+            "• Control movement in Arnold press for full deltoid engagement.",
+            "• Focus on mid-deltoid contraction in lateral raises.",
+            "• Eliminate momentum in front raises for deltoid isolation.",
+            "• Keep core tight during unilateral movements for balance."
+        ],
+    },
+    "Biceps brachii": {
+        "male": [
+            "• Achieve full range of motion during barbell curls for bicep peak.",
+            "• Focus on full contraction in dumbbell curls.",
+            "• Control the negative in concentration curls for peak activation.",
+            "• Engage brachialis fully in hammer curls."
+        ],
+        "female": [
+            "• Slow down the descent in barbell curls for better bicep stretch.",
+            "• Focus on elbow flexion in preacher curls for isolation.",
+            "• Keep shoulders still during dumbbell curls for maximum bicep tension.",
+            "• Maintain strict form in single-arm curls for balanced strength."
+        ],
+    },
+    "Triceps brachii": {
+        "male": [
+            "• Press close-grip for maximal tricep engagement.",
+            "• Maintain control during skull crushers for full range.",
+            "• Focus on elbow stability during overhead tricep extension."
+        ],
+        "female": [
+            "• Keep elbows fixed during tricep kickbacks for isolated tension.",
+            "• Maximize stretch in close-grip bench press for tricep activation.",
+            "• Slow down movement in overhead extension for better isolation."
+        ],
+    },
+    "Latissimus dorsi": {
+        "male": [
+            "• Focus on scapular retraction during pull-ups for lat stretch.",
+            "• Maintain a slight lean during barbell row to maximize lat engagement.",
+            "• Keep torso stable during lat pulldowns for effective muscle recruitment.",
+            "• Engage lats fully in single-arm dumbbell rows."
+        ],
+        "female": [
+            "• Control descent in pull-ups to maximize lat activation.",
+            "• Focus on neutral spine during seated cable rows for consistent lat tension.",
+            "• Keep elbows close during barbell rows for lat isolation.",
+            "• Maintain a stable base during dumbbell rows for balanced lat engagement."
+        ],
+    },
+    "Trapezius": {
+        "male": [
+            "• Pull barbell to shoulder height during shrugs for upper trap activation.",
+            "• Squeeze at the top of shrugs for maximal trap contraction.",
+            "• Focus on scapular depression during face pulls for rear deltoid and trap synergy."
+        ],
+        "female": [
+            "• Maintain a neutral spine during dumbbell shrugs for optimal trap isolation.",
+            "• Keep shoulders down and back during face pulls to target upper traps.",
+            "• Engage traps in cable shrugs by controlling the descent."
+        ],
+    },
+    "Quadriceps femoris": {
+        "male": [
+            "• Squat deep for full quads engagement, keeping knees aligned.",
+            "• Maintain constant tension during leg press for optimal quad activation.",
+            "• Focus on knee extension in walking lunges for quad emphasis."
+        ],
+        "female": [
+            "• Focus on full range of motion in Bulgarian split squats for quad isolation.",
+            "• Control descent in leg extension for constant tension.",
+            "• Focus on glute-quad synergy during step-ups."
+        ],
+    },
+    "Hamstrings": {
+        "male": [
+            "• Keep back flat during Romanian deadlifts for hamstring stretch.",
+            "• Control eccentric phase in leg curls for time under tension.",
+            "• Ensure full hamstring activation during single-leg deadlifts."
+        ],
+        "female": [
+            "• Focus on hamstring stretch and control during Romanian deadlifts.",
+            "• Maximize hamstring recruitment in stability ball leg curls.",
+            "• Engage core for stability in single-leg deadlifts."
+        ],
+    },
+    "Gluteus Maximus": {
+        "male": [
+            "• Squat deep to activate glutes, ensuring knees track outward.",
+            "• Focus on hip extension during hip thrusts for maximal glute contraction.",
+            "• Maintain control in Bulgarian split squats for glute isolation."
+        ],
+        "female": [
+            "• Engage glutes fully during hip thrusts with controlled tempo.",
+            "• Focus on full squat depth for glute activation.",
+            "• Keep hips level during single-leg hip bridge for glute focus."
+        ],
+    },
+    "Soleus": {
+        "male": [
+            "• Focus on calf squeeze during standing calf raises for full soleus activation.",
+            "• Control the negative phase in seated calf raises for calf engagement.",
+            "• Engage soleus with proper alignment during single-leg calf raises."
+        ],
+        "female": [
+            "• Maintain slow movement during standing calf raises for full soleus tension.",
+            "• Control the negative phase in seated calf raises to improve calf endurance.",
+            "• Engage core in single-leg calf raises for balance."
+        ],
+    },
+    "Rectus Abdominis": {
+        "male": [
+            "• Maintain a neutral spine during hanging leg raises for better ab engagement.",
+            "• Control movement during ab wheel rollouts for core activation.",
+            "• Keep hips steady in side planks to target obliques."
+        ],
+        "female": [
+            "• Focus on crunching from the core during cable crunches.",
+            "• Maintain a controlled pace during hanging leg raises for maximum ab tension.",
+            "• Keep body aligned in side planks for efficient core stabilization."
+        ],
+    },
+    "Obliques": {
+        "male": [
+            "• Focus on torso rotation during Russian twists for oblique isolation.",
+            "• Keep hips steady during side planks with hip dips for oblique emphasis."
+        ],
+        "female": [
+            "• Maintain core stability during Russian twists.",
+            "• Engage obliques fully during side plank with controlled dips."
+        ],
+    },
+}
+
+SET_PLANS = {
+    "Pectoralis Major": {"male": "• Compound: 6 sets\n• Isolation: 3 sets\n• Unilateral: 2 sets", "female": "• Compound: 5 sets\n• Isolation: 3 sets\n• Unilateral: 2 sets"},
+    "Deltoideus": {"male": "• Compound: 4 sets\n• Isolation: 4 sets\n• Unilateral: 2 sets", "female": "• Compound: 3 sets\n• Isolation: 4 sets\n• Unilateral: 2 sets"},
+    "Biceps brachii": {"male": "• Compound: 3 sets\n• Isolation: 4 sets\n• Unilateral: 2 sets", "female": "• Compound: 2 sets\n• Isolation: 4 sets\n• Unilateral: 2 sets"},
+    "Triceps brachii": {"male": "• Compound: 3 sets\n• Isolation: 4 sets\n• Unilateral: 2 sets", "female": "• Compound: 2 sets\n• Isolation: 4 sets\n• Unilateral: 2 sets"},
+    "Latissimus dorsi": {"male": "• Compound: 6 sets\n• Isolation: 3 sets\n• Unilateral: 2 sets", "female": "• Compound: 5 sets\n• Isolation: 3 sets\n• Unilateral: 2 sets"},
+    "Trapezius": {"male": "• Compound: 3 sets\n• Isolation: 4 sets\n• Unilateral: 2 sets", "female": "• Compound: 2 sets\n• Isolation: 4 sets\n• Unilateral: 2 sets"},
+    "Quadriceps femoris": {"male": "• Compound: 6 sets\n• Isolation: 3 sets\n• Unilateral: 2 sets", "female": "• Compound: 5 sets\n• Isolation: 3 sets\n• Unilateral: 2 sets"},
+    "Hamstrings": {"male": "• Compound: 4 sets\n• Isolation: 3 sets\n• Unilateral: 2 sets", "female": "• Compound: 3 sets\n• Isolation: 3 sets\n• Unilateral: 2 sets"},
+    "Gluteus Maximus": {"male": "• Compound: 5 sets\n• Isolation: 3 sets\n• Unilateral: 2 sets", "female": "• Compound: 4 sets\n• Isolation: 3 sets\n• Unilateral: 2 sets"},
+    "Soleus": {"male": "• Compound: 3 sets\n• Isolation: 3 sets\n• Unilateral: 2 sets", "female": "• Compound: 2 sets\n• Isolation: 3 sets\n• Unilateral: 2 sets"},
+    "Rectus Abdominis": {"male": "• Compound: 2 sets\n• Isolation: 4 sets\n• Unilateral: 2 sets", "female": "• Compound: 2 sets\n• Isolation: 4 sets\n• Unilateral: 2 sets"},
+    "Obliques": {"male": "• Compound: 2 sets\n• Isolation: 4 sets\n• Unilateral: 2 sets", "female": "• Compound: 2 sets\n• Isolation: 4 sets\n• Unilateral: 2 sets"},
+}
+
+COMPOUND_REST = {
+    "Pectoralis Major": {"male": "90–120", "female": "60–90"},
+    "Deltoideus": {"male": "90–120", "female": "60–90"},
+    "Biceps brachii": {"male": "60–90", "female": "45–60"},
+    "Triceps brachii": {"male": "60–90", "female": "45–60"},
+    "Latissimus dorsi": {"male": "90–120", "female": "60–90"},
+    "Trapezius": {"male": "60–90", "female": "45–60"},
+    "Quadriceps femoris": {"male": "90–120", "female": "60–90"},
+    "Hamstrings": {"male": "90–120", "female": "60–90"},
+    "Gluteus Maximus": {"male": "90–120", "female": "60–90"},
+    "Soleus": {"male": "60–90", "female": "45–60"},
+    "Rectus Abdominis": {"male": "60–90", "female": "45–60"},
+    "Obliques": {"male": "60–90", "female": "45–60"},
+}
+
+ISOLATION_REST = {
+    "Pectoralis Major": {"male": "60–90", "female": "45–60"},
+    "Deltoideus": {"male": "60–90", "female": "45–60"},
+    "Biceps brachii": {"male": "45–60", "female": "30–45"},
+    "Triceps brachii": {"male": "45–60", "female": "30–45"},
+    "Latissimus dorsi": {"male": "60–90", "female": "45–60"},
+    "Trapezius": {"male": "45–60", "female": "30–45"},
+    "Quadriceps femoris": {"male": "60–90", "female": "45–60"},
+    "Hamstrings": {"male": "60–90", "female": "45–60"},
+    "Gluteus Maximus": {"male": "60–90", "female": "45–60"},
+    "Soleus": {"male": "45–60", "female": "30–45"},
+    "Rectus Abdominis": {"male": "45–60", "female": "30–45"},
+    "Obliques": {"male": "45–60", "female": "30–45"},
+}
+
+UNILATERAL_REST = {
+    "Pectoralis Major": {"male": "60", "female": "45"},
+    "Deltoideus": {"male": "60", "female": "45"},
+    "Biceps brachii": {"male": "45", "female": "30"},
+    "Triceps brachii": {"male": "45", "female": "30"},
+    "Latissimus dorsi": {"male": "60", "female": "45"},
+    "Trapezius": {"male": "45", "female": "30"},
+    "Quadriceps femoris": {"male": "60", "female": "45"},
+    "Hamstrings": {"male": "60", "female": "45"},
+    "Gluteus Maximus": {"male": "60", "female": "45"},
+    "Soleus": {"male": "45", "female": "30"},
+    "Rectus Abdominis": {"male": "45", "female": "30"},
+    "Obliques": {"male": "45", "female": "30"},
+}
+
+SLOW_TWITCH_MUSCLES = ("Soleus", "Rectus Abdominis", "Obliques")
+
+# (compound prefix, 1RM multiplier, isolation line, unilateral line)
+STANDARD_REPS = ("• Compound: 10 reps @ 75% of 1RM", 1.333, "• Isolation: 12 reps @ 70% of 1RM", "• Unilateral: 12 reps @ 65% of 1RM")
+ARM_REPS_FEMALE = ("• Compound: 12 reps @ 70% of 1RM", 1.4, "• Isolation: 12 reps @ 65% of 1RM", "• Unilateral: 12 reps @ 60% of 1RM")
+CORE_REPS = {
+    "male": ("• Compound: 15 reps @ 65% of 1RM", 1.333, "• Isolation: 15 reps @ 60% of 1RM", "• Unilateral: 15 reps @ 55% of 1RM"),
+    "female": ("• Compound: 20 reps @ 60% of 1RM", 1.4, "• Isolation: 20 reps @ 55% of 1RM", "• Unilateral: 20 reps @ 50% of 1RM"),
+}
+
+REP_SCHEMES = {
+    "Pectoralis Major": {"male": STANDARD_REPS, "female": STANDARD_REPS},
+    "Deltoideus": {"male": STANDARD_REPS, "female": STANDARD_REPS},
+    "Biceps brachii": {"male": STANDARD_REPS, "female": ARM_REPS_FEMALE},
+    "Triceps brachii": {"male": STANDARD_REPS, "female": ARM_REPS_FEMALE},
+    "Latissimus dorsi": {"male": STANDARD_REPS, "female": STANDARD_REPS},
+    "Trapezius": {"male": STANDARD_REPS, "female": STANDARD_REPS},
+    "Quadriceps femoris": {"male": STANDARD_REPS, "female": STANDARD_REPS},
+    "Hamstrings": {"male": STANDARD_REPS, "female": STANDARD_REPS},
+    "Gluteus Maximus": {"male": STANDARD_REPS, "female": STANDARD_REPS},
+    "Soleus": {
+        "male": ("• Compound: 10 reps @ 70% of 1RM", 1.333, "• Isolation: 15 reps @ 65% of 1RM", "• Unilateral: 15 reps @ 60% of 1RM"),
+        "female": ("• Compound: 12 reps @ 65% of 1RM", 1.4, "• Isolation: 15 reps @ 60% of 1RM", "• Unilateral: 15 reps @ 60% of 1RM"),
+    },
+    "Rectus Abdominis": CORE_REPS,
+    "Obliques": CORE_REPS,
+}
+
+# Every per-muscle artifact of the hypertrophy report, frozen once per (muscle, gender)
+HypertrophyContent = namedtuple(
+    "HypertrophyContent",
+    ["breathing", "exercise_plan", "exercise_guide", "biomech", "set_plan", "rest_periods", "reps"]
+)
+
+def format_rest_periods(compound_rest, isolation_rest, unilateral_rest, fiber_bias):
+    return (
+        f"Rest Period Between Sets (seconds):\n"
+        f"• Compound: {compound_rest}\n"
+        f"• Isolation: {isolation_rest}\n"
+        f"• Unilateral: {unilateral_rest}\n\n"
+        f"Muscle Fiber Type Bias: {fiber_bias}"
+    )
+
+def fiber_bias_for(muscle):
+    return "Slow-twitch dominant" if muscle in SLOW_TWITCH_MUSCLES else "Mixed or Fast-twitch dominant"
+
+def build_hypertrophy_catalog():
+    catalog = {}
+    for muscle in MUSCLE_GROUPS:
+        for gender in ("male", "female"):
+            catalog[(muscle, gender)] = HypertrophyContent(
+                breathing=BREATHING_GUIDE[muscle],
+                exercise_plan=EXERCISE_PLANS[muscle][gender],
+                exercise_guide=tuple(EXERCISE_GUIDES[gender][muscle]),
+                biomech=tuple(BIOMECH_GUIDES[muscle][gender]),
+                set_plan=SET_PLANS[muscle][gender],
+                rest_periods=format_rest_periods(
+                    COMPOUND_REST[muscle][gender],
+                    ISOLATION_REST[muscle][gender],
+                    UNILATERAL_REST[muscle][gender],
+                    fiber_bias_for(muscle)
+                ),
+                reps=REP_SCHEMES[muscle][gender]
+            )
+    return catalog
+
+# Built once at import; handlers only do dict lookups against it
+HYPERTROPHY_CATALOG = build_hypertrophy_catalog()
+
+# Exercise video links from EXERCISE_LINK_FILE, compiled into the linkified guide text
+# for every (muscle, gender). Each load builds a new immutable snapshot and swaps it in
+# with one assignment, so readers never lock and never see a half-built mapping.
+# Reloads happen when the ini's mtime changes or on a signed POST to /admin/reload-links.
+EXERCISE_LINK_FILE = os.environ["EXERCISE_LINK_FILE"]
+LINK_CHECK_INTERVAL = float(os.environ.get("LINK_CHECK_INTERVAL", 5))
+LINK_RELOAD_SECRET = os.environ.get("LINK_RELOAD_SECRET")
+
+ExerciseLinks = namedtuple("ExerciseLinks", ["version", "mtime", "links", "guides"])
+
+exercise_link_stats = {"loads": 0, "failures": 0, "entries": 0, "guides": 0, "load_ms": None, "loaded_at": None}
+
+def read_exercise_links(path):
+    parser = configparser.ConfigParser()
+    parser.read(path)
+    # configparser lower-cases option names, which doubles as our normalized exercise name
+    return dict(parser["Exercises"])
+
+def linkify_exercise_guides(links):
+    guides = {}
+    for key, content in HYPERTROPHY_CATALOG.items():
+        lines = []
+        for guide in content.exercise_guide:
+            exercise_name, exercise_info = guide[2:].split(':', 1)
+            ex_url = links.get(exercise_name.lower())
+            if ex_url is not None:
+                guide = f"• <{ex_url}|{exercise_name}>:{exercise_info}"
+            lines.append(guide)
+        guides[key] = "\n".join(lines)
+    return guides
+
+def load_exercise_links(path, version):
+    started = time.perf_counter()
+    mtime = os.stat(path).st_mtime_ns
+    links = read_exercise_links(path)
+    snapshot = ExerciseLinks(version, mtime, MappingProxyType(links), MappingProxyType(linkify_exercise_guides(links)))
+    exercise_link_stats.update(
+        loads=exercise_link_stats["loads"] + 1,
+        entries=len(snapshot.links),
+        guides=len(snapshot.guides),
+        load_ms=round((time.perf_counter() - started) * 1000, 3),
+        loaded_at=time.time()
+    )
+    return snapshot
+
+exercise_links = load_exercise_links(EXERCISE_LINK_FILE, 0)
+next_link_check = time.monotonic() + LINK_CHECK_INTERVAL
+link_reload_lock = threading.Lock()
+
+def refresh_exercise_links(force=False):
+    # Caller holds link_reload_lock
+    global exercise_links
+    try:
+        if force or os.stat(EXERCISE_LINK_FILE).st_mtime_ns != exercise_links.mtime:
+            exercise_links = load_exercise_links(EXERCISE_LINK_FILE, exercise_links.version + 1)
+            return True
+    except (OSError, KeyError, configparser.Error):
+        # Missing or half-written file: keep serving the last good links
+        exercise_link_stats["failures"] += 1
+        app.logger.exception("Failed to reload %s", EXERCISE_LINK_FILE)
+    return False
+
+def current_exercise_links():
+    global next_link_check
+    now = time.monotonic()
+    # One thread stats the file per interval; everyone else keeps the snapshot they have
+    if now < next_link_check or not link_reload_lock.acquire(blocking=False):
+        return exercise_links
+    try:
+        next_link_check = now + LINK_CHECK_INTERVAL
+        refresh_exercise_links()
+    finally:
+        link_reload_lock.release()
+    return exercise_links
+
+def exercise_link_stats_snapshot():
+    return {"version": exercise_links.version, **exercise_link_stats}
+
+link_reload_verifier = SignatureVerifier(LINK_RELOAD_SECRET) if LINK_RELOAD_SECRET else None
+
+def handle_link_reload(body, timestamp, signature):
+    # Signed like Slack requests: v0=HMAC-SHA256(secret, "v0:{timestamp}:{body}"), 5 minute window.
+    # Returns (status, payload) so both the Flask and aiohttp entry points can serve it.
+    if link_reload_verifier is None:
+        return 404, {"error": "link reload is disabled"}
+    try:
+        valid = link_reload_verifier.is_valid(body, timestamp, signature)
+    except ValueError:
+        valid = False
+    if not valid:
+        return 401, {"error": "invalid signature"}
+    with link_reload_lock:
+        reloaded = refresh_exercise_links(force=True)
+    return (200 if reloaded else 500), {"reloaded": reloaded, **exercise_link_stats_snapshot()}
+
+def get_breathing_guidance(muscle):
+    # Return the corresponding breathing guidance, or default message if no match
+    return BREATHING_GUIDE.get(muscle, "Breathing guidance not available for this muscle group.")
+
+def get_exercise_plan(muscle_group, gender):
+    gender = "male" if gender.lower() == "male" else "female"
+    content = HYPERTROPHY_CATALOG.get((muscle_group, gender))
+    if content is None:
         return "Please select a valid muscle group."
+    return content.exercise_plan
 
 def exercise_guide(gender, muscle_group):
-    exercises = {
-        "male": {
-            "Pectoralis Major": [
-                "• Bench Press: Lower the barbell in a controlled manner and press explosively to fully engage the chest.",
-                "• Incline Dumbbell Press: Focus on activating the upper chest. Maintain control throughout the range of motion.",
-                "• Dumbbell Press: Ensure full chest engagement and avoid overextension at the top.",
-                "• Single-Arm Dumbbell Press: Emphasize unilateral movement to improve balance and strength."
-            ],
-            "Deltoideus": [
-                "• Overhead Press: Maintain strict form and avoid excessive lumbar extension.",
-                "• Arnold Press: Focus on wrist rotation and upper back engagement.",
-                "• Lateral Raises: Ensure slight elbow bend and a controlled motion during the lift.",
-                "• Rear Delt Fly: Engage the rear delts by controlling the range of motion.",
-                "• Single-Arm Arnold Press: Focus on developing bilateral symmetry and consistent pressing."
-            ],
-            "Biceps brachii": [
-                "• Barbell Curl: Avoid swinging and focus on full range of motion.",
-                "• Dumbbell Curl: Control the movement during both the concentric and eccentric phases.",
-                "• Concentration Curl: Isolate the biceps effectively by maintaining strict form.",
-                "• Hammer Curl: Engage the brachialis and brachioradialis for a fuller arm."
-            ],
-            "Triceps brachii": [
-                "• Close-Grip Bench Press: Focus on locking out with the triceps.",
-                "• Skull Crushers: Perform with controlled descent and avoid excessive elbow flaring.",
-                "• Single-Arm Overhead Tricep Extension: Maintain full range of motion and proper elbow positioning."
-            ],
-            "Latissimus dorsi": [
-                "• Pull-Ups: Ensure a full contraction at the top and slow descent.",
-                "• Barbell Row: Maintain proper torso alignment for an optimal pull.",
-                "• Lat Pulldown: Focus on scapular control and a full stretch at the bottom.",
-                "• Single-Arm Dumbbell Row: Engage the lats unilaterally to address any imbalances."
-            ],
-            "Trapezius": [
-                "• Upright Row: Focus on pulling to shoulder height for optimal trap activation.",
-                "• Barbell Shrugs: Hold at the top of the movement to maximize trap contraction.",
-                "• Single-Arm Face Pulls: Focus on upper trap engagement and scapular retraction."
-            ],
-            "Quadriceps femoris": [
-                "• Barbell Squat: Ensure depth and proper knee tracking to maximize quadriceps activation.",
-                "• Leg Press: Control the negative phase to maintain muscle tension.",
-                "• Leg Extension: Fully extend the knee without locking out to optimize activation.",
-                "• Walking Lunges: Focus on a controlled descent and active knee extension."
-            ],
-            "Hamstrings": [
-                "• Romanian Deadlift: Maintain a neutral spine and slight knee bend to emphasize hamstring stretch.",
-                "• Seated Leg Curl: Focus on slow eccentric movement for maximum hamstring activation.",
-                "• Single-Leg Deadlift: Perform with controlled motion to target hamstring stability."
-            ],
-            "Gluteus Maximus": [
-                "• Barbell Squat: Achieve optimal squat depth for maximal glute engagement.",
-                "• Hip Thrust: Focus on maintaining proper neck alignment during thrust.",
-                "• Bulgarian Split Squat: Ensure posterior chain engagement while maintaining balance.",
-                "• Cable Pull-Through: Focus on glute alignment throughout the movement."
-            ],
-            "Soleus": [
-                "• Standing Calf Raises: Focus on peak contraction and controlled motion.",
-                "• Seated Calf Raises: Engage the soleus by focusing on the controlled negative phase.",
-                "• Single-Leg Farmer's Walk: Build unilateral stability and calf strength."
-            ],
-            "Rectus Abdominis": [
-                "• Hanging Leg Raises: Focus on full engagement of the abdominal muscles.",
-                "• Ab Wheel Rollouts: Maintain a neutral spine to prevent lower back strain.",
-                "• Side Plank with Reach: Engage the obliques and improve core stability."
-            ],
-            "Obliques": [
-                "• Russian Twists: Control rotation for enhanced core strength.",
-                "• Side Plank with Hip Dip: Focus on engaging the obliques throughout the movement."
-            ]
-        },
-        "female": {
-            "Pectoralis Major": [
-                "• Incline Dumbbell Press: Focus on controlled motion and range of motion.",
-                "• Cable Fly: Maintain a slight bend in the elbows and focus on the stretch.",
-                "• Dumbbell Press: Keep the shoulder blades retracted, with a controlled eccentric phase.",
-                "• Single-Arm Dumbbell Press: Prioritize unilateral engagement and control the movement for better activation."
-            ],
-            "Deltoideus": [
-                "• Arnold Press: Slow, controlled movement with wrist rotation for shoulder development.",
-                "• Lateral Raises: Keep slight elbow bend and emphasize mid-deltoid contraction.",
-                "• Front Raises: Focus on the eccentric portion and controlled movement.",
-                "• Single-Arm Arnold Press: Perform with a focus on unilateral stability and equal range of motion."
-            ],
-            "Biceps brachii": [
-                "• Barbell Curl: Focus on controlled motion without excessive momentum.",
-                "• Preacher Curl: Eliminate shoulder involvement to fully isolate the biceps.",
-                "• Dumbbell Curl: Ensure the full range of motion and steady tempo.",
-                "• Single-Arm Dumbbell Curl: Promote balanced strength development by targeting one arm at a time."
-            ],
-            "Triceps brachii": [
-                "• Kickbacks: Focus on elbow position and tricep engagement throughout the movement.",
-                "• Close-Grip Bench Press: Ensure proper form to activate triceps effectively.",
-                "• Single-Arm Overhead Tricep Extension: Work on form and contraction for maximum isolation."
-            ],
-            "Latissimus dorsi": [
-                "• Pull-Ups: Focus on a controlled eccentric phase to fully engage the lats.",
-                "• Seated Cable Row: Target the lats while maintaining a neutral spine.",
-                "• Barbell Row: Ensure a stable back to avoid lower back strain.",
-                "• Single-Arm Dumbbell Row: Prioritize activation of the lats with controlled motion."
-            ],
-            "Trapezius": [
-                "• Dumbbell Shrugs: Maintain proper posture to isolate the traps.",
-                "• Face Pulls: Engage the upper traps and rear delts for balanced shoulder development.",
-                "• Single-Arm Cable Shrugs: Perform with strict form to focus on unilateral trap strength."
-            ],
-            "Quadriceps femoris": [
-                "• Bulgarian Split Squat: Focus on the leading leg for maximum quadriceps recruitment.",
-                "• Step-Ups: Ensure proper knee alignment and drive through the heel.",
-                "• Leg Extension: Maintain constant tension for hypertrophy."
-            ],
-            "Hamstrings": [
-                "• Romanian Deadlift: Emphasize hamstring activation and avoid rounding the back.",
-                "• Stability Ball Leg Curl: Focus on eccentric strength and control during the movement.",
-                "• Single-Leg Deadlift: Improve unilateral hamstring activation and stability."
-            ],
-            "Gluteus Maximus": [
-                "• Hip Thrusts: Focus on controlled thrusts for maximum glute activation.",
-                "• Squats: Engage glutes deeply by focusing on depth and knee positioning.",
-                "• Glute Kickbacks: Target the glutes with proper isolation and full range of motion.",
-                "• Single-Leg Hip Bridge: Enhance glute activation with an isolated movement."
-            ],
-            "Soleus": [
-                "• Standing Calf Raises: Control the movement to activate the soleus effectively.",
-                "• Seated Calf Raises: Focus on full stretch and contraction of the soleus.",
-                "• Single-Leg Calf Raises: Improve unilateral calf strength and stability."
-            ],
-            "Rectus Abdominis": [
-                "• Cable Crunches: Maintain tension during the movement for full core engagement.",
-                "• Hanging Leg Raises: Focus on a controlled movement to isolate the rectus abdominis.",
-                "• Side Plank: Enhance core strength and stability."
-            ],
-            "Obliques": [
-                "• Russian Twists: Maintain control and keep the torso stable.",
-                "• Side Plank with Hip Dip: Improve endurance and stability in the obliques."
-            ]
-        }
-    }
-    
-    # Check for gender and muscle group in dictionary
-    if gender.lower() in exercises:
-        if muscle_group in exercises[gender.lower()]:
-            for index, guide in enumerate(exercises[gender.lower()][muscle_group]):
-                exercise_name = guide.split(':')[0][2:]
-                exercise_info = guide.split(':')[1]
-                if exercise_name.lower() in exercise_links:
-                    ex_url = exercise_links[exercise_name.lower()]
-                    exercises[gender.lower()][muscle_group][index] = f"• <{ex_url}|{exercise_name}>:{exercise_info}"
-            return "\n".join(exercises[gender.lower()][muscle_group])
-        else:
-            return "No Match: Please select a valid muscle group."
-    else:
+    # Check for gender and muscle group in the catalog
+    gender = gender.lower()
+    if gender not in ("male", "female"):
         return "No Match: Please select a valid gender."
+    guide = current_exercise_links().guides.get((muscle_group, gender))
+    if guide is None:
+        return "No Match: Please select a valid muscle group."
+    return guide
 
 def biomech_guide(gender, muscle_group):
-    if muscle_group == "Pectoralis Major":
-        if gender == "male":
-            return [
-                "• Control the descent in bench press for optimal chest stretch.",
-                "• Focus on upper chest activation in incline press.",
-                "• Lock elbows in dumbbell press for efficient power transfer.",
-                "• Maintain a neutral spine during single-arm press for stability."
-            ]
-        else:
-            return [
-                "• Focus on controlled descent in incline press for chest stretch.",
-                "• Keep elbows slightly bent in cable fly for full pectoral engagement.",
-                "• Retract shoulder blades to enhance chest press effectiveness.",
-                "• Engage core in single-arm press for balance."
-            ]
-    elif muscle_group == "Deltoideus":
-        if gender == "male":
-            return [
-                "• Keep elbows slightly in front during overhead press for deltoid isolation.",
-                "• Maintain shoulder rotation in Arnold press to maximize anterior deltoid activation.",
-                "• Slow down lateral raises for better deltoid control.",
-                "• Ensure rear delts are fully engaged during reverse fly."
-            ]
-        else:
-            return [
-                "• Control movement in Arnold press for full deltoid engagement.",
-                "• Focus on mid-deltoid contraction in lateral raises.",
-                "• Eliminate momentum in front raises for deltoid isolation.",
-                "• Keep core tight during unilateral movements for balance."
-            ]
-    elif muscle_group == "Biceps brachii":
-        if gender == "male":
-            return [
-                "• Achieve full range of motion during barbell curls for bicep peak.",
-                "• Focus on full contraction in dumbbell curls.",
-                "• Control the negative in concentration curls for peak activation.",
-                "• Engage brachialis fully in hammer curls."
-            ]
-        else:
-            return [
-                "• Slow down the descent in barbell curls for better bicep stretch.",
-                "• Focus on elbow flexion in preacher curls for isolation.",
-                "• Keep shoulders still during dumbbell curls for maximum bicep tension.",
-                "• Maintain strict form in single-arm curls for balanced strength."
-            ]
-    elif muscle_group == "Triceps brachii":
-        if gender == "male":
-            return [
-                "• Press close-grip for maximal tricep engagement.",
-                "• Maintain control during skull crushers for full range.",
-                "• Focus on elbow stability during overhead tricep extension."
-            ]
-        else:
-            return [
-                "• Keep elbows fixed during tricep kickbacks for isolated tension.",
-                "• Maximize stretch in close-grip bench press for tricep activation.",
-                "• Slow down movement in overhead extension for better isolation."
-            ]
-    elif muscle_group == "Latissimus dorsi":
-        if gender == "male":
-            return [
-                "• Focus on scapular retraction during pull-ups for lat stretch.",
-                "• Maintain a slight lean during barbell row to maximize lat engagement.",
-                "• Keep torso stable during lat pulldowns for effective muscle recruitment.",
-                "• Engage lats fully in single-arm dumbbell rows."
-            ]
-        else:
-            return [
-                "• Control descent in pull-ups to maximize lat activation.",
-                "• Focus on neutral spine during seated cable rows for consistent lat tension.",
-                "• Keep elbows close during barbell rows for lat isolation.",
-                "• Maintain a stable base during dumbbell rows for balanced lat engagement."
-            ]
-    elif muscle_group == "Trapezius":
-        if gender == "male":
-            return [
-                "• Pull barbell to shoulder height during shrugs for upper trap activation.",
-                "• Squeeze at the top of shrugs for maximal trap contraction.",
-                "• Focus on scapular depression during face pulls for rear deltoid and trap synergy."
-            ]
-        else:
-            return [
-                "• Maintain a neutral spine during dumbbell shrugs for optimal trap isolation.",
-                "• Keep shoulders down and back during face pulls to target upper traps.",
-                "• Engage traps in cable shrugs by controlling the descent."
-            ]
-    elif muscle_group == "Quadriceps femoris":
-        if gender == "male":
-            return [
-                "• Squat deep for full quads engagement, keeping knees aligned.",
-                "• Maintain constant tension during leg press for optimal quad activation.",
-                "• Focus on knee extension in walking lunges for quad emphasis."
-            ]
-        else:
-            return [
-                "• Focus on full range of motion in Bulgarian split squats for quad isolation.",
-                "• Control descent in leg extension for constant tension.",
-                "• Focus on glute-quad synergy during step-ups."
-            ]
-    elif muscle_group == "Hamstrings":
-        if gender == "male":
-            return [
-                "• Keep back flat during Romanian deadlifts for hamstring stretch.",
-                "• Control eccentric phase in leg curls for time under tension.",
-                "• Ensure full hamstring activation during single-leg deadlifts."
-            ]
-        else:
-            return [
-                "• Focus on hamstring stretch and control during Romanian deadlifts.",
-                "• Maximize hamstring recruitment in stability ball leg curls.",
-                "• Engage core for stability in single-leg deadlifts."
-            ]
-    elif muscle_group == "Gluteus Maximus":
-        if gender == "male":
-            return [
-                "• Squat deep to activate glutes, ensuring knees track outward.",
-                "• Focus on hip extension during hip thrusts for maximal glute contraction.",
-                "• Maintain control in Bulgarian split squats for glute isolation."
-            ]
-        else:
-            return [
-                "• Engage glutes fully during hip thrusts with controlled tempo.",
-                "• Focus on full squat depth for glute activation.",
-                "• Keep hips level during single-leg hip bridge for glute focus."
-            ]
-    elif muscle_group == "Soleus":
-        if gender == "male":
-            return [
-                "• Focus on calf squeeze during standing calf raises for full soleus activation.",
-                "• Control the negative phase in seated calf raises for calf engagement.",
-                "• Engage soleus with proper alignment during single-leg calf raises."
-            ]
-        else:
-            return [
-                "• Maintain slow movement during standing calf raises for full soleus tension.",
-                "• Control the negative phase in seated calf raises to improve calf endurance.",
-                "• Engage core in single-leg calf raises for balance."
-            ]
-    elif muscle_group == "Rectus Abdominis":
-        if gender == "male":
-            return [
-                "• Maintain a neutral spine during hanging leg raises for better ab engagement.",
-                "• Control movement during ab wheel rollouts for core activation.",
-                "• Keep hips steady in side planks to target obliques."
-            ]
-        else:
-            return [
-                "• Focus on crunching from the core during cable crunches.",
-                "• Maintain a controlled pace during hanging leg raises for maximum ab tension.",
-                "• Keep body aligned in side planks for efficient core stabilization."
-            ]
-    elif muscle_group == "Obliques":
-        if gender == "male":
-            return [
-                "• Focus on torso rotation during Russian twists for oblique isolation.",
-                "• Keep hips steady during side planks with hip dips for oblique emphasis."
-            ]
-        else:
-            return [
-                "• Maintain core stability during Russian twists.",
-                "• Engage obliques fully during side plank with controlled dips."
-            ]
-    else:
+    gender = "male" if gender == "male" else "female"
+    content = HYPERTROPHY_CATALOG.get((muscle_group, gender))
+    if content is None:
         return "Select a valid muscle group."
+    return list(content.biomech)
 
 def set_plan(muscle_group, gender):
-    if muscle_group == "Pectoralis Major":
-        if gender == "male":
-            return "• Compound: 6 sets\n• Isolation: 3 sets\n• Unilateral: 2 sets"
-        elif gender == "female":
-            return "• Compound: 5 sets\n• Isolation: 3 sets\n• Unilateral: 2 sets"
-    elif muscle_group == "Deltoideus":
-        if gender == "male":
-            return "• Compound: 4 sets\n• Isolation: 4 sets\n• Unilateral: 2 sets"
-        elif gender == "female":
-            return "• Compound: 3 sets\n• Isolation: 4 sets\n• Unilateral: 2 sets"
-    elif muscle_group == "Biceps brachii":
-        if gender == "male":
-            return "• Compound: 3 sets\n• Isolation: 4 sets\n• Unilateral: 2 sets"
-        elif gender == "female":
-            return "• Compound: 2 sets\n• Isolation: 4 sets\n• Unilateral: 2 sets"
-    elif muscle_group == "Triceps brachii":
-        if gender == "male":
-            return "• Compound: 3 sets\n• Isolation: 4 sets\n• Unilateral: 2 sets"
-        elif gender == "female":
-            return "• Compound: 2 sets\n• Isolation: 4 sets\n• Unilateral: 2 sets"
-    elif muscle_group == "Latissimus dorsi":
-        if gender == "male":
-            return "• Compound: 6 sets\n• Isolation: 3 sets\n• Unilateral: 2 sets"
-        elif gender == "female":
-            return "• Compound: 5 sets\n• Isolation: 3 sets\n• Unilateral: 2 sets"
-    elif muscle_group == "Trapezius":
-        if gender == "male":
-            return "• Compound: 3 sets\n• Isolation: 4 sets\n• Unilateral: 2 sets"
-        elif gender == "female":
-            return "• Compound: 2 sets\n• Isolation: 4 sets\n• Unilateral: 2 sets"
-    elif muscle_group == "Quadriceps femoris":
-        if gender == "male":
-            return "• Compound: 6 sets\n• Isolation: 3 sets\n• Unilateral: 2 sets"
-        elif gender == "female":
-            return "• Compound: 5 sets\n• Isolation: 3 sets\n• Unilateral: 2 sets"
-    elif muscle_group == "Hamstrings":
-        if gender == "male":
-            return "• Compound: 4 sets\n• Isolation: 3 sets\n• Unilateral: 2 sets"
-        elif gender == "female":
-            return "• Compound: 3 sets\n• Isolation: 3 sets\n• Unilateral: 2 sets"
-    elif muscle_group == "Gluteus Maximus":
-        if gender == "male":
-            return "• Compound: 5 sets\n• Isolation: 3 sets\n• Unilateral: 2 sets"
-        elif gender == "female":
-            return "• Compound: 4 sets\n• Isolation: 3 sets\n• Unilateral: 2 sets"
-    elif muscle_group == "Soleus":
-        if gender == "male":
-            return "• Compound: 3 sets\n• Isolation: 3 sets\n• Unilateral: 2 sets"
-        elif gender == "female":
-            return "• Compound: 2 sets\n• Isolation: 3 sets\n• Unilateral: 2 sets"
-    elif muscle_group == "Rectus Abdominis":
-        return "• Compound: 2 sets\n• Isolation: 4 sets\n• Unilateral: 2 sets"
-    elif muscle_group == "Obliques":
-        return "• Compound: 2 sets\n• Isolation: 4 sets\n• Unilateral: 2 sets"
-    else:
+    content = HYPERTROPHY_CATALOG.get((muscle_group, gender))
+    if content is not None:
+        return content.set_plan
+    if muscle_group not in SET_PLANS:
         return "• No match found"
+    # Core muscles share one plan regardless of gender
+    if muscle_group in ("Rectus Abdominis", "Obliques"):
+        return SET_PLANS[muscle_group]["male"]
+    return None
 
 def rest_periods_and_fiber_bias(gender, muscle):
-    # Define rest periods based on muscle and gender
-    compoundRest = {
-        "Pectoralis Major": {"male": "90–120", "female": "60–90"},
-        "Deltoideus": {"male": "90–120", "female": "60–90"},
-        "Biceps brachii": {"male": "60–90", "female": "45–60"},
-        "Triceps brachii": {"male": "60–90", "female": "45–60"},
-        "Latissimus dorsi": {"male": "90–120", "female": "60–90"},
-        "Trapezius": {"male": "60–90", "female": "45–60"},
-        "Quadriceps femoris": {"male": "90–120", "female": "60–90"},
-        "Hamstrings": {"male": "90–120", "female": "60–90"},
-        "Gluteus Maximus": {"male": "90–120", "female": "60–90"},
-        "Soleus": {"male": "60–90", "female": "45–60"},
-        "Rectus Abdominis": {"male": "60–90", "female": "45–60"},
-        "Obliques": {"male": "60–90", "female": "45–60"},
-    }
-
-    isolationRest = {
-        "Pectoralis Major": {"male": "60–90", "female": "45–60"},
-        "Deltoideus": {"male": "60–90", "female": "45–60"},
-        "Biceps brachii": {"male": "45–60", "female": "30–45"},
-        "Triceps brachii": {"male": "45–60", "female": "30–45"},
-        "Latissimus dorsi": {"male": "60–90", "female": "45–60"},
-        "Trapezius": {"male": "45–60", "female": "30–45"},
-        "Quadriceps femoris": {"male": "60–90", "female": "45–60"},
-        "Hamstrings": {"male": "60–90", "female": "45–60"},
-        "Gluteus Maximus": {"male": "60–90", "female": "45–60"},
-        "Soleus": {"male": "45–60", "female": "30–45"},
-        "Rectus Abdominis": {"male": "45–60", "female": "30–45"},
-        "Obliques": {"male": "45–60", "female": "30–45"},
-    }
-
-    unilateralRest = {
-        "Pectoralis Major": {"male": "60", "female": "45"},
-        "Deltoideus": {"male": "60", "female": "45"},
-        "Biceps brachii": {"male": "45", "female": "30"},
-        "Triceps brachii": {"male": "45", "female": "30"},
-        "Latissimus dorsi": {"male": "60", "female": "45"},
-        "Trapezius": {"male": "45", "female": "30"},
-        "Quadriceps femoris": {"male": "60", "female": "45"},
-        "Hamstrings": {"male": "60", "female": "45"},
-        "Gluteus Maximus": {"male": "60", "female": "45"},
-        "Soleus": {"male": "45", "female": "30"},
-        "Rectus Abdominis": {"male": "45", "female": "30"},
-        "Obliques": {"male": "45", "female": "30"},
-    }
-
-    # Determine fiber bias
-    fiberBias = "Slow-twitch dominant" if muscle in ["Soleus", "Rectus Abdominis", "Obliques"] else "Mixed or Fast-twitch dominant"
-
-    # Get the rest periods based on the muscle and gender
-    compound_rest = compoundRest.get(muscle, {}).get(gender, "No Match")
-    isolation_rest = isolationRest.get(muscle, {}).get(gender, "No Match")
-    unilateral_rest = unilateralRest.get(muscle, {}).get(gender, "No Match")
-
-    # Format the output
-    output = (
-        f"Rest Period Between Sets (seconds):\n"
-        f"• Compound: {compound_rest}\n"
-        f"• Isolation: {isolation_rest}\n"
-        f"• Unilateral: {unilateral_rest}\n\n"
-        f"Muscle Fiber Type Bias: {fiberBias}"
-    )
-
-    return output
+    content = HYPERTROPHY_CATALOG.get((muscle, gender))
+    if content is not None:
+        return content.rest_periods
+    return format_rest_periods("No Match", "No Match", "No Match", fiber_bias_for(muscle))
 
 def get_reps_and_percentage(gender, muscle, one_rm):
     # Helper function to calculate 1RM based on input
@@ -1212,181 +1688,149 @@ def get_reps_and_percentage(gender, muscle, one_rm):
         except ValueError:
             return None
 
-    # Mapping for muscle groups
-    muscle_reps = {
-        "Pectoralis Major": f"• Compound: 10 reps @ 75% of 1RM (1RM = {calculate_1rm(one_rm, 1.333)} kg)\n• Isolation: 12 reps @ 70% of 1RM\n• Unilateral: 12 reps @ 65% of 1RM",
-        "Deltoideus": f"• Compound: 10 reps @ 75% of 1RM (1RM = {calculate_1rm(one_rm, 1.333)} kg)\n• Isolation: 12 reps @ 70% of 1RM\n• Unilateral: 12 reps @ 65% of 1RM",
-        "Latissimus dorsi": f"• Compound: 10 reps @ 75% of 1RM (1RM = {calculate_1rm(one_rm, 1.333)} kg)\n• Isolation: 12 reps @ 70% of 1RM\n• Unilateral: 12 reps @ 65% of 1RM",
-        "Trapezius": f"• Compound: 10 reps @ 75% of 1RM (1RM = {calculate_1rm(one_rm, 1.333)} kg)\n• Isolation: 12 reps @ 70% of 1RM\n• Unilateral: 12 reps @ 65% of 1RM",
-        "Quadriceps femoris": f"• Compound: 10 reps @ 75% of 1RM (1RM = {calculate_1rm(one_rm, 1.333)} kg)\n• Isolation: 12 reps @ 70% of 1RM\n• Unilateral: 12 reps @ 65% of 1RM",
-        "Hamstrings": f"• Compound: 10 reps @ 75% of 1RM (1RM = {calculate_1rm(one_rm, 1.333)} kg)\n• Isolation: 12 reps @ 70% of 1RM\n• Unilateral: 12 reps @ 65% of 1RM",
-        "Gluteus Maximus": f"• Compound: 10 reps @ 75% of 1RM (1RM = {calculate_1rm(one_rm, 1.333)} kg)\n• Isolation: 12 reps @ 70% of 1RM\n• Unilateral: 12 reps @ 65% of 1RM",
-    }
-
-    # Custom behavior for muscles with gender-dependent adjustments
-    if muscle in ["Biceps brachii", "Triceps brachii"]:
-        if gender.lower() == "male":
-            compound_reps = f"• Compound: 10 reps @ 75% of 1RM (1RM = {calculate_1rm(one_rm, 1.333)} kg)"
-            isolation_reps = "• Isolation: 12 reps @ 70% of 1RM"
-            unilateral_reps = "• Unilateral: 12 reps @ 65% of 1RM"
-        else:
-            compound_reps = f"• Compound: 12 reps @ 70% of 1RM (1RM = {calculate_1rm(one_rm, 1.4)} kg)"
-            isolation_reps = "• Isolation: 12 reps @ 65% of 1RM"
-            unilateral_reps = "• Unilateral: 12 reps @ 60% of 1RM"
-        return f"{compound_reps}\n{isolation_reps}\n{unilateral_reps}"
-
-    if muscle == "Soleus":
-        if gender.lower() == "male":
-            compound_reps = f"• Compound: 10 reps @ 70% of 1RM (1RM = {calculate_1rm(one_rm, 1.333)} kg)"
-            isolation_reps = "• Isolation: 15 reps @ 65% of 1RM"
-            unilateral_reps = "• Unilateral: 15 reps @ 60% of 1RM"
-        else:
-            compound_reps = f"• Compound: 12 reps @ 65% of 1RM (1RM = {calculate_1rm(one_rm, 1.4)} kg)"
-            isolation_reps = "• Isolation: 15 reps @ 60% of 1RM"
-            unilateral_reps = "• Unilateral: 15 reps @ 60% of 1RM"
-        return f"{compound_reps}\n{isolation_reps}\n{unilateral_reps}"
-
-    if muscle == "Rectus Abdominis":
-        if gender.lower() == "male":
-            compound_reps = f"• Compound: 15 reps @ 65% of 1RM (1RM = {calculate_1rm(one_rm, 1.333)} kg)"
-            isolation_reps = "• Isolation: 15 reps @ 60% of 1RM"
-            unilateral_reps = "• Unilateral: 15 reps @ 55% of 1RM"
-        else:
-            compound_reps = f"• Compound: 20 reps @ 60% of 1RM (1RM = {calculate_1rm(one_rm, 1.4)} kg)"
-            isolation_reps = "• Isolation: 20 reps @ 55% of 1RM"
-            unilateral_reps = "• Unilateral: 20 reps @ 50% of 1RM"
-        return f"{compound_reps}\n{isolation_reps}\n{unilateral_reps}"
-
-    if muscle == "Obliques":
-        if gender.lower() == "male":
-            compound_reps = f"• Compound: 15 reps @ 65% of 1RM (1RM = {calculate_1rm(one_rm, 1.333)} kg)"
-            isolation_reps = "• Isolation: 15 reps @ 60% of 1RM"
-            unilateral_reps = "• Unilateral: 15 reps @ 55% of 1RM"
-        else:
-            compound_reps = f"• Compound: 20 reps @ 60% of 1RM (1RM = {calculate_1rm(one_rm, 1.4)} kg)"
-            isolation_reps = "• Isolation: 20 reps @ 55% of 1RM"
-            unilateral_reps = "• Unilateral: 20 reps @ 50% of 1RM"
-        return f"{compound_reps}\n{isolation_reps}\n{unilateral_reps}"
-
-    # For all other muscles, fetch from predefined dictionary
-    muscle = muscle.strip()
-    if muscle in muscle_reps:
-        return muscle_reps[muscle]
-
-    return "Input not recognized"
+    gender = "male" if gender.lower() == "male" else "female"
+    content = HYPERTROPHY_CATALOG.get((muscle.strip(), gender))
+    if content is None:
+        return "Input not recognized"
+
+    compound, multiplier, isolation_reps, unilateral_reps = content.reps
+    compound_reps = f"{compound} (1RM = {calculate_1rm(one_rm, multiplier)} kg)"
+    return f"{compound_reps}\n{isolation_reps}\n{unilateral_reps}"
+
+
+HYPERTROPHY_FORM_VIEW = register_view({
+    "type": "modal",
+    "callback_id": "hypertrophy_form",
+    "title": {"type": "plain_text", "text": "Want to get Stronger?"},
+    "submit": {"type": "plain_text", "text": "Submit"},
+    "blocks": [
+         {
+            "type": "input",
+            "block_id": "gender_block",
+            "label": {"type": "plain_text", "text": "Your gender?"},
+            "element": {
+                "type": "static_select",
+                "action_id": "gender_select",
+                "options": [
+                    {
+                        "text": {"type": "plain_text", "text": "Male"},
+                        "value": "male"
+                    },
+                    {
+                        "text": {"type": "plain_text", "text": "Female"},
+                        "value": "female"
+                    }
+                ]
+            }
+        },
+        {
+            "type": "input",
+            "block_id": "muscle_block",
+            "label": {"type": "plain_text", "text": "Which part of your body do you want to build more muscle in?"},
+            "element": {
+                "type": "static_select",
+                "action_id": "muscle_select",
+                "options": [
+                    {
+                        "text": {"type": "plain_text", "text": "Pectoralis Major"},
+                        "value": "Pectoralis Major"
+                    },
+                    {
+                        "text": {"type": "plain_text", "text": "Deltoideus"},
+                        "value": "Deltoideus"
+                    },
+                    {
+                        "text": {"type": "plain_text", "text": "Biceps brachii"},
+                        "value": "Biceps brachii"
+                    },
+                    {
+                        "text": {"type": "plain_text", "text": "Triceps brachii"},
+                        "value": "Triceps brachii"
+                    },
+                    {
+                        "text": {"type": "plain_text", "text": "Latissimus dorsi"},
+                        "value": "Latissimus dorsi"
+                    },
+                    {
+                        "text": {"type": "plain_text", "text": "Trapezius"},
+                        "value": "Trapezius"
+                    },
+                    {
+                        "text": {"type": "plain_text", "text": "Quadriceps femoris"},
+                        "value": "Quadriceps femoris"
+                    },
+                    {
+                        "text": {"type": "plain_text", "text": "Hamstrings"},
+                        "value": "Hamstrings"
+                    },
+                    {
+                        "text": {"type": "plain_text", "text": "Gluteus Maximus"},
+                        "value": "Gluteus Maximus"
+                    },
+                    {
+                        "text": {"type": "plain_text", "text": "Soleus"},
+                        "value": "Soleus"
+                    },
+                    {
+                        "text": {"type": "plain_text", "text": "Rectus Abdominis"},
+                        "value": "Rectus Abdominis"
+                    },
+                    {
+                        "text": {"type": "plain_text", "text": "Obliques"},
+                        "value": "Obliques"
+                    }
+                ]
+            }
+        },
+        {
+            "type": "input",
+            "block_id": "training_weight_block",
+            "label": {"type": "plain_text", "text": "Training weight (kg)?"},
+            "element": {
+                "type": "plain_text_input",
+                "action_id": "training_weight_input",
+                "placeholder": {"type": "plain_text", "text": "e.g. 45"}
+            }
+        }
+    ]
+})
 
+def hypertrophy_form_view(channel_id):
+    return modal_view("hypertrophy_form", channel_id)
 
 @app.action("hypertrophy")
+@timed_listener("action:hypertrophy")
 def handle_option_c_click(ack, body, client):
     ack()
-    update_message_with_disabled_buttons(client, body, selected="Want to get Stronger?")
-    trigger_id = body["trigger_id"]
-    channel_id = body["channel"]["id"]
-
-    client.views_open(
-        trigger_id=trigger_id,
-        view={
-            "type": "modal",
-            "callback_id": "hypertrophy_form",
-            "title": {"type": "plain_text", "text": "Want to get Stronger?"},
-            "submit": {"type": "plain_text", "text": "Submit"},
-            "private_metadata": channel_id,
-            "blocks": [
-                 {
-                    "type": "input",
-                    "block_id": "gender_block",
-                    "label": {"type": "plain_text", "text": "Your gender?"},
-                    "element": {
-                        "type": "static_select",
-                        "action_id": "gender_select",
-                        "options": [
-                            {
-                                "text": {"type": "plain_text", "text": "Male"},
-                                "value": "male"
-                            },
-                            {
-                                "text": {"type": "plain_text", "text": "Female"},
-                                "value": "female"
-                            }
-                        ]
-                    }
-                },
-                {
-                    "type": "input",
-                    "block_id": "muscle_block",
-                    "label": {"type": "plain_text", "text": "Which part of your body do you want to build more muscle in?"},
-                    "element": {
-                        "type": "static_select",
-                        "action_id": "muscle_select",
-                        "options": [
-                            {
-                                "text": {"type": "plain_text", "text": "Pectoralis Major"},
-                                "value": "Pectoralis Major"
-                            },
-                            {
-                                "text": {"type": "plain_text", "text": "Deltoideus"},
-                                "value": "Deltoideus"
-                            },
-                            {
-                                "text": {"type": "plain_text", "text": "Biceps brachii"},
-                                "value": "Biceps brachii"
-                            },
-                            {
-                                "text": {"type": "plain_text", "text": "Triceps brachii"},
-                                "value": "Triceps brachii"
-                            },
-                            {
-                                "text": {"type": "plain_text", "text": "Latissimus dorsi"},
-                                "value": "Latissimus dorsi"
-                            },
-                            {
-                                "text": {"type": "plain_text", "text": "Trapezius"},
-                                "value": "Trapezius"
-                            },
-                            {
-                                "text": {"type": "plain_text", "text": "Quadriceps femoris"},
-                                "value": "Quadriceps femoris"
-                            },
-                            {
-                                "text": {"type": "plain_text", "text": "Hamstrings"},
-                                "value": "Hamstrings"
-                            },
-                            {
-                                "text": {"type": "plain_text", "text": "Gluteus Maximus"},
-                                "value": "Gluteus Maximus"
-                            },
-                            {
-                                "text": {"type": "plain_text", "text": "Soleus"},
-                                "value": "Soleus"
-                            },
-                            {
-                                "text": {"type": "plain_text", "text": "Rectus Abdominis"},
-                                "value": "Rectus Abdominis"
-                            },
-                            {
-                                "text": {"type": "plain_text", "text": "Obliques"},
-                                "value": "Obliques"
-                            }
-                        ]
-                    }
-                },
-                {
-                    "type": "input",
-                    "block_id": "training_weight_block",
-                    "label": {"type": "plain_text", "text": "Training weight (kg)?"},
-                    "element": {
-                        "type": "plain_text_input",
-                        "action_id": "training_weight_input",
-                        "placeholder": {"type": "plain_text", "text": "e.g. 45"}
-                    }
-                }
-            ]
-        }
-    )
+    open_modal(client, body, hypertrophy_form_view, selected="Want to get Stronger?")
+
+SECTION_DIVIDER = "\n" + "—" * 15 + "\n"
+
+# The report body only depends on (gender, muscle); the 1RM line and the
+# status banner are spliced in per request.
+def render_hypertrophy_report(gender, target_muscle):
+    # Keyed on the link version so a reloaded link file never serves a stale cached report
+    return render_hypertrophy_sections(gender, target_muscle, current_exercise_links().version)
+
+@result_cache.cached("hypertrophy_report", max_entries=64)
+def render_hypertrophy_sections(gender, target_muscle, links_version):
+    return "".join([
+        "\nBreathing: ", get_breathing_guidance(target_muscle),
+        SECTION_DIVIDER, get_exercise_plan(target_muscle, gender),
+        SECTION_DIVIDER, exercise_guide(gender, target_muscle),
+        SECTION_DIVIDER, "\n".join(biomech_guide(gender, target_muscle)),
+        SECTION_DIVIDER, set_plan(target_muscle, gender),
+        SECTION_DIVIDER, rest_periods_and_fiber_bias(gender, target_muscle)
+    ])
 
 @app.view("hypertrophy_form")
+@timed_listener("view:hypertrophy_form")
 def handle_hypertrophy_submission(ack, body, client, view):
     ack()
+    record_submission("hypertrophy_form", body, view)
+    run_in_background("hypertrophy_form", post_report, hypertrophy_report, body, client, view)
+
+def hypertrophy_report(body, view):
     user = body["user"]["id"]
     channel_id = view["private_metadata"]
     values = view["state"]["values"]
@@ -1396,98 +1840,95 @@ def handle_hypertrophy_submission(ack, body, client, view):
     training_weight_kg = values["training_weight_block"]["training_weight_input"]["value"]
     
 
-    message = (
+    message = "".join([
         f"✅ Thanks <@{user}>! Here's what you submitted:\n"
         f"• Gender: `{gender}`\n"
         f"• Target Muscle: `{target_muscle}`\n"
-        f"• Compound Training Weight in kg: `{training_weight_kg}`"
-    )
+        f"• Compound Training Weight in kg: `{training_weight_kg}`",
+        SECTION_DIVIDER, generate_status_message(),
+        render_hypertrophy_report(gender, target_muscle),
+        SECTION_DIVIDER, get_reps_and_percentage(gender, target_muscle, training_weight_kg)
+    ])
 
-    message += "\n" + "—" * 15 + "\n" + generate_status_message()
-    message += "\n" + "Breathing: " + get_breathing_guidance(target_muscle)
-    message += "\n" + "—" * 15 + "\n" + get_exercise_plan(target_muscle, gender)
-    message += "\n" + "—" * 15 + "\n" + exercise_guide(gender, target_muscle)
-    message += "\n" + "—" * 15 + "\n" + "\n".join(biomech_guide(gender, target_muscle))
-    message += "\n" + "—" * 15 + "\n" + set_plan(target_muscle, gender)
-    message += "\n" + "—" * 15 + "\n" + rest_periods_and_fiber_bias(gender, target_muscle)
-    message += "\n" + "—" * 15 + "\n" + get_reps_and_percentage(gender, target_muscle, training_weight_kg)
+    try:
+        trend = progress_trend(user, f"training_weight:{target_muscle}", float(training_weight_kg), f"{target_muscle} training weight", " kg")
+        if trend:
+            message = "".join([message, SECTION_DIVIDER, trend])
+    except ValueError:
+        pass
+
+    return channel_id, message
+
+COMPLETION_FORM_VIEW = register_view({
+    "type": "modal",
+    "callback_id": "completion_form",
+    "title": {"type": "plain_text", "text": "Do you feel stronger?"},
+    "submit": {"type": "plain_text", "text": "Submit"},
+    "blocks": [
+         {
+            "type": "input",
+            "block_id": "completion_block",
+            "label": {"type": "plain_text", "text": "Do you feel stronger than before?"},
+            "element": {
+                "type": "static_select",
+                "action_id": "completion_select",
+                "options": [
+                    {
+                        "text": {"type": "plain_text", "text": "10%"},
+                        "value": "10%"
+                    },
+                    {
+                        "text": {"type": "plain_text", "text": "20%"},
+                        "value": "20%"
+                    },
+                    {
+                        "text": {"type": "plain_text", "text": "30%"},
+                        "value": "30%"
+                    },
+                    {
+                        "text": {"type": "plain_text", "text": "40%"},
+                        "value": "40%"
+                    },
+                    {
+                        "text": {"type": "plain_text", "text": "50%"},
+                        "value": "50%"
+                    },
+                    {
+                        "text": {"type": "plain_text", "text": "60%"},
+                        "value": "60%"
+                    },
+                    {
+                        "text": {"type": "plain_text", "text": "70%"},
+                        "value": "70%"
+                    },
+                    {
+                        "text": {"type": "plain_text", "text": "80%"},
+                        "value": "80%"
+                    },
+                    {
+                        "text": {"type": "plain_text", "text": "90%"},
+                        "value": "90%"
+                    },
+                    {
+                        "text": {"type": "plain_text", "text": "100%"},
+                        "value": "100%"
+                    }
+                ]
+            }
+        }
+    ]
+})
 
-    client.chat_postMessage(
-        channel=channel_id,
-        text=message
-    )
+def completion_form_view(channel_id):
+    return modal_view("completion_form", channel_id)
 
 @app.action("completion")
+@timed_listener("action:completion")
 def handle_option_d_click(ack, body, client):
     ack()
-    update_message_with_disabled_buttons(client, body, selected="Do you feel stronger?")
-    trigger_id = body["trigger_id"]
-    channel_id = body["channel"]["id"]
-
-    client.views_open(
-        trigger_id=trigger_id,
-        view={
-            "type": "modal",
-            "callback_id": "completion_form",
-            "title": {"type": "plain_text", "text": "Do you feel stronger?"},
-            "submit": {"type": "plain_text", "text": "Submit"},
-            "private_metadata": channel_id,
-            "blocks": [
-                 {
-                    "type": "input",
-                    "block_id": "completion_block",
-                    "label": {"type": "plain_text", "text": "Do you feel stronger than before?"},
-                    "element": {
-                        "type": "static_select",
-                        "action_id": "completion_select",
-                        "options": [
-                            {
-                                "text": {"type": "plain_text", "text": "10%"},
-                                "value": "10%"
-                            },
-                            {
-                                "text": {"type": "plain_text", "text": "20%"},
-                                "value": "20%"
-                            },
-                            {
-                                "text": {"type": "plain_text", "text": "30%"},
-                                "value": "30%"
-                            },
-                            {
-                                "text": {"type": "plain_text", "text": "40%"},
-                                "value": "40%"
-                            },
-                            {
-                                "text": {"type": "plain_text", "text": "50%"},
-                                "value": "50%"
-                            },
-                            {
-                                "text": {"type": "plain_text", "text": "60%"},
-                                "value": "60%"
-                            },
-                            {
-                                "text": {"type": "plain_text", "text": "70%"},
-                                "value": "70%"
-                            },
-                            {
-                                "text": {"type": "plain_text", "text": "80%"},
-                                "value": "80%"
-                            },
-                            {
-                                "text": {"type": "plain_text", "text": "90%"},
-                                "value": "90%"
-                            },
-                            {
-                                "text": {"type": "plain_text", "text": "100%"},
-                                "value": "100%"
-                            }
-                        ]
-                    }
-                }
-            ]
-        }
-    )
+    open_modal(client, body, completion_form_view, selected="Do you feel stronger?")
 
+@result_cache.cached("completion_snapshot", max_entries=16)
 def optimal_performance_snapshot(pct_str):
     try:
         # Remove % sign and convert to integer
@@ -1541,8 +1982,13 @@ def optimal_performance_snapshot(pct_str):
     return "\n".join([header, "", performance_notes[pct_int], warmup_block])
 
 @app.view("completion_form")
+@timed_listener("view:completion_form")
 def handle_completion_submission(ack, body, client, view):
     ack()
+    record_submission("completion_form", body, view)
+    run_in_background("completion_form", post_report, completion_report, body, client, view)
+
+def completion_report(body, view):
     user = body["user"]["id"]
     channel_id = view["private_metadata"]
     values = view["state"]["values"]
@@ -1563,23 +2009,110 @@ def handle_completion_submission(ack, body, client, view):
 
     message =  optimal_performance_snapshot(percent_complete)
 
-    client.chat_postMessage(
-        channel=channel_id,
-        text=message
-    )
-
-# Flask setup
-flask_app = Flask(__name__)
-handler = SlackRequestHandler(app)
-
-@flask_app.route("/ping", methods=["GET"])
-def ping_events():
-    return "Pong", 200
-
-@flask_app.route("/slack/events", methods=["POST"])
-def slack_events():
-    return handler.handle(request)
+    try:
+        trend = progress_trend(user, "completion", int(percent_complete.strip().replace('%', '')), "Completion", "%")
+        if trend:
+            message = "".join([message, SECTION_DIVIDER, trend])
+    except ValueError:
+        pass
+
+    return channel_id, message
+
+# Existing per-worker stats, exported as counters on /metrics
+def stats_counters():
+    counters = []
+    for key, value in slack_transport_stats.items():
+        counters.append((f"slack_transport_{key}_total", (), value))
+    for key, value in message_filter_stats.items():
+        if key == "subtypes":
+            counters.extend(("message_filter_subtype_total", (("subtype", subtype),), n) for subtype, n in value.items())
+        else:
+            counters.append((f"message_filter_{key}_total", (), value))
+    for key, value in slack_request_verifier.stats.items():
+        counters.append((f"request_verification_{key}_total", (), value))
+    for key, value in event_deduplicator.stats.items():
+        counters.append((f"event_dedup_{key}_total", (), value))
+    for key, value in submission_store.stats.items():
+        counters.append((f"submission_store_{key}_total", (), value))
+    for key, value in session_store.stats.items():
+        counters.append((f"session_{key}_total", (), value))
+    for namespace, stats in result_cache.stats():
+        counters.extend((f"cache_{key}_total", (("namespace", namespace),), value) for key, value in stats.items())
+    for key in ("loads", "failures"):
+        counters.append((f"exercise_link_{key}_total", (), exercise_link_stats[key]))
+    with background_stats_lock:
+        for task, stats in background_stats.items():
+            for key in ("count", "inline", "errors"):
+                counters.append((f"background_task_{key}_total", (("task", task),), stats[key]))
+        for action_id, stats in modal_latency_stats.items():
+            counters.append(("modal_open_near_expiry_total", (("action", action_id),), stats["near_expiry"]))
+    return counters
+
+metrics_registry.add_counter_source(stats_counters)
+
+# gunicorn --preload imports this module once in the master and forks every worker from it,
+# so workers start with the imports, the Bolt app and auth.test already done. The CA bundle
+# is loaded before the first fork to be shared too; sockets, threads and SQLite handles
+# belong to one process and are dropped in the child.
+def reset_after_fork():
+    global slack_connections
+    slack_connections = threading.local()
+    metrics_registry.after_fork()
+    event_deduplicator.after_fork()
+    slack_request_verifier.after_fork()
+    session_store.after_fork()
+    result_cache.after_fork()
+    submission_store.after_fork()
+
+os.register_at_fork(before=slack_ssl_context, after_in_child=reset_after_fork)
+
+# Flask setup. Built on first access to bot.flask_app (gunicorn's bot:flask_app does that)
+# rather than at import: Flask, Werkzeug and Jinja cost ~140ms to import, and async_bot.py
+# imports this module for its listeners without ever serving through Flask.
+def create_flask_app():
+    from flask import Flask, request
+    from slack_bolt.adapter.flask import SlackRequestHandler
+
+    flask_app = Flask(__name__)
+    handler = SlackRequestHandler(app)
+
+    @flask_app.route("/ping", methods=["GET"])
+    def ping_events():
+        return "Pong", 200
+
+    @flask_app.route("/metrics", methods=["GET"])
+    def metrics_events():
+        return metrics_registry.render(), 200, {"Content-Type": "text/plain; version=0.0.4"}
+
+    @flask_app.route("/admin/reload-links", methods=["POST"])
+    def reload_links():
+        status, payload = handle_link_reload(
+            request.get_data(),
+            request.headers.get("X-Admin-Request-Timestamp"),
+            request.headers.get("X-Admin-Signature")
+        )
+        return payload, status
+
+    @flask_app.route("/slack/events", methods=["POST"])
+    def slack_events():
+        rejected = slack_request_verifier.verify(
+            request.headers.get("X-Slack-Request-Timestamp"),
+            request.headers.get("X-Slack-Signature"),
+            request.get_data
+        )
+        if rejected:
+            return "invalid request", 401
+        return handler.handle(request)
+
+    return flask_app
+
+def __getattr__(name):
+    if name == "flask_app":
+        global flask_app
+        flask_app = create_flask_app()
+        return flask_app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Run the server
 if __name__ == "__main__":
-    flask_app.run(port=3000)
+    create_flask_app().run(port=3000)
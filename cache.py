@@ -0,0 +1,170 @@
+import functools
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Namespaced result cache for the renderers and calculators. Each namespace is an LRU in
+# this process with its own entry limit and optional TTL. A namespace created with
+# shared=True also reads through to (and writes to) a SQLite table every gunicorn worker
+# shares, so a value computed in one worker is warm in the others. That costs a SQLite
+# read on every local miss, so it only pays for values that take longer to compute.
+# Hits and misses are counted per namespace and exported on /metrics.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    expires_at REAL,
+    written_at REAL NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID
+"""
+
+STATS = ("hits", "shared_hits", "misses", "evicted", "expired", "errors")
+
+class CacheNamespace:
+    def __init__(self, cache, name, max_entries, ttl, shared):
+        self.cache = cache
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.shared = shared
+        self.entries = OrderedDict()
+        self.stats = dict.fromkeys(STATS, 0)
+        self.lock = threading.Lock()
+
+    def get_or_compute(self, key, compute, *args):
+        # compute(*args) on a miss. key is a tuple of JSON-able values, and shared
+        # values must be JSON-able too.
+        now = time.time() if self.ttl is not None else None
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                if now is None or entry[0] > now:
+                    self.entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return entry[1]
+                del self.entries[key]
+                self.stats["expired"] += 1
+        if now is None:
+            now = time.time()
+
+        if self.shared:
+            found, expires_at, value = self.cache.read(self, key, now)
+            if found:
+                self.store(key, expires_at, value, "shared_hits")
+                return value
+
+        value = compute(*args)
+        expires_at = None if self.ttl is None else now + self.ttl
+        self.store(key, expires_at, value, "misses")
+        if self.shared:
+            self.cache.write(self, key, expires_at, value, now)
+        return value
+
+    def store(self, key, expires_at, value, outcome):
+        with self.lock:
+            self.stats[outcome] += 1
+            self.entries[key] = (expires_at, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.stats["evicted"] += 1
+
+    def count(self, key):
+        with self.lock:
+            self.stats[key] += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+class TieredCache:
+    def __init__(self, path, sweep_interval=300):
+        self.path = path
+        self.sweep_interval = sweep_interval
+        self.next_sweep = 0
+        self.namespaces = {}
+        self.connections = threading.local()
+
+    def namespace(self, name, max_entries=256, ttl=None, shared=False):
+        namespace = self.namespaces[name] = CacheNamespace(self, name, max_entries, ttl, shared)
+        return namespace
+
+    def cached(self, name, **options):
+        # Decorator: the positional arguments are the cache key
+        namespace = self.namespace(name, **options)
+
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args):
+                return namespace.get_or_compute(args, func, *args)
+            wrapper.cache = namespace
+            return wrapper
+        return decorator
+
+    def after_fork(self):
+        # Cached values are fine to inherit; locks and the SQLite handle are not
+        self.connections = threading.local()
+        for namespace in self.namespaces.values():
+            namespace.lock = threading.Lock()
+
+    def _connection(self):
+        conn = getattr(self.connections, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=1, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(SCHEMA)
+            self.connections.conn = conn
+        return conn
+
+    def read(self, namespace, key, now):
+        try:
+            row = self._connection().execute(
+                "SELECT expires_at, value FROM cache_entries"
+                " WHERE namespace = ? AND key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (namespace.name, json.dumps(key), now)
+            ).fetchone()
+        except sqlite3.Error:
+            namespace.count("errors")
+            return False, None, None
+        if row is None:
+            return False, None, None
+        return True, row[0], json.loads(row[1])
+
+    def write(self, namespace, key, expires_at, value, now):
+        # A lost write only costs another worker a recompute
+        try:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries VALUES (?, ?, ?, ?, ?)",
+                (namespace.name, json.dumps(key), expires_at, now, json.dumps(value))
+            )
+            if now >= self.next_sweep:
+                self.next_sweep = now + self.sweep_interval
+                self.sweep(conn, now)
+        except sqlite3.Error:
+            namespace.count("errors")
+
+    def sweep(self, conn, now):
+        # Expired rows go first, then each shared namespace keeps its max_entries newest rows
+        conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+        for namespace in self.namespaces.values():
+            if namespace.shared:
+                conn.execute(
+                    "DELETE FROM cache_entries WHERE namespace = ? AND key NOT IN"
+                    " (SELECT key FROM cache_entries WHERE namespace = ? ORDER BY written_at DESC LIMIT ?)",
+                    (namespace.name, namespace.name, namespace.max_entries)
+                )
+
+    def stats(self):
+        # [(namespace, {stat: value}), ...]
+        result = []
+        for name, namespace in self.namespaces.items():
+            with namespace.lock:
+                result.append((name, dict(namespace.stats)))
+        return result
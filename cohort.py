@@ -0,0 +1,165 @@
+import numpy as np
+
+import longevity
+from vitals import (
+    MISSING, INVALID_GENDER,
+    BMI_UNDERWEIGHT, BMI_OPTIMAL, BMI_ELEVATED, BMI_OVERWEIGHT, BMI_OBESE,
+    IBW_GAIN, IBW_LOSE, IBW_MAINTAIN,
+    BMR_SLEEPING_GIANT, BMR_SWEET_SPOT, BMR_UNSTOPPABLE
+)
+
+# Batch versions of the vitals and longevity calculators in vitals.py, for rescoring
+# whole cohorts of stored submissions. Inputs are column arrays; outputs are arrays
+# whose numbers are bit-for-bit what the scalar records hold, with the same category
+# codes. The score_* helpers take text columns already passed through encode_labels().
+
+# estimate_life_expectancy: longevity's lookup tables as arrays, indexed by longevity.cell_index
+LDL_BOUNDS = np.array(longevity.LDL_BOUNDS, dtype=np.float64)
+LE_ADJUSTED = np.array(longevity.ADJUSTED_LE)
+LE_YEARS, LE_MONTHS = np.array(longevity.YEARS_MONTHS, dtype=np.int64).T.copy()
+
+def round_like_python(values, ndigits):
+    rounded = np.round(values, ndigits)
+    # np.round rounds the scaled float half-to-even, which can land on the other side
+    # of a near-tie than Python's correctly rounded round(); redo those few in Python
+    with np.errstate(invalid="ignore"):
+        scaled = values * 10 ** ndigits
+        near_tie = np.nonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)[0]
+    for i in near_tie:
+        rounded[i] = round(float(values[i]), ndigits)
+    return rounded
+
+def encode_labels(column):
+    # Text columns (gender, smoke) hold a handful of distinct values, so normalize
+    # the distinct labels in Python and broadcast back through the inverse index.
+    # An absent field (None) gets the index MISSING rather than becoming the label "None".
+    column = list(column)
+    absent = np.array([value is None for value in column], dtype=bool)
+    text = np.asarray(["" if value is None else value for value in column], dtype=str)
+    labels, inverse = np.unique(text, return_inverse=True)
+    inverse = inverse.reshape(-1).astype(np.int64)
+    inverse[absent] = MISSING
+    return labels.tolist(), inverse
+
+def label_values(encoded, func, dtype, missing):
+    # missing is the value for absent labels; index MISSING (-1) picks it off the end
+    labels, inverse = encoded
+    return np.array([func(label) for label in labels] + [missing], dtype=dtype)[inverse]
+
+def label_mask(encoded, predicate, missing=False):
+    return label_values(encoded, predicate, bool, missing)
+
+def age_penalty_table(max_offset):
+    # Same expression as estimate_life_expectancy, evaluated once per integer offset
+    return np.array([-1 * (offset ** 1.11 * 0.089) for offset in range(max_offset + 1)])
+
+def score_bmi(height_cm, weight_kg):
+    height_cm = np.asarray(height_cm, dtype=np.float64)
+    weight_kg = np.asarray(weight_kg, dtype=np.float64)
+    missing = (height_cm == 0) | (weight_kg == 0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bmi = round_like_python(weight_kg / ((height_cm / 100) ** 2), 1)
+    bmi[missing] = np.nan
+
+    category = np.select(
+        [bmi < 18.5, bmi < 23, bmi < 25, bmi < 30],
+        [BMI_UNDERWEIGHT, BMI_OPTIMAL, BMI_ELEVATED, BMI_OVERWEIGHT],
+        BMI_OBESE
+    ).astype(np.int8)
+    category[missing] = MISSING
+    return bmi, category
+
+def score_ideal_body_weight(gender, height_cm, weight_kg):
+    height_cm = np.asarray(height_cm, dtype=np.float64)
+    weight_kg = np.asarray(weight_kg, dtype=np.float64)
+    missing = label_mask(gender, lambda g: not g, missing=True) | (height_cm == 0) | (weight_kg == 0)
+    male = label_mask(gender, lambda g: g.strip().lower() == "male")
+    female = label_mask(gender, lambda g: g.strip().lower() == "female")
+
+    factor = np.where(male, 22.0, 21.0)
+    ideal_weight = round_like_python(factor * ((height_cm / 100) ** 2), 1)
+    delta = round_like_python(ideal_weight - weight_kg, 3)
+
+    direction = np.select([delta > 0, delta < 0], [IBW_GAIN, IBW_LOSE], IBW_MAINTAIN).astype(np.int8)
+    direction[~(male | female)] = INVALID_GENDER
+    direction[missing] = MISSING
+    invalid = missing | ~(male | female)
+    ideal_weight[invalid] = np.nan
+    delta[invalid] = np.nan
+    return ideal_weight, delta, direction
+
+def score_bmr(gender, height_cm, age, weight_kg):
+    height_cm = np.asarray(height_cm, dtype=np.float64)
+    age = np.asarray(age, dtype=np.float64)
+    weight_kg = np.asarray(weight_kg, dtype=np.float64)
+    missing = label_mask(gender, lambda g: not g, missing=True) | (height_cm == 0) | (age == 0) | (weight_kg == 0)
+    male = label_mask(gender, lambda g: g.strip().lower() == "male")
+    female = label_mask(gender, lambda g: g.strip().lower() == "female")
+
+    offset = np.where(male, 5.0, -161.0)
+    bmr = np.rint(10 * weight_kg + 6.25 * height_cm - 5 * age + offset)
+
+    category = np.select([bmr < 1300, bmr < 1600], [BMR_SLEEPING_GIANT, BMR_SWEET_SPOT], BMR_UNSTOPPABLE).astype(np.int8)
+    category[~(male | female)] = INVALID_GENDER
+    category[missing] = MISSING
+    bmr[missing | ~(male | female)] = np.nan
+    return bmr, category
+
+def life_expectancy_formula(gender, age, smoker, ldl):
+    # estimate_life_expectancy's arithmetic, for ages past the lookup tables
+    base_le = np.array([70.6, 74.4, 72.5])[gender]
+    ldl_score = np.select([ldl < 100, ldl < 120, ldl < 140, ldl < 160, ldl < 190], [0, -1, -2, -3, -4], -5)
+    tobacco_score = np.where(smoker, -6.8, 0.0)
+
+    age_offset = np.maximum(0, age - 35)
+    age_penalty = age_penalty_table(int(age_offset.max(initial=0)))[age_offset]
+
+    risk_amplifier = 1 + np.where(smoker, 0.14, 0.0) + np.select([ldl >= 160, ldl >= 130], [0.075, 0.037], 0.0)
+
+    return (base_le + ldl_score + tobacco_score + age_penalty) / risk_amplifier
+
+def score_life_expectancy(gender, age, smoke, ldl):
+    # Like vitals.life_expectancy_result, an absent gender or smoke answer scores as missing
+    missing = (gender[1] == MISSING) | (smoke[1] == MISSING)
+    gender = label_values(gender, longevity.gender_index, np.int64, 0)
+    smoker = label_mask(smoke, lambda s: s.lower() == "yes")
+    age = np.asarray(age, dtype=np.int64)
+    ldl = np.asarray(ldl, dtype=np.float64)
+
+    bucket = np.searchsorted(LDL_BOUNDS, ldl, side="right")
+    bucket[np.isnan(ldl)] = longevity.NAN_BUCKET
+    cell = longevity.cell_index(gender, smoker, bucket, np.clip(age, 0, longevity.MAX_AGE))
+    adjusted_le = LE_ADJUSTED[cell]
+    years = LE_YEARS[cell]
+    months = LE_MONTHS[cell]
+
+    older = np.nonzero(age > longevity.MAX_AGE)[0]
+    if len(older):
+        adjusted_le[older] = life_expectancy_formula(gender[older], age[older], smoker[older], ldl[older])
+        years[older] = np.trunc(adjusted_le[older])
+        months[older] = np.rint((adjusted_le[older] - years[older]) * 12)
+    adjusted_le[missing] = np.nan
+    years[missing] = MISSING
+    months[missing] = MISSING
+    return adjusted_le, years, months
+
+def score_cohort(gender, age, height_cm, weight_kg, smoke, ldl):
+    gender = encode_labels(gender)
+    smoke = encode_labels(smoke)
+    bmi, bmi_category = score_bmi(height_cm, weight_kg)
+    ideal_weight, ibw_delta, ibw_direction = score_ideal_body_weight(gender, height_cm, weight_kg)
+    bmr, bmr_category = score_bmr(gender, height_cm, age, weight_kg)
+    life_expectancy, le_years, le_months = score_life_expectancy(gender, age, smoke, ldl)
+    return {
+        "bmi": bmi,
+        "bmi_category": bmi_category,
+        "ideal_weight": ideal_weight,
+        "ibw_delta": ibw_delta,
+        "ibw_direction": ibw_direction,
+        "bmr": bmr,
+        "bmr_category": bmr_category,
+        "life_expectancy": life_expectancy,
+        "le_years": le_years,
+        "le_months": le_months,
+    }
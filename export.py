@@ -0,0 +1,200 @@
+import argparse
+import fcntl
+import json
+import math
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime, timezone
+from urllib.parse import quote
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.ipc
+import pyarrow.parquet as pq
+
+from cohort import score_bmi
+from longevity import ldl_bucket
+from vitals import MISSING
+
+# Columnar export of the health submissions (vital_view_form, health_form, ldl_input) for
+# the cohort dashboards. Runs outside the bot, e.g. from cron:
+#
+#   python export.py --db submissions.db --out exports
+#
+# writes Hive-style day partitions that pyarrow/DuckDB/Spark read as one dataset:
+#
+#   exports/day=2026-10-18/part-000000012345.parquet
+#
+# Each run resumes after the id in exports/_checkpoint.json. Rows are read in batches of
+# --batch-size, one short query each on a read-only connection: the bot's writer is never
+# blocked (WAL), no read transaction stays open long enough to hold back a WAL checkpoint,
+# and memory is bounded by the batch. A batch's files are in place before the checkpoint
+# moves past it; a part is named after its first id, so a batch redone after a crash
+# overwrites its own files instead of duplicating rows.
+
+EXPORTED_FORMS = ("vital_view_form", "health_form", "ldl_input")
+CHECKPOINT = "_checkpoint.json"
+EXTENSIONS = {"parquet": "parquet", "arrow": "arrow"}
+
+SCHEMA = pa.schema([
+    ("id", pa.int64()),
+    ("form", pa.string()),
+    ("user_id", pa.string()),
+    ("submitted_at", pa.timestamp("us", tz="UTC")),
+    ("gender", pa.string()),
+    ("age", pa.int32()),
+    ("smoker", pa.bool_()),
+    ("ldl", pa.float64()),
+    # longevity.LDL_BOUNDS bucket, as estimate_life_expectancy scores it
+    ("ldl_bucket", pa.int8()),
+    ("height_cm", pa.int32()),
+    ("weight_kg", pa.float64()),
+    # cohort.score_bmi, so it matches the BMI the bot reported
+    ("bmi", pa.float64()),
+    ("bmi_category", pa.int8()),
+])
+
+INT32_MAX = 2 ** 31 - 1
+
+def parse_int(value):
+    # int() like the bot's reports; anything else (or out of range) is null
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return None
+    return number if -INT32_MAX <= number <= INT32_MAX else None
+
+def parse_float(value):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+def parse_label(value):
+    return value.strip().lower() if value else None
+
+def read_batch(conn, after_id, batch_size):
+    return conn.execute(
+        "SELECT id, callback_id, user_id, submitted_at, payload FROM submissions"
+        f" WHERE id > ? AND callback_id IN ({', '.join('?' * len(EXPORTED_FORMS))})"
+        " ORDER BY id LIMIT ?",
+        (after_id, *EXPORTED_FORMS, batch_size)
+    ).fetchall()
+
+def build_table(rows):
+    columns = {name: [] for name in SCHEMA.names}
+    for row_id, form, user_id, submitted_at, payload in rows:
+        values = json.loads(payload)
+        if form == "health_form" and "ldl_input" not in values:
+            # Step 1 of the longevity wizard; its answers are recorded again with ldl_input
+            continue
+        smoke = parse_label(values.get("smoke_input"))
+        ldl = parse_float(values.get("ldl_input"))
+        columns["id"].append(row_id)
+        columns["form"].append(form)
+        columns["user_id"].append(user_id)
+        columns["submitted_at"].append(int(submitted_at * 1_000_000))
+        columns["gender"].append(parse_label(values.get("gender_select")))
+        columns["age"].append(parse_int(values.get("age_input")))
+        columns["smoker"].append(None if smoke is None else smoke == "yes")
+        columns["ldl"].append(ldl)
+        columns["ldl_bucket"].append(None if ldl is None else ldl_bucket(ldl))
+        columns["height_cm"].append(parse_int(values.get("height_input")))
+        columns["weight_kg"].append(parse_float(values.get("weight_input")))
+
+    # 0 is what score_bmi (like calculate_bmi_status) treats as missing
+    height = np.array([0 if v is None else v for v in columns["height_cm"]], dtype=np.float64)
+    weight = np.array([0 if v is None else v for v in columns["weight_kg"]], dtype=np.float64)
+    bmi, category = score_bmi(height, weight)
+    missing = category == MISSING
+    columns["bmi"] = pa.array(bmi, mask=missing | np.isnan(bmi))
+    columns["bmi_category"] = pa.array(category, mask=missing)
+    return pa.table(columns, schema=SCHEMA)
+
+def partition_days(table):
+    # {"YYYY-MM-DD": row indices}, by the UTC day of submitted_at
+    seconds = table.column("submitted_at").cast(pa.int64()).to_numpy() // 1_000_000
+    days = seconds - seconds % 86400
+    return {
+        datetime.fromtimestamp(int(day), timezone.utc).strftime("%Y-%m-%d"): np.nonzero(days == day)[0]
+        for day in np.unique(days)
+    }
+
+def write_part(table, path, fmt):
+    tmp = path + ".tmp"
+    if fmt == "parquet":
+        pq.write_table(table, tmp, compression="zstd")
+    else:
+        options = pa.ipc.IpcWriteOptions(compression="zstd")
+        with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema, options=options) as writer:
+            writer.write_table(table)
+    os.replace(tmp, path)
+
+def load_checkpoint(out):
+    try:
+        with open(os.path.join(out, CHECKPOINT)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"last_id": 0, "rows": 0}
+
+def save_checkpoint(out, checkpoint):
+    path = os.path.join(out, CHECKPOINT)
+    with open(path + ".tmp", "w") as f:
+        json.dump(checkpoint, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(path + ".tmp", path)
+
+def export(db, out, fmt="parquet", batch_size=5000, max_batches=None):
+    # Returns this run's {"rows", "files", "batches", "last_id"}
+    os.makedirs(out, exist_ok=True)
+    lock = open(os.path.join(out, ".lock"), "w")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        sys.exit(f"another export into {out} is running")
+
+    conn = sqlite3.connect(f"file:{quote(os.path.abspath(db))}?mode=ro", uri=True, timeout=30)
+    checkpoint = load_checkpoint(out)
+    run = {"rows": 0, "files": 0, "batches": 0, "last_id": checkpoint["last_id"]}
+    try:
+        while max_batches is None or run["batches"] < max_batches:
+            rows = read_batch(conn, checkpoint["last_id"], batch_size)
+            if not rows:
+                break
+            table = build_table(rows)
+            for day, indices in partition_days(table).items():
+                part = table.take(indices)
+                directory = os.path.join(out, f"day={day}")
+                os.makedirs(directory, exist_ok=True)
+                write_part(part, os.path.join(directory, f"part-{part['id'][0].as_py():012d}.{EXTENSIONS[fmt]}"), fmt)
+                run["files"] += 1
+            checkpoint = {"last_id": rows[-1][0], "rows": checkpoint["rows"] + table.num_rows, "updated_at": time.time()}
+            save_checkpoint(out, checkpoint)
+            run["rows"] += table.num_rows
+            run["batches"] += 1
+            run["last_id"] = checkpoint["last_id"]
+    finally:
+        conn.close()
+        lock.close()
+    return run
+
+def main():
+    parser = argparse.ArgumentParser(description="Export health submissions to day-partitioned Parquet or Arrow files.")
+    parser.add_argument("--db", default=os.environ.get("SUBMISSION_DB", "submissions.db"), help="the bot's SUBMISSION_DB")
+    parser.add_argument("--out", default=os.environ.get("EXPORT_DIR", "exports"), help="dataset directory")
+    parser.add_argument("--format", choices=sorted(EXTENSIONS), default="parquet")
+    parser.add_argument("--batch-size", type=int, default=5000, help="rows read and held in memory at a time")
+    parser.add_argument("--max-batches", type=int, help="stop after this many batches (the next run resumes)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    run = export(args.db, args.out, args.format, args.batch_size, args.max_batches)
+    print(f"exported {run['rows']} rows into {run['files']} files in {time.perf_counter() - started:.2f}s;"
+          f" checkpoint at id {run['last_id']}")
+
+if __name__ == "__main__":
+    main()
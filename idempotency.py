@@ -0,0 +1,73 @@
+import sqlite3
+import threading
+import time
+
+# Remembers which Slack events have already been handled, so a retry (X-Slack-Retry-Num)
+# or duplicate delivery is acked and dropped instead of running its listener again.
+# Keys live in a small SQLite table that every gunicorn worker on the host shares;
+# INSERT OR IGNORE makes "first delivery wins" atomic across them.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen_events (
+    key TEXT PRIMARY KEY,
+    seen_at REAL NOT NULL
+) WITHOUT ROWID
+"""
+
+class EventDeduplicator:
+    def __init__(self, path, ttl=900, sweep_interval=60):
+        self.path = path
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        self.next_sweep = 0
+        self.connections = threading.local()
+        self.stats = {"checked": 0, "duplicates": 0, "retries": 0, "errors": 0, "swept": 0}
+        self.lock = threading.Lock()
+
+    def count(self, key, n=1):
+        with self.lock:
+            self.stats[key] += n
+
+    def _connection(self):
+        conn = getattr(self.connections, "conn", None)
+        if conn is None:
+            # Autocommit; losing the last few keys in a crash only lets a retry through
+            conn = sqlite3.connect(self.path, timeout=1, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(SCHEMA)
+            self.connections.conn = conn
+        return conn
+
+    def after_fork(self):
+        # Never share the parent's SQLite handle with a forked worker
+        self.lock = threading.Lock()
+        self.connections = threading.local()
+
+    def first_delivery(self, key, retry=False):
+        # True if this key hasn't been seen within the TTL (and claims it); False for a duplicate
+        self.count("checked")
+        if retry:
+            self.count("retries")
+        now = time.time()
+        try:
+            conn = self._connection()
+            first = conn.execute(
+                "INSERT OR IGNORE INTO seen_events (key, seen_at) VALUES (?, ?)", (key, now)
+            ).rowcount == 1
+            if not first:
+                # A key older than the TTL is fair game again
+                first = conn.execute(
+                    "UPDATE seen_events SET seen_at = ? WHERE key = ? AND seen_at < ?", (now, key, now - self.ttl)
+                ).rowcount == 1
+            if now >= self.next_sweep:
+                self.next_sweep = now + self.sweep_interval
+                swept = conn.execute("DELETE FROM seen_events WHERE seen_at < ?", (now - self.ttl,)).rowcount
+                self.count("swept", swept)
+        except sqlite3.Error:
+            # Fail open: a duplicate reply beats dropping a real event
+            self.count("errors")
+            return True
+        if not first:
+            self.count("duplicates")
+        return first
@@ -0,0 +1,357 @@
+import argparse
+import asyncio
+import configparser
+import http.client
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlencode, urlsplit
+
+from slack_sdk.signature import SignatureVerifier
+
+# Offline load test: drives correctly signed /slack/events requests for every flow
+# (DM, app_mention, the four menu buttons, the view submissions) at bot.flask_app, or with
+# --app async at async_bot.web_app, and points the bot's Web API client at an in-process
+# fake Slack Web API. health_form is step 1 of the longevity wizard; ldl_input submits
+# step 1 and then, with the revision from that ack, step 2 (its latency is step 2's).
+#
+#   python loadtest.py --requests 500 --concurrency 16 --slack-latency 50
+#   python loadtest.py --app async --requests 500 --concurrency 16 --slack-latency 50
+#
+# Per flow it reports throughput, p50/p95/p99 of the HTTP (ack) latency and the error
+# rate, then waits for the background replies to reach the fake Slack API.
+
+FLOWS = (
+    "dm", "app_mention",
+    "longevity", "vital_view", "hypertrophy", "completion",
+    "ldl_input", "health_form", "vital_view_form", "hypertrophy_form", "completion_form",
+)
+
+# Slack Web API calls each flow should end up making
+EXPECTED_CALLS = {
+    "dm": ("chat.postMessage",),
+    "app_mention": ("chat.postMessage",),
+    "longevity": ("views.open", "chat.update"),
+    "vital_view": ("views.open", "chat.update"),
+    "hypertrophy": ("views.open", "chat.update"),
+    "completion": ("views.open", "chat.update"),
+    "ldl_input": ("chat.postMessage",),
+    "health_form": (),
+    "vital_view_form": ("chat.postMessage",),
+    "hypertrophy_form": ("chat.postMessage",),
+    "completion_form": ("chat.postMessage",),
+}
+
+TEAM_ID = "T0LOADTEST"
+BOT_USER_ID = "U0LOADBOT"
+
+class FakeSlack(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency_ms):
+        super().__init__(("127.0.0.1", 0), FakeSlackHandler)
+        self.latency = latency_ms / 1000
+        self.calls = Counter()
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_port}/api/"
+
+class FakeSlackHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        method = urlsplit(self.path).path.rsplit("/", 1)[-1]
+        with self.server.lock:
+            self.server.calls[method] += 1
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if method == "auth.test":
+            data = {"ok": True, "user_id": BOT_USER_ID, "bot_id": "B0LOADBOT", "team_id": TEAM_ID, "team": "loadtest"}
+        elif method == "views.open":
+            data = {"ok": True, "view": {"id": f"V{random.getrandbits(40):X}"}}
+        else:
+            data = {"ok": True, "channel": "C0LOADTEST", "ts": f"{time.time():.6f}"}
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def option(value):
+    return {"selected_option": {"text": {"type": "plain_text", "text": value}, "value": value}}
+
+VIEW_STATES = {
+    "ldl_input": {"ldl_block": {"ldl_input": {"value": "135"}}},
+    "health_form": {
+        "gender_block": {"gender_select": option("female")},
+        "age_block": {"age_input": {"value": "52"}},
+        "smoke_block": {"smoke_input": option("Yes")},
+    },
+    "vital_view_form": {
+        "gender_block": {"gender_select": option("male")},
+        "age_block": {"age_input": {"value": "40"}},
+        "height_block": {"height_input": {"value": "180"}},
+        "weight_block": {"weight_input": {"value": "80"}},
+    },
+    "hypertrophy_form": {
+        "gender_block": {"gender_select": option("female")},
+        "muscle_block": {"muscle_select": option("Pectoralis Major")},
+        "training_weight_block": {"training_weight_input": {"value": "30"}},
+    },
+    "completion_form": {"completion_block": {"completion_select": option("70%")}},
+}
+
+def flow_payload(flow, i, view_id=None, private_metadata=None):
+    # (content type, raw body) for request i of a flow; users and ids vary per request
+    user = f"U{i % 997:05d}"
+    channel = f"D{i % 997:05d}"
+    now = f"{time.time():.6f}"
+    if flow in ("dm", "app_mention"):
+        event = {"type": "message", "channel_type": "im"} if flow == "dm" else {"type": "app_mention"}
+        event.update({"user": user, "text": "hi", "channel": channel, "ts": now, "client_msg_id": f"{flow}-{i}-{now}"})
+        body = {
+            "type": "event_callback", "team_id": TEAM_ID, "api_app_id": "A0LOADTEST",
+            "event_id": f"Ev{flow}{i}{random.getrandbits(32):X}", "event_time": int(time.time()), "event": event,
+            "authorizations": [{"team_id": TEAM_ID, "user_id": BOT_USER_ID, "is_bot": True}],
+        }
+        return "application/json", json.dumps(body)
+
+    base = {"team": {"id": TEAM_ID}, "user": {"id": user}, "api_app_id": "A0LOADTEST", "trigger_id": f"{i}.{now}"}
+    if flow in VIEW_STATES:
+        payload = {**base, "type": "view_submission", "view": {
+            "id": view_id or f"V{i}", "type": "modal", "callback_id": flow,
+            "private_metadata": channel if private_metadata is None else private_metadata,
+            "state": {"values": VIEW_STATES[flow]}, "hash": now,
+        }}
+    else:
+        payload = {**base, "type": "block_actions", "channel": {"id": channel}, "container": {"type": "message"},
+                   "message": {"ts": now, "text": "menu"},
+                   "actions": [{"action_id": flow, "block_id": "menu", "type": "button", "value": flow, "action_ts": now}]}
+    return "application/x-www-form-urlencoded", urlencode({"payload": json.dumps(payload)})
+
+def signed_headers(verifier, content_type, body):
+    timestamp = str(int(time.time()))
+    return {
+        "Content-Type": content_type,
+        "X-Slack-Request-Timestamp": timestamp,
+        "X-Slack-Signature": verifier.generate_signature(timestamp=timestamp, body=body),
+    }
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+def run_load(url, flows, requests, concurrency, signing_secret):
+    verifier = SignatureVerifier(signing_secret)
+    target = urlsplit(url)
+    connections = threading.local()
+    jobs = [(flow, i) for i in range(requests) for flow in flows]
+    results = {flow: {"latencies": [], "errors": 0} for flow in flows}
+    lock = threading.Lock()
+
+    def post(content_type, body):
+        # The ack body, or None if the request failed
+        headers = signed_headers(verifier, content_type, body)
+        try:
+            conn = getattr(connections, "conn", None)
+            if conn is None:
+                conn = connections.conn = http.client.HTTPConnection(target.hostname, target.port, timeout=30)
+            conn.request("POST", target.path, body=body.encode(), headers=headers)
+            resp = conn.getresponse()
+            data = resp.read()
+            if resp.will_close:
+                conn.close()
+                connections.conn = None
+        except (OSError, http.client.HTTPException):
+            connections.conn = None
+            return None
+        return data if resp.status == 200 else None
+
+    def send(job):
+        flow, i = job
+        metadata = None
+        if flow == "ldl_input":
+            ack = post(*flow_payload("health_form", i, view_id=f"VLDL{i}"))
+            metadata = json.loads(ack)["view"]["private_metadata"] if ack else ""
+        started = time.perf_counter()
+        data = post(*flow_payload(flow, i, view_id=f"VLDL{i}" if metadata is not None else None, private_metadata=metadata))
+        # Step 2 answers an expired or unknown session with response_action "errors"
+        ok = data is not None and not (flow == "ldl_input" and data and "errors" in json.loads(data))
+        elapsed = time.perf_counter() - started
+        with lock:
+            results[flow]["latencies"].append(elapsed)
+            results[flow]["errors"] += int(not ok)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(send, jobs))
+    return results, time.perf_counter() - started
+
+def wait_for_calls(fake, expected, timeout):
+    # Replies go out from the bot's background pool after the ack; wait for them to land
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with fake.lock:
+            if all(fake.calls[method] >= n for method, n in expected.items()):
+                return True
+        time.sleep(0.05)
+    return False
+
+def report(results, elapsed, fake, expected, settled):
+    rows = []
+    for flow, result in results.items():
+        latencies = sorted(result["latencies"])
+        rows.append({
+            "flow": flow,
+            "requests": len(latencies),
+            "errors": result["errors"],
+            "error_rate": result["errors"] / max(len(latencies), 1),
+            "rps": len(latencies) / elapsed,
+            "p50_ms": percentile(latencies, 0.50) * 1000,
+            "p95_ms": percentile(latencies, 0.95) * 1000,
+            "p99_ms": percentile(latencies, 0.99) * 1000,
+        })
+    total = sum(row["requests"] for row in rows)
+    return {
+        "flows": rows,
+        "total_requests": total,
+        "elapsed_s": elapsed,
+        "total_rps": total / elapsed,
+        "slack_calls": dict(fake.calls),
+        "expected_slack_calls": expected,
+        "replies_settled": settled,
+    }
+
+def print_report(summary):
+    print(f"{'flow':<18}{'reqs':>7}{'err%':>7}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for row in summary["flows"]:
+        print(f"{row['flow']:<18}{row['requests']:>7}{row['error_rate'] * 100:>7.1f}{row['rps']:>9.1f}"
+              f"{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}")
+    print(f"total: {summary['total_requests']} requests in {summary['elapsed_s']:.2f}s ({summary['total_rps']:.0f} req/s)")
+    calls = ", ".join(f"{method} {n}/{summary['expected_slack_calls'].get(method, 0)}"
+                      for method, n in sorted(summary["slack_calls"].items()) if method != "auth.test")
+    print(f"fake Slack API calls (seen/expected): {calls}" + ("" if summary["replies_settled"] else "  [timed out waiting]"))
+
+def patch_base_url(client_class, base_url):
+    original_init = client_class.__init__
+
+    def init_with_fake_base_url(self, *a, **kw):
+        kw["base_url"] = base_url
+        original_init(self, *a, **kw)
+
+    client_class.__init__ = init_with_fake_base_url
+
+def serve_sync():
+    # bot.flask_app on werkzeug's threaded server; returns (port, stop)
+    from werkzeug.serving import WSGIRequestHandler, make_server
+    import bot
+
+    class QuietRequestHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    server = make_server("127.0.0.1", 0, bot.flask_app, threaded=True, request_handler=QuietRequestHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_port, server.shutdown
+
+def serve_async():
+    # async_bot.web_app on an aiohttp AppRunner, in its own event loop thread; returns (port, stop)
+    from aiohttp import web
+    import async_bot
+
+    loop = asyncio.new_event_loop()
+    runner = web.AppRunner(async_bot.web_app, access_log=None)
+
+    async def start():
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", 0).start()
+        return runner.addresses[0][1]
+
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    port = asyncio.run_coroutine_threadsafe(start(), loop).result()
+
+    def stop():
+        asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+
+    return port, stop
+
+SERVERS = {"sync": serve_sync, "async": serve_async}
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the Slack handlers against a local fake Slack API.")
+    parser.add_argument("--app", choices=sorted(SERVERS), default="sync",
+                        help="sync: bot.flask_app on werkzeug; async: async_bot.web_app on aiohttp")
+    parser.add_argument("--requests", type=int, default=200, help="requests per flow")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--flows", default=",".join(FLOWS), help="comma-separated subset of: " + ", ".join(FLOWS))
+    parser.add_argument("--slack-latency", type=float, default=0, help="ms the fake Slack API sleeps per call")
+    parser.add_argument("--settle-timeout", type=float, default=60, help="seconds to wait for background replies")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    flows = [flow.strip() for flow in args.flows.split(",") if flow.strip()]
+    unknown = set(flows) - set(FLOWS)
+    if unknown:
+        parser.error(f"unknown flows: {', '.join(sorted(unknown))}")
+
+    fake = FakeSlack(args.slack_latency)
+    threading.Thread(target=fake.serve_forever, daemon=True).start()
+
+    # Everything the bot writes goes to a scratch directory, and the per-user menu
+    # rate limit is lifted so it doesn't swallow the generated DMs
+    scratch = tempfile.mkdtemp(prefix="loadtest-")
+    links = os.path.join(scratch, "links.ini")
+    config = configparser.ConfigParser()
+    config["Exercises"] = {"Bench Press": "https://example.com/bench", "Barbell Squat": "https://example.com/squat"}
+    with open(links, "w") as f:
+        config.write(f)
+    os.environ.setdefault("SLACK_BOT_TOKEN", "xoxb-loadtest")
+    os.environ.setdefault("SLACK_SIGNING_SECRET", "loadtest-signing-secret")
+    os.environ.setdefault("EXERCISE_LINK_FILE", links)
+    os.environ["MENU_RATE_BURST"] = str(10 ** 9)
+    for name, filename in (("SUBMISSION_DB", "submissions.db"), ("EVENT_DEDUP_DB", "events.db"),
+                           ("METRICS_DB", "metrics.db"), ("SESSION_DB", "sessions.db")):
+        os.environ[name] = os.path.join(scratch, filename)
+
+    # Every WebClient and AsyncWebClient the bot builds (including the one Bolt uses for
+    # auth.test at import) talks to the fake server
+    import slack_sdk.web.async_base_client as async_base_client
+    import slack_sdk.web.base_client as base_client
+    patch_base_url(base_client.BaseClient, fake.base_url)
+    patch_base_url(async_base_client.AsyncBaseClient, fake.base_url)
+
+    port, stop = SERVERS[args.app]()
+    url = f"http://127.0.0.1:{port}/slack/events"
+
+    results, elapsed = run_load(url, flows, args.requests, args.concurrency, os.environ["SLACK_SIGNING_SECRET"])
+    expected = Counter()
+    for flow in flows:
+        for method in EXPECTED_CALLS[flow]:
+            expected[method] += args.requests
+    settled = wait_for_calls(fake, expected, args.settle_timeout)
+
+    summary = report(results, elapsed, fake, dict(expected), settled)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_report(summary)
+    stop()
+    fake.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import math
+from bisect import bisect_right
+from collections import namedtuple
+
+# estimate_life_expectancy as lookup tables. LDL only enters the formula through
+# comparisons (the score ladder at 100/120/140/160/190, the risk amplifier at 130/160)
+# and age only through max(0, age - 35), so the result is constant within a
+# (gender, smoker, LDL bucket, age) cell. The tables hold every cell for ages 0-120,
+# each evaluated with the formula itself, so a lookup returns the very float the
+# formula would; older ages fall back to the formula.
+#
+#   python longevity.py
+#
+# checks the scalar and batch lookups against the formula over the whole domain.
+
+MAX_AGE = 120
+LDL_BOUNDS = (100, 120, 130, 140, 160, 190)
+# One LDL value inside each bucket; NaN fails every comparison, so it's a bucket of its own
+BUCKET_LDL = (0.0, 100.0, 120.0, 130.0, 140.0, 160.0, 190.0, math.nan)
+BUCKETS = len(BUCKET_LDL)
+NAN_BUCKET = BUCKETS - 1
+# BaseLE per gender index; anything but male/female gets the third
+GENDERS = ("male", "female", "other")
+AGES = MAX_AGE + 1
+
+# What estimate_life_expectancy reports; vitals.format_life_expectancy renders it
+LifeExpectancyResult = namedtuple("LifeExpectancyResult", ["years", "months"])
+
+def adjusted_life_expectancy(Gender, Age, TobaccoUse, LDL):
+    # The reference formula (from bot.estimate_life_expectancy); the tables are built from it
+    Gender = Gender.lower()
+    TobaccoUse = TobaccoUse.lower()
+    BaseLE = 70.6 if Gender == "male" else 74.4 if Gender == "female" else 72.5
+
+    if LDL < 100:
+        LDL_Score = 0
+    elif LDL < 120:
+        LDL_Score = -1
+    elif LDL < 140:
+        LDL_Score = -2
+    elif LDL < 160:
+        LDL_Score = -3
+    elif LDL < 190:
+        LDL_Score = -4
+    else:
+        LDL_Score = -5
+
+    Tobacco_Score = -6.8 if TobaccoUse == "yes" else 0
+
+    AgeOffset = max(0, Age - 35)
+    AgePenalty = -1 * (AgeOffset ** 1.11 * 0.089)
+
+    RiskAmplifier = (
+        1 +
+        (0.14 if TobaccoUse == "yes" else 0) +
+        (0.075 if LDL >= 160 else (0.037 if LDL >= 130 else 0))
+    )
+
+    return (BaseLE + LDL_Score + Tobacco_Score + AgePenalty) / RiskAmplifier
+
+def years_and_months(adjusted_le):
+    years = int(adjusted_le)
+    return LifeExpectancyResult(years, round((adjusted_le - years) * 12))
+
+def gender_index(gender):
+    gender = gender.lower()
+    return 0 if gender == "male" else 1 if gender == "female" else 2
+
+def ldl_bucket(ldl):
+    return NAN_BUCKET if ldl != ldl else bisect_right(LDL_BOUNDS, ldl)
+
+def cell_index(gender, smoker, bucket, age):
+    return ((gender * 2 + smoker) * BUCKETS + bucket) * AGES + age
+
+def build_tables():
+    # Every cell is the formula itself, evaluated once at import (about 9ms)
+    adjusted = tuple(
+        adjusted_life_expectancy(gender, age, tobacco, ldl)
+        for gender in GENDERS for tobacco in ("no", "yes") for ldl in BUCKET_LDL for age in range(AGES)
+    )
+    return adjusted, tuple(years_and_months(le) for le in adjusted)
+
+ADJUSTED_LE, YEARS_MONTHS = build_tables()
+
+def life_expectancy(Gender, Age, TobaccoUse, LDL):
+    # LifeExpectancyResult(years, months) exactly as the formula rounds them. gender_index,
+    # ldl_bucket and cell_index inlined, since the call overhead is most of a lookup.
+    if Age > MAX_AGE:
+        return years_and_months(adjusted_life_expectancy(Gender, Age, TobaccoUse, LDL))
+    Gender = Gender.lower()
+    row = (0 if Gender == "male" else 2 if Gender == "female" else 4) + (TobaccoUse.lower() == "yes")
+    bucket = NAN_BUCKET if LDL != LDL else bisect_right(LDL_BOUNDS, LDL)
+    return YEARS_MONTHS[(row * BUCKETS + bucket) * AGES + (Age if Age > 0 else 0)]
+
+def check_equivalence():
+    # Every gender/tobacco spelling class, ages on both sides of the table, and LDL at
+    # each threshold, one ulp either side of it, every integer to 300 and the specials
+    genders = ("male", "Male", "FEMALE", "female", "", "other", "Non-binary")
+    tobaccos = ("yes", "Yes", "YES", "no", "No", "", "sometimes")
+    ages = range(-10, MAX_AGE + 30)
+    ldls = sorted({float(v) for v in range(-5, 301)} | {
+        math.nextafter(bound, direction) for bound in LDL_BOUNDS for direction in (-math.inf, math.inf)
+    } | {0.5, 99.99, 129.5, 159.999, 1e9, -math.inf, math.inf}) + [math.nan]
+
+    checked = 0
+    for gender in genders:
+        for tobacco in tobaccos:
+            for age in ages:
+                for ldl in ldls:
+                    expected = years_and_months(adjusted_life_expectancy(gender, age, tobacco, ldl))
+                    actual = life_expectancy(gender, age, tobacco, ldl)
+                    if actual != expected:
+                        raise AssertionError(f"{(gender, age, tobacco, ldl)}: table {actual}, formula {expected}")
+                    checked += 1
+    print(f"scalar: {checked} inputs match the formula")
+
+    try:
+        import numpy as np
+        from cohort import encode_labels, score_life_expectancy
+    except ImportError:
+        print("batch: numpy not installed, skipped")
+        return
+    rows = [(gender, age, tobacco, ldl) for gender in genders for tobacco in tobaccos for age in ages for ldl in ldls]
+    gender, age, tobacco, ldl = zip(*rows)
+    adjusted, years, months = score_life_expectancy(encode_labels(gender), age, encode_labels(tobacco), ldl)
+    expected = np.array([adjusted_life_expectancy(*row) for row in rows])
+    expected_years, expected_months = zip(*(years_and_months(le) for le in expected))
+    if not (np.array_equal(adjusted.view(np.int64), expected.view(np.int64))
+            and years.tolist() == list(expected_years) and months.tolist() == list(expected_months)):
+        raise AssertionError("batch scores differ from the formula")
+    print(f"batch: {len(rows)} rows match the formula bit for bit")
+
+    # A row with an absent answer (None) is missing in both paths, as vitals has it
+    from cohort import MISSING, score_cohort
+    from vitals import bmr_result, ideal_weight_result, life_expectancy_result
+    rows = [(None, 40, "no", 120.0), ("male", 40, None, 120.0), ("Female", 52, "Yes", 135.0)]
+    gender, age, tobacco, ldl = zip(*rows)
+    scores = score_cohort(gender, age, [170] * len(rows), [70.0] * len(rows), tobacco, ldl)
+    for i, row in enumerate(rows):
+        expected = life_expectancy_result(*row)
+        actual = (scores["le_years"][i], scores["le_months"][i])
+        if actual != ((MISSING, MISSING) if expected is None else tuple(expected)):
+            raise AssertionError(f"{row}: batch life expectancy {actual}, scalar {expected}")
+        ibw, bmr = ideal_weight_result(row[0], 170, 70.0), bmr_result(row[0], 170, row[1], 70.0)
+        if (scores["ibw_direction"][i] == MISSING) != (ibw is None) or (scores["bmr_category"][i] == MISSING) != (bmr is None):
+            raise AssertionError(f"{row}: batch ideal weight/BMR missing where scalar isn't, or the reverse")
+    print(f"batch: {len(rows)} rows with absent answers match the scalar records")
+
+if __name__ == "__main__":
+    check_equivalence()
@@ -0,0 +1,237 @@
+import functools
+import sqlite3
+import threading
+import time
+
+# Latency histograms and counters shared by every gunicorn worker on the host.
+# Each worker observes into in-memory HDR-style buckets: exact below 32us, then 16
+# log-linear sub-buckets per power of two, so any value is within 6.25% of its bucket
+# bound from microseconds to minutes without a fixed range. Every flush_interval (from a
+# background thread, and on each scrape) a worker adds its deltas into a SQLite file, and
+# /metrics renders the sum across workers in the Prometheus text format.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS histogram_buckets (
+    name TEXT NOT NULL,
+    labels TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (name, labels, bucket)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS histogram_totals (
+    name TEXT NOT NULL,
+    labels TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    sum REAL NOT NULL,
+    PRIMARY KEY (name, labels)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT NOT NULL,
+    labels TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (name, labels)
+) WITHOUT ROWID;
+"""
+
+# Cumulative buckets exposed as `le`; 3s is Slack's ack deadline
+EXPORT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 3.0, 5.0, 10.0)
+EXPORT_QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+def bucket_index(micros):
+    if micros < 32:
+        return max(micros, 0)
+    # Keep the top five bits: a power of two plus a 1/16 step inside it
+    shift = micros.bit_length() - 5
+    return 32 + (shift - 1) * 16 + (micros >> shift) - 16
+
+def bucket_upper(index):
+    # Exclusive upper bound of a bucket, in microseconds
+    if index < 32:
+        return index + 1
+    shift, step = divmod(index - 32, 16)
+    return (step + 17) << (shift + 1)
+
+def format_labels(labels):
+    return ",".join(f'{key}="{value}"' for key, value in labels)
+
+class MetricsRegistry:
+    def __init__(self, path, flush_interval=5):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.next_flush = time.monotonic() + flush_interval
+        self.histograms = {}
+        self.counter_sources = []
+        self.flushed_counters = {}
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.connections = threading.local()
+
+    def observe(self, name, labels, seconds):
+        key = (name, labels)
+        bucket = bucket_index(int(seconds * 1_000_000))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = [0, 0.0, {}]
+            histogram[0] += 1
+            histogram[1] += seconds
+            histogram[2][bucket] = histogram[2].get(bucket, 0) + 1
+        if time.monotonic() >= self.next_flush:
+            self._flush_in_background()
+
+    def _flush_in_background(self):
+        # The SQLite write can wait up to its busy timeout, so observers (including listeners
+        # on async_bot's event loop) never run it themselves: one thread per due interval does
+        with self.lock:
+            if time.monotonic() < self.next_flush:
+                return
+            self.next_flush = time.monotonic() + self.flush_interval
+        threading.Thread(target=self.flush, kwargs={"blocking": False}, name="metrics-flush", daemon=True).start()
+
+    def timed(self, name, labels):
+        # Decorator for sync listeners; functools.wraps keeps Bolt's argument injection working
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(name, labels, time.perf_counter() - started)
+            return wrapper
+        return decorator
+
+    def timed_async(self, name, labels):
+        def decorator(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    self.observe(name, labels, time.perf_counter() - started)
+            return wrapper
+        return decorator
+
+    def after_fork(self):
+        # A forked worker (gunicorn --preload) gets its own locks and connection. Histograms
+        # the parent observed stay the parent's to flush; counters are cumulative per process,
+        # so the child carries on from the values it inherited.
+        self.histograms = {}
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.connections = threading.local()
+
+    def add_counter_source(self, source):
+        # source() returns [(name, labels, cumulative value for this process), ...]
+        self.counter_sources.append(source)
+
+    def _connection(self):
+        conn = getattr(self.connections, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.executescript(SCHEMA)
+            self.connections.conn = conn
+        return conn
+
+    def flush(self, blocking=True):
+        # Only one thread per process flushes; observers never wait on it
+        if not self.flush_lock.acquire(blocking=blocking):
+            return
+        try:
+            self.next_flush = time.monotonic() + self.flush_interval
+            with self.lock:
+                histograms, self.histograms = self.histograms, {}
+
+            counter_deltas = []
+            counter_values = {}
+            for source in self.counter_sources:
+                for name, labels, value in source():
+                    key = (name, labels)
+                    delta = value - self.flushed_counters.get(key, 0)
+                    if delta:
+                        counter_deltas.append((name, format_labels(labels), delta))
+                        counter_values[key] = value
+
+            if not histograms and not counter_deltas:
+                return
+            bucket_rows = []
+            total_rows = []
+            for (name, labels), (count, total, buckets) in histograms.items():
+                labels = format_labels(labels)
+                total_rows.append((name, labels, count, total))
+                bucket_rows.extend((name, labels, bucket, n) for bucket, n in buckets.items())
+            try:
+                with self._connection() as conn:
+                    conn.executemany(
+                        "INSERT INTO histogram_buckets VALUES (?, ?, ?, ?)"
+                        " ON CONFLICT DO UPDATE SET count = count + excluded.count", bucket_rows)
+                    conn.executemany(
+                        "INSERT INTO histogram_totals VALUES (?, ?, ?, ?)"
+                        " ON CONFLICT DO UPDATE SET count = count + excluded.count, sum = sum + excluded.sum", total_rows)
+                    conn.executemany(
+                        "INSERT INTO counters VALUES (?, ?, ?)"
+                        " ON CONFLICT DO UPDATE SET value = value + excluded.value", counter_deltas)
+            except sqlite3.Error:
+                # Keep the observations for the next flush; counters simply re-diff next time
+                with self.lock:
+                    for key, (count, total, buckets) in histograms.items():
+                        histogram = self.histograms.setdefault(key, [0, 0.0, {}])
+                        histogram[0] += count
+                        histogram[1] += total
+                        for bucket, n in buckets.items():
+                            histogram[2][bucket] = histogram[2].get(bucket, 0) + n
+                return
+            self.flushed_counters.update(counter_values)
+        finally:
+            self.flush_lock.release()
+
+    def render(self):
+        self.flush()
+        conn = self._connection()
+        buckets = {}
+        for name, labels, bucket, count in conn.execute(
+                "SELECT name, labels, bucket, count FROM histogram_buckets ORDER BY name, labels, bucket"):
+            buckets.setdefault((name, labels), []).append((bucket_upper(bucket) / 1_000_000, count))
+
+        lines = []
+        quantile_lines = []
+        current = None
+        for name, labels, count, total in conn.execute(
+                "SELECT name, labels, count, sum FROM histogram_totals ORDER BY name, labels"):
+            series = buckets.get((name, labels), [])
+            prefix = f"{labels}," if labels else ""
+            if name != current:
+                current = name
+                lines.append(f"# TYPE {name} histogram")
+                quantile_lines.append(f"# TYPE {name}_quantile gauge")
+            for le in EXPORT_BUCKETS:
+                cumulative = sum(n for upper, n in series if upper <= le)
+                lines.append(f'{name}_bucket{{{prefix}le="{le}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {count}')
+            series_labels = f"{{{labels}}}" if labels else ""
+            lines.append(f"{name}_sum{series_labels} {total:.6f}")
+            lines.append(f"{name}_count{series_labels} {count}")
+            for q in EXPORT_QUANTILES:
+                quantile_lines.append(f'{name}_quantile{{{prefix}quantile="{q}"}} {quantile(series, count, q):.6f}')
+        lines.extend(quantile_lines)
+
+        current = None
+        for name, labels, value in conn.execute("SELECT name, labels, value FROM counters ORDER BY name, labels"):
+            if name != current:
+                current = name
+                lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name}{{{labels}}} {value:g}" if labels else f"{name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+def quantile(series, count, q):
+    # Upper bound of the bucket holding the q-th observation
+    rank = q * count
+    seen = 0
+    for upper, n in series:
+        seen += n
+        if seen >= rank:
+            return upper
+    return series[-1][0] if series else 0.0
@@ -0,0 +1,103 @@
+import calendar
+import configparser
+from collections import namedtuple
+from datetime import date
+
+# Occasion calendar for the status banner, loaded from an ini file (see occasions.ini).
+# Each section is one occasion with a `date` rule, a `message` and optional `locales` or
+# `exclude_locales`.
+# Rules are either a fixed day ("25-Dec") or an nth weekday ("4th Thu of Nov", "last Mon of May").
+# For every year asked about, the rules are expanded once into a day-of-year -> message
+# table, so a lookup is a single index. When two occasions share a day, the earlier one
+# in the file wins.
+
+Occasion = namedtuple("Occasion", ["name", "rule", "message", "locales", "exclude_locales"])
+
+# Fixed English names so parsing doesn't depend on the process locale
+MONTHS = {name: number for number, name in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1)}
+WEEKDAYS = {name: number for number, name in enumerate(["mon", "tue", "wed", "thu", "fri", "sat", "sun"])}
+ORDINALS = {"1st": 1, "2nd": 2, "3rd": 3, "4th": 4, "5th": 5, "last": -1}
+
+def parse_rule(text):
+    # "25-Dec" -> ("fixed", 12, 25); "4th Thu of Nov" -> ("nth", 11, 3, 4)
+    words = text.lower().split()
+    if len(words) == 1:
+        day, _, month = words[0].partition("-")
+        if month in MONTHS and day.isdigit():
+            # Checked against the month's length in a leap year, so 29-Feb is allowed
+            if not 1 <= int(day) <= calendar.monthrange(2000, MONTHS[month])[1]:
+                raise ValueError(f"Occasion date {text!r} doesn't exist; {month.title()} has no day {int(day)}")
+            return ("fixed", MONTHS[month], int(day))
+    elif len(words) == 4 and words[2] == "of":
+        ordinal, weekday, _, month = words
+        if ordinal in ORDINALS and weekday in WEEKDAYS and month in MONTHS:
+            return ("nth", MONTHS[month], WEEKDAYS[weekday], ORDINALS[ordinal])
+    raise ValueError(f"Unrecognized occasion date {text!r}; expected '25-Dec' or '4th Thu of Nov'")
+
+def rule_date(rule, year):
+    # The date a rule lands on in `year`, or None if it doesn't occur (29-Feb, a missing 5th weekday)
+    kind, month = rule[0], rule[1]
+    days_in_month = calendar.monthrange(year, month)[1]
+    if kind == "fixed":
+        day = rule[2]
+        return date(year, month, day) if day <= days_in_month else None
+
+    weekday, n = rule[2], rule[3]
+    first_weekday = calendar.monthrange(year, month)[0]
+    first = 1 + (weekday - first_weekday) % 7
+    if n == -1:
+        day = first + 7 * ((days_in_month - first) // 7)
+    else:
+        day = first + 7 * (n - 1)
+    return date(year, month, day) if day <= days_in_month else None
+
+def parse_locales(text):
+    return frozenset(code.strip().upper() for code in text.split(",") if code.strip())
+
+def load_occasions(path, locale=None):
+    parser = configparser.ConfigParser(interpolation=None)
+    if not parser.read(path, encoding="utf-8"):
+        raise FileNotFoundError(path)
+
+    occasions = []
+    for name in parser.sections():
+        section = parser[name]
+        locales = parse_locales(section.get("locales", ""))
+        exclude_locales = parse_locales(section.get("exclude_locales", ""))
+        # Every section is parsed, so a bad rule fails at startup whatever the locale
+        try:
+            occasion = Occasion(name, parse_rule(section["date"]), section["message"], locales, exclude_locales)
+        except (KeyError, ValueError) as e:
+            raise ValueError(f"Bad occasion [{name}] in {path}: {e}") from None
+        # Occasions without locales apply everywhere (bar exclude_locales); the rest only
+        # for a matching locale
+        if locales and (locale is None or locale.upper() not in locales):
+            continue
+        if locale is not None and locale.upper() in exclude_locales:
+            continue
+        occasions.append(occasion)
+    return tuple(occasions)
+
+class OccasionCalendar:
+    def __init__(self, occasions):
+        self.occasions = occasions
+        self.tables = {}
+
+    def table(self, year):
+        # (ordinal of 1 Jan, one message per day of the year)
+        table = self.tables.get(year)
+        if table is None:
+            first = date(year, 1, 1).toordinal()
+            days = [""] * (366 if calendar.isleap(year) else 365)
+            # Walk in reverse so the first occasion in the file wins a shared day
+            for occasion in reversed(self.occasions):
+                day = rule_date(occasion.rule, year)
+                if day is not None:
+                    days[day.toordinal() - first] = occasion.message
+            table = self.tables[year] = (first, tuple(days))
+        return table
+
+    def message_for(self, day):
+        first, days = self.table(day.year)
+        return days[day.toordinal() - first]
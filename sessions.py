@@ -0,0 +1,124 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Server-side state for multi-step modals, keyed by (user, view id). A wizard step stores
+# its answers here and the next view only carries the returned revision in
+# private_metadata (which Slack caps at 3000 chars). Reads try a per-process LRU first and
+# fall back to a SQLite table every gunicorn worker shares, since the next step may land
+# on the other worker. A cached entry is only served when its revision matches the one
+# the view carries, so a step another worker has rewritten since is never read stale.
+# Entries expire `ttl` seconds after they were last written.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    user_id TEXT NOT NULL,
+    view_id TEXT NOT NULL,
+    revision TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (user_id, view_id)
+) WITHOUT ROWID
+"""
+
+class SessionStore:
+    def __init__(self, path, ttl=3600, capacity=1000, sweep_interval=300):
+        self.path = path
+        self.ttl = ttl
+        self.capacity = capacity
+        self.sweep_interval = sweep_interval
+        self.next_sweep = 0
+        self.cache = OrderedDict()
+        self.connections = threading.local()
+        self.stats = {
+            "stores": 0, "local_hits": 0, "shared_hits": 0, "misses": 0,
+            "evicted": 0, "swept": 0, "errors": 0
+        }
+        self.lock = threading.Lock()
+
+    def count(self, key, n=1):
+        with self.lock:
+            self.stats[key] += n
+
+    def after_fork(self):
+        # Never share the parent's SQLite handle with a forked worker
+        self.lock = threading.Lock()
+        self.connections = threading.local()
+
+    def _connection(self):
+        conn = getattr(self.connections, "conn", None)
+        if conn is None:
+            # Autocommit, so a step's state is visible to the other workers before its ack
+            conn = sqlite3.connect(self.path, timeout=1, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(SCHEMA)
+            self.connections.conn = conn
+        return conn
+
+    def _cache(self, key, entry):
+        # Caller holds self.lock
+        self.cache[key] = entry
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.capacity:
+            self.cache.popitem(last=False)
+            self.stats["evicted"] += 1
+
+    def put(self, user_id, view_id, data):
+        # Returns the revision the next view must carry to read this state back
+        now = time.time()
+        revision = str(time.time_ns())
+        expires_at = now + self.ttl
+        with self.lock:
+            self._cache((user_id, view_id), (revision, expires_at, data))
+            self.stats["stores"] += 1
+        try:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?)",
+                (user_id, view_id, revision, expires_at, json.dumps(data))
+            )
+            if now >= self.next_sweep:
+                self.next_sweep = now + self.sweep_interval
+                self.count("swept", conn.execute("DELETE FROM sessions WHERE expires_at < ?", (now,)).rowcount)
+        except sqlite3.Error:
+            # This worker can still finish the flow from its cache
+            self.count("errors")
+        return revision
+
+    def get(self, user_id, view_id, revision):
+        # The state stored under `revision`, or None if it expired or was replaced
+        key = (user_id, view_id)
+        now = time.time()
+        with self.lock:
+            entry = self.cache.get(key)
+            if entry is not None and entry[0] == revision and entry[1] > now:
+                self.cache.move_to_end(key)
+                self.stats["local_hits"] += 1
+                return entry[2]
+        try:
+            row = self._connection().execute(
+                "SELECT expires_at, data FROM sessions WHERE user_id = ? AND view_id = ? AND revision = ? AND expires_at > ?",
+                (user_id, view_id, revision, now)
+            ).fetchone()
+        except sqlite3.Error:
+            self.count("errors")
+            row = None
+        if row is None:
+            self.count("misses")
+            return None
+        data = json.loads(row[1])
+        with self.lock:
+            self._cache(key, (revision, row[0], data))
+            self.stats["shared_hits"] += 1
+        return data
+
+    def discard(self, user_id, view_id):
+        with self.lock:
+            self.cache.pop((user_id, view_id), None)
+        try:
+            self._connection().execute("DELETE FROM sessions WHERE user_id = ? AND view_id = ?", (user_id, view_id))
+        except sqlite3.Error:
+            self.count("errors")
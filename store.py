@@ -0,0 +1,196 @@
+import json
+import math
+import queue
+import sqlite3
+import threading
+import time
+
+# Append-only log of modal submissions in SQLite (WAL mode). Handlers only enqueue;
+# a single writer thread per process group-commits whatever has queued up, so
+# handler latency doesn't include any disk I/O.
+# Numeric progress (completion %, training weights, vitals) goes to its own table,
+# clustered on (user_id, metric, recorded_at) so a user's range query is one index seek.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    id INTEGER PRIMARY KEY,
+    callback_id TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    submitted_at REAL NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS progress (
+    user_id TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (user_id, metric, recorded_at)
+) WITHOUT ROWID;
+"""
+
+INSERT_SUBMISSION = "INSERT INTO submissions (callback_id, user_id, submitted_at, payload) VALUES (?, ?, ?, ?)"
+INSERT_PROGRESS = "INSERT OR REPLACE INTO progress (user_id, metric, recorded_at, value) VALUES (?, ?, ?, ?)"
+
+def connect(path):
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # WAL + NORMAL only fsyncs at checkpoints; a crash can lose the last commits, never corrupt
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    conn.commit()
+    return conn
+
+def form_values(view):
+    # Flatten Slack's state.values {block_id: {action_id: element}} into {action_id: value}
+    values = {}
+    for block in view["state"]["values"].values():
+        for action_id, element in block.items():
+            if "selected_option" in element:
+                values[action_id] = (element["selected_option"] or {}).get("value")
+            else:
+                values[action_id] = element.get("value")
+    return values
+
+class SubmissionStore:
+    def __init__(self, path, batch_size=500, flush_interval=0.05, max_queue=10000):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.stats = {"queued": 0, "written": 0, "dropped": 0, "commits": 0, "errors": 0, "read_errors": 0}
+        self.lock = threading.Lock()
+        self.writer = None
+        self.readers = threading.local()
+
+    def count(self, key, n=1):
+        with self.lock:
+            self.stats[key] += n
+
+    def _ensure_writer(self):
+        # Started on first use rather than at import so it survives gunicorn's fork
+        with self.lock:
+            if self.writer is None or not self.writer.is_alive():
+                self.writer = threading.Thread(target=self._run, name="submission-writer", daemon=True)
+                self.writer.start()
+
+    def after_fork(self):
+        # The parent's writer thread doesn't exist in a forked worker, and rows it still
+        # has queued are the parent's to write
+        self.queue = queue.Queue(maxsize=self.queue.maxsize)
+        self.lock = threading.Lock()
+        self.writer = None
+        self.readers = threading.local()
+
+    def _enqueue(self, statement, row):
+        self._ensure_writer()
+        try:
+            self.queue.put_nowait((statement, row))
+            self.count("queued")
+        except queue.Full:
+            # Never block a Slack handler on storage
+            self.count("dropped")
+
+    def record(self, callback_id, user_id, payload):
+        self._enqueue(INSERT_SUBMISSION, (callback_id, user_id, time.time(), json.dumps(payload)))
+
+    def record_progress(self, user_id, metric, value, recorded_at=None):
+        value = float(value)
+        if not math.isfinite(value):
+            # NaN would hit value NOT NULL and an inf point would break every later sparkline
+            raise ValueError(f"progress value for {metric} isn't a finite number: {value}")
+        if recorded_at is None:
+            recorded_at = time.time()
+        self._enqueue(INSERT_PROGRESS, (user_id, metric, recorded_at, value))
+
+    def _reader(self):
+        # One read connection per thread; WAL lets readers run alongside the writer
+        conn = getattr(self.readers, "conn", None)
+        if conn is None:
+            conn = self.readers.conn = connect(self.path)
+        return conn
+
+    def history(self, user_id, metric, since=0, until=None, limit=None):
+        # Newest `limit` points in [since, until], returned oldest first as (recorded_at, value)
+        rows = self._reader().execute(
+            "SELECT recorded_at, value FROM progress"
+            " WHERE user_id = ? AND metric = ? AND recorded_at >= ? AND recorded_at <= ?"
+            " ORDER BY recorded_at DESC LIMIT ?",
+            (user_id, metric, since, float("inf") if until is None else until, -1 if limit is None else limit)
+        ).fetchall()
+        rows.reverse()
+        return rows
+
+    def _run(self):
+        try:
+            conn = connect(self.path)
+        except sqlite3.Error:
+            # Unopenable store: drop what's queued rather than leave flush() waiting on a
+            # writer that's gone. The next record starts a writer that tries again.
+            with self.lock:
+                self.writer = None
+                self.stats["errors"] += 1
+            self._discard_queued()
+            return
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            self._write(conn, batch)
+            for _ in batch:
+                self.queue.task_done()
+
+    def _discard_queued(self):
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                return
+            self.queue.task_done()
+            self.count("dropped")
+
+    def _write(self, conn, batch):
+        if not batch:
+            return
+        rows_by_statement = {}
+        for statement, row in batch:
+            rows_by_statement.setdefault(statement, []).append(row)
+        try:
+            with conn:
+                for statement, rows in rows_by_statement.items():
+                    conn.executemany(statement, rows)
+            self.count("written", len(batch))
+            self.count("commits")
+        except sqlite3.IntegrityError:
+            # One bad row mustn't take the rest of the batch with it
+            self._write_rows(conn, batch)
+        except sqlite3.Error:
+            self.count("errors")
+
+    def _write_rows(self, conn, batch):
+        # Row by row in one transaction; a failed statement only undoes itself, so just
+        # the rows the constraints reject are dropped
+        rejected = 0
+        try:
+            with conn:
+                for statement, row in batch:
+                    try:
+                        conn.execute(statement, row)
+                    except sqlite3.IntegrityError:
+                        rejected += 1
+        except sqlite3.Error:
+            self.count("errors")
+            return
+        self.count("written", len(batch) - rejected)
+        self.count("dropped", rejected)
+        self.count("commits")
+
+    def flush(self):
+        if self.writer is not None and self.writer.is_alive():
+            self.queue.join()
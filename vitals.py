@@ -0,0 +1,169 @@
+from collections import namedtuple
+
+from longevity import life_expectancy
+
+# The vitals and longevity calculators as data. Each *_result function computes a small
+# record (namedtuples, so no per-instance dict): the numbers, a category code and, where
+# the advice varies on its own, an advice code. The format_* functions turn a record into
+# the prose the Slack reports show. Records are what storage, analytics and caches should
+# keep; they're a few numbers where the message is ~300 characters. A calculator returns
+# None when an input is missing, which formats as "". The codes are shared with cohort.py.
+
+MISSING = -1
+INVALID_GENDER = -2
+INVALID_GENDER_MESSAGE = "Invalid gender. Please use 'male' or 'female'."
+
+# calculate_bmi_status
+BMI_UNDERWEIGHT, BMI_OPTIMAL, BMI_ELEVATED, BMI_OVERWEIGHT, BMI_OBESE = range(5)
+BMI_STATUS = (
+    "Underweight (Focus on Lean Mass Gain)",
+    "Optimal (Maintain & Optimize)",
+    "Elevated (Monitor Body Composition)",
+    "Overweight (Prioritize Fat Loss)",
+    "Obese (Metabolic Recalibration Needed)",
+)
+BmiResult = namedtuple("BmiResult", ["bmi", "category"])
+
+# ideal_body_weight_feedback. direction is the category; tag is the advice, by ideal weight.
+IBW_GAIN, IBW_LOSE, IBW_MAINTAIN = range(3)
+IBW_DIRECTION = ("gain", "lose", "maintain")
+IBW_LEAN, IBW_FIT, IBW_STRONG = range(3)
+IBW_TAG = ("Brilliantly Lean!", "Smartly Fit!", "Strong Genius!")
+# kg and grams split the absolute difference, as the message spells it
+IdealWeightResult = namedtuple("IdealWeightResult", ["ideal_weight", "kg", "grams", "direction", "tag"])
+
+# calculate_bmr_status. Status and advice both follow the category.
+BMR_SLEEPING_GIANT, BMR_SWEET_SPOT, BMR_UNSTOPPABLE = range(3)
+BMR_STATUS = (
+    "Your BMR is a *sleeping giant* waiting to be awakened. Build that muscle!",
+    "You're in the *sweet spot*. Let’s pump up your training and nutrition for *superhuman* gains!",
+    "Boom! You've got an *unstoppable* metabolism! Use that rocket fuel for max muscle growth!",
+)
+BMR_ADVICE = (
+    "Focus on strength training and increase protein intake to kickstart your metabolism.",
+    "Optimize your workout routine and fuel with clean nutrition for explosive muscle gain and fat loss.",
+    "Capitalize on your *supercharged* metabolism and unleash your inner beast for maximum muscle growth!",
+)
+BmrResult = namedtuple("BmrResult", ["bmr", "category"])
+
+LIFE_EXPECTANCY_MESSAGE = (
+    "Estimated Life Expectancy: {} years and {} months — "
+    "Every healthy choice empowers your future. "
+    "This isn't just a number—it's a nudge to live fully, love deeply, and thrive daily. "
+    "Shine on, because your journey matters. "
+    "— Based on ICMR-INDIAB & WHO cardiovascular actuarial models"
+)
+
+def bmi_result(height_cm, weight_kg):
+    if not height_cm or not weight_kg:
+        return None
+    # Convert height to meters and calculate BMI
+    height_m = height_cm / 100
+    bmi = round(weight_kg / (height_m ** 2), 1)
+
+    if bmi < 18.5:
+        category = BMI_UNDERWEIGHT
+    elif bmi < 23:
+        category = BMI_OPTIMAL
+    elif bmi < 25:
+        category = BMI_ELEVATED
+    elif bmi < 30:
+        category = BMI_OVERWEIGHT
+    else:
+        category = BMI_OBESE
+    return BmiResult(bmi, category)
+
+def ideal_weight_result(gender, height_cm, weight_kg):
+    if not gender or height_cm == 0 or weight_kg == 0:
+        return None
+    gender = gender.strip().lower()
+    height_m = height_cm / 100
+
+    if gender == "male":
+        ideal_weight = round(22 * (height_m ** 2), 1)
+    elif gender == "female":
+        ideal_weight = round(21 * (height_m ** 2), 1)
+    else:
+        return IdealWeightResult(None, None, None, INVALID_GENDER, None)
+
+    diff = round(ideal_weight - weight_kg, 3)
+    abs_diff = abs(diff)
+    kg_part = int(abs_diff)
+    gram_part = round((abs_diff - kg_part) * 1000)
+
+    if diff > 0:
+        direction = IBW_GAIN
+    elif diff < 0:
+        direction = IBW_LOSE
+    else:
+        direction = IBW_MAINTAIN
+
+    if ideal_weight < 50:
+        tag = IBW_LEAN
+    elif ideal_weight < 70:
+        tag = IBW_FIT
+    else:
+        tag = IBW_STRONG
+    return IdealWeightResult(ideal_weight, kg_part, gram_part, direction, tag)
+
+def bmr_result(gender, height_cm, age, weight_kg):
+    if not gender or height_cm == 0 or age == 0 or weight_kg == 0:
+        return None
+    gender = gender.strip().lower()
+
+    if gender == "male":
+        bmr = round(10 * weight_kg + 6.25 * height_cm - 5 * age + 5)
+    elif gender == "female":
+        bmr = round(10 * weight_kg + 6.25 * height_cm - 5 * age - 161)
+    else:
+        return BmrResult(None, INVALID_GENDER)
+
+    if bmr < 1300:
+        category = BMR_SLEEPING_GIANT
+    elif bmr < 1600:
+        category = BMR_SWEET_SPOT
+    else:
+        category = BMR_UNSTOPPABLE
+    return BmrResult(bmr, category)
+
+def life_expectancy_result(gender, age, smoke, ldl):
+    if any(val is None for val in [gender, age, smoke, ldl]):
+        return None
+    return life_expectancy(gender, age, smoke, ldl)
+
+def format_bmi(result):
+    if result is None:
+        return ""
+    bmi, category = result
+    return f"BMI: {bmi} - {BMI_STATUS[category]}"
+
+def format_ideal_weight(result):
+    if result is None:
+        return ""
+    ideal_weight, kg, grams, direction, tag = result
+    if direction == INVALID_GENDER:
+        return INVALID_GENDER_MESSAGE
+    if direction == IBW_MAINTAIN:
+        return f"You're exactly at your Ideal Body Weight (IBW): {ideal_weight} kg. {IBW_TAG[tag]}"
+
+    msg = f"Ideal Body Weight (IBW): {ideal_weight}kg - {IBW_TAG[tag]}. You need to {IBW_DIRECTION[direction]} "
+    if kg > 0:
+        msg += f"{kg}kg "
+    if grams > 0:
+        msg += f"{grams}g. "
+    if kg == 0 and grams == 0:
+        msg += "very little."
+    return msg.strip()
+
+def format_bmr(result):
+    if result is None:
+        return ""
+    bmr, category = result
+    if category == INVALID_GENDER:
+        return INVALID_GENDER_MESSAGE
+    return f"BMR: {bmr} kcal/day - Status: {BMR_STATUS[category]} - Advice: {BMR_ADVICE[category]}"
+
+def format_life_expectancy(result):
+    if result is None:
+        return ""
+    return LIFE_EXPECTANCY_MESSAGE.format(*result)